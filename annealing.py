@@ -0,0 +1,217 @@
+"""
+Parallel tempering for the travelling salesman problem.
+
+``replicas`` closed tours are rows of one integer array, each at its own
+temperature (geometric between t_min and t_max). Every step proposes one
+2-opt move per replica: a random city a gets one of its ``neighbours``
+nearest cities c as its new successor, i.e. the segment between them is
+reversed. All deltas are evaluated at once from the distance matrix, accepted
+with the Metropolis rule and the accepted reversals applied with one
+scatter over the flat tour array. Every ``exchange_every`` steps
+neighbouring temperatures swap their tours with probability
+min(1, exp((1/T_k - 1/T_k+1) (E_k - E_k+1))), so good tours found at high
+temperature sink to the cold replicas.
+
+    python annealing.py --cities 500 --replicas 32 --validate
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from qaoa import distance_matrix
+
+DEFAULT_REPLICAS = 32
+DEFAULT_NEIGHBOURS = 8
+
+
+def tour_lengths(tours, distances):
+    """Length of every closed tour (rows of ``tours``)."""
+    tours = np.atleast_2d(tours)
+    return distances[tours, np.roll(tours, -1, axis=1)].sum(axis=1)
+
+
+def two_opt_deltas(tours, distances, i, j):
+    """Length change of reversing tours[r, i[r]:j[r] + 1] for every row r (1 <= i <= j)."""
+    rows = np.arange(len(tours))
+    n = tours.shape[1]
+    a, b = tours[rows, i - 1], tours[rows, i]
+    c, e = tours[rows, j], tours[rows, (j + 1) % n]
+    return distances[a, c] + distances[b, e] - distances[a, b] - distances[c, e]
+
+
+def reverse_segments(tours, rows, i, j, positions=None):
+    """
+    Reverse positions i..j of the given rows in place. Reversing the
+    complement (which wraps around the end) gives the same cycle, so the
+    shorter of the two is reversed; ``positions`` (city -> position) follows.
+    """
+    n = tours.shape[1]
+    length = j - i + 1
+    complement = 2 * length > n
+    start = np.where(complement, j + 1, i)
+    length = np.where(complement, n - length, length)
+    # One flat index per element of all segments.
+    row = np.repeat(rows, length)
+    k = np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+    first = np.repeat(start, length)
+    last = np.repeat(start + length - 1, length)
+    flat = tours.reshape(-1)
+    cities = flat[row * n + (first + k) % n]
+    target = (last - k) % n
+    flat[row * n + target] = cities
+    if positions is not None:
+        positions.reshape(-1)[row * n + cities] = target
+    return tours
+
+
+class ParallelTempering:
+    def __init__(self, distances, replicas=DEFAULT_REPLICAS, t_min=None, t_max=None, rng=None,
+                 neighbours=DEFAULT_NEIGHBOURS):
+        self.distances = np.asarray(distances, dtype=float)
+        self.n_cities = len(self.distances)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        neighbours = min(neighbours, self.n_cities - 1)
+        # The diagonal is masked rather than sliced off: with duplicate cities
+        # a city need not come first in its own row.
+        masked = self.distances.copy()
+        np.fill_diagonal(masked, np.inf)
+        self.neighbours = np.argsort(masked, axis=1)[:, :neighbours]
+        # Temperatures relative to the typical edge length.
+        scale = self.distances.sum() / (self.n_cities * (self.n_cities - 1))
+        t_min = 0.002 * scale if t_min is None else t_min
+        t_max = 0.5 * scale if t_max is None else t_max
+        self.temperatures = np.geomspace(t_min, t_max, replicas)
+        self.tours = self.rng.permuted(np.tile(np.arange(self.n_cities), (replicas, 1)), axis=1)
+        self.positions = np.argsort(self.tours, axis=1)
+        self.lengths = tour_lengths(self.tours, self.distances)
+        self.best_length = float(self.lengths.min())
+        self.best_tour = self.tours[np.argmin(self.lengths)].copy()
+        self.steps = 0
+        self.accepted = 0
+        self.exchanges = 0
+        self.exchange_rounds = 0
+
+    def step(self):
+        """One 2-opt proposal per replica."""
+        replicas, n = self.tours.shape
+        rows = np.arange(replicas)
+        # City a at position p gets the neighbour c as successor: reverse p + 1 .. pos(c),
+        # or equivalently pos(c) + 1 .. p if c comes first.
+        p = self.rng.integers(0, n, replicas)
+        a = self.tours[rows, p]
+        c = self.neighbours[a, self.rng.integers(0, self.neighbours.shape[1], replicas)]
+        q = self.positions[rows, c]
+        i = np.where(q > p, p + 1, q + 1)
+        j = np.where(q > p, q, p)
+        delta = two_opt_deltas(self.tours, self.distances, i, j)
+        accept = (delta <= 0) | (self.rng.random(replicas) < np.exp(-np.maximum(delta, 0) / self.temperatures))
+        if accept.any():
+            rows = np.flatnonzero(accept)
+            reverse_segments(self.tours, rows, i[rows], j[rows], self.positions)
+            self.lengths[rows] += delta[rows]
+            self.accepted += len(rows)
+            best = int(np.argmin(self.lengths))
+            if self.lengths[best] < self.best_length - 1e-12:
+                self.best_length = float(self.lengths[best])
+                self.best_tour = self.tours[best].copy()
+        self.steps += 1
+
+    def exchange(self):
+        """Swap tours of neighbouring temperatures (even or odd pairs, alternating)."""
+        first = np.arange(self.exchange_rounds % 2, len(self.temperatures) - 1, 2)
+        self.exchange_rounds += 1
+        second = first + 1
+        beta = 1 / self.temperatures
+        exponent = (beta[first] - beta[second]) * (self.lengths[first] - self.lengths[second])
+        swap = self.rng.random(len(first)) < np.exp(np.minimum(exponent, 0))
+        a, b = first[swap], second[swap]
+        self.tours[a], self.tours[b] = self.tours[b].copy(), self.tours[a].copy()
+        self.positions[a], self.positions[b] = self.positions[b].copy(), self.positions[a].copy()
+        self.lengths[a], self.lengths[b] = self.lengths[b].copy(), self.lengths[a].copy()
+        self.exchanges += len(a)
+
+    def run(self, steps, exchange_every=10, record_every=None):
+        """
+        ``steps`` steps; every ``record_every`` steps (default: 100 records in
+        total) the history gets the best tour so far and a copy of all replicas.
+        """
+        record_every = record_every or max(1, steps // 100)
+        history = [self._record()]
+        for _ in range(steps):
+            self.step()
+            if self.steps % exchange_every == 0:
+                self.exchange()
+            if self.steps % record_every == 0:
+                history.append(self._record())
+        return history
+
+    def _record(self):
+        return {
+            "step": self.steps,
+            "best_length": self.best_length,
+            "best_tour": self.best_tour.copy(),
+            "tours": self.tours.copy(),
+            "lengths": self.lengths.copy(),
+        }
+
+
+def solve(points, steps=None, replicas=DEFAULT_REPLICAS, rng=None, record_every=None):
+    """Parallel tempering on ``points``; default 100 steps per city."""
+    distances = distance_matrix(points)
+    steps = 100 * len(distances) if steps is None else steps
+    annealer = ParallelTempering(distances, replicas, rng=rng)
+    start = time.perf_counter()
+    history = annealer.run(steps, record_every=record_every)
+    seconds = time.perf_counter() - start
+    # Drift of the running lengths against a fresh evaluation.
+    drift = float(np.max(np.abs(annealer.lengths - tour_lengths(annealer.tours, distances))))
+    return {
+        "cities": len(distances),
+        "best_tour": annealer.best_tour,
+        "best_length": annealer.best_length,
+        "history": history,
+        "seconds": seconds,
+        "moves_per_second": steps * replicas / seconds,
+        "acceptance": annealer.accepted / (steps * replicas),
+        "exchanges": annealer.exchanges,
+        "drift": drift,
+    }
+
+
+def brute_force(distances):
+    """Shortest tour by enumerating all (n - 1)! orders (small n only)."""
+    n = len(distances)
+    best = min(itertools.permutations(range(1, n)),
+               key=lambda order: tour_lengths(np.array((0,) + order), distances)[0])
+    tour = np.array((0,) + best)
+    return tour, float(tour_lengths(tour, distances)[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel tempering 2-opt for the TSP")
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--replicas", type=int, default=DEFAULT_REPLICAS)
+    parser.add_argument("--steps", type=int, default=None, help="default: 100 per city")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true", help="compare with brute force on 9 cities")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    if args.validate:
+        points = rng.uniform(0, 1, size=(9, 2))
+        _, optimum = brute_force(distance_matrix(points))
+        found = solve(points, rng=rng)["best_length"]
+        print(f"9 cities: brute force {optimum:.6f}, parallel tempering {found:.6f}")
+    points = rng.uniform(0, 1, size=(args.cities, 2))
+    result = solve(points, args.steps, args.replicas, rng)
+    # Beardwood-Halton-Hammersley: ~0.7124 sqrt(n A) for uniform random cities.
+    print(f"{result['cities']} cities, {args.replicas} replicas: best {result['best_length']:.4f} "
+          f"(asymptotic estimate {0.7124 * np.sqrt(args.cities):.4f}) in {result['seconds']:.2f} s, "
+          f"{result['moves_per_second']:,.0f} moves/s, acceptance {result['acceptance']:.2f}, "
+          f"{result['exchanges']} exchanges")
+
+
+if __name__ == "__main__":
+    main()
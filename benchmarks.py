@@ -0,0 +1,343 @@
+"""
+Construct-only benchmarks for the scenes in presentation.py.
+
+Every case runs one scene's construct() in a fresh process with manim in
+dry-run mode and animations skipped, so no frame is rasterized and nothing
+is written to disk. Per case the suite records construct wall time, peak RSS,
+number of plays, mobject count and number of points, and appends the result
+to a JSON lines file together with the current git commit:
+
+    python benchmarks.py run --suite maze tsp
+    python benchmarks.py compare
+
+``compare`` lines up the latest results of the current commit with the
+latest results of the previous commit and flags regressions.
+
+Scenes that show measurements load them with stored() / latest_stored().
+Local results in .benchmarks/ come first; measurements/ holds results that
+are too slow or need too much disk to take on every checkout, and is tracked.
+``ship`` copies the latest local result of a measurement there:
+
+    python exact_diag.py --save
+    python benchmarks.py ship exact_diag
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import traceback
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(REPO_DIR, ".benchmarks")
+MEASUREMENTS_DIR = os.path.join(REPO_DIR, "measurements")
+DEFAULT_RESULTS = os.path.join(RESULTS_DIR, "construct.jsonl")
+METRICS = ["wall_time", "peak_rss_mb", "plays", "mobjects", "points"]
+
+
+def _sizes(first, last, count):
+    """Roughly geometric sweep from first to last, rounded to odd integers."""
+    ratio = (last / first) ** (1 / (count - 1))
+    values = [int(round(first * ratio ** i)) | 1 for i in range(count)]
+    return sorted(set(values))
+
+
+SUITES = {
+    "maze": (
+        [("MazeComparison", {"maze_size": n}) for n in _sizes(11, 201, 6)]
+        + [("MazeWithFalsePathsAndSolution", {"size": n}) for n in _sizes(11, 201, 6)]
+    ),
+    "tsp": [("TSPComparison", {"num_cities": n}) for n in (10, 20, 50, 100, 200)],
+    "rsa": [("RSAPrimeFactorization", {"rsa_digits": n}) for n in (70, 140, 280, 617)],
+}
+
+
+def deck_scenes():
+    """Names of all scene classes defined in presentation.py."""
+    from manim import Scene
+
+    import presentation
+
+    return [
+        name for name, obj in vars(presentation).items()
+        if isinstance(obj, type) and issubclass(obj, Scene)
+        and obj.__module__ == "presentation"
+    ]
+
+
+def suite_cases(names):
+    cases = []
+    for name in names:
+        if name == "deck":
+            cases.extend((scene, {}) for scene in deck_scenes())
+        else:
+            cases.extend(SUITES[name])
+    return cases
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _mobject_stats(scene):
+    family = scene.get_mobject_family_members()
+    return len(family), sum(len(mob.points) for mob in family)
+
+
+def _run_case(scene_name, params, connection):
+    """Child process entry point: construct one scene and send back metrics."""
+    result = {"scene": scene_name, "params": params}
+    try:
+        os.chdir(REPO_DIR)
+        from manim import tempconfig
+
+        import presentation
+
+        base = getattr(presentation, scene_name)
+        peak = {"mobjects": 0, "points": 0, "next_sample": 1}
+
+        def sample(scene):
+            mobjects, points = _mobject_stats(scene)
+            peak["mobjects"] = max(peak["mobjects"], mobjects)
+            peak["points"] = max(peak["points"], points)
+
+        def play(scene, *args, **kwargs):
+            base.play(scene, *args, **kwargs)
+            # Counting the family after every play would dominate the
+            # construct time of the maze scenes, so sample at powers of two.
+            if scene.renderer.num_plays >= peak["next_sample"]:
+                peak["next_sample"] *= 2
+                sample(scene)
+
+        measured = type(scene_name, (base,), dict(params, play=play))
+        rss_before = _peak_rss_mb()
+        with tempconfig({"dry_run": True, "disable_caching": True,
+                         "progress_bar": "none", "verbosity": "ERROR"}):
+            scene = measured(skip_animations=True)
+            start = time.perf_counter()
+            scene.setup()
+            scene.construct()
+            result["wall_time"] = time.perf_counter() - start
+            sample(scene)
+        result["plays"] = scene.renderer.num_plays
+        result["mobjects"] = peak["mobjects"]
+        result["points"] = peak["points"]
+        result["peak_rss_mb"] = _peak_rss_mb()
+        result["import_rss_mb"] = rss_before
+    except Exception:
+        result["error"] = traceback.format_exc(limit=3).strip().splitlines()[-1]
+    connection.send(result)
+    connection.close()
+
+
+def run_case(scene_name, params, timeout=None):
+    """Run a single case in its own process so peak RSS is per case."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(scene_name, params, sender))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        result = receiver.recv()
+    else:
+        result = {"scene": scene_name, "params": params,
+                  "error": f"timeout after {timeout}s"}
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return result
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _json_default(value):
+    # numpy scalars and arrays in measured results
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _stored_path(name, path=None):
+    return path or os.path.join(RESULTS_DIR, f"{name}.jsonl")
+
+
+def _stored_entries(name, path=None):
+    """Entries of ``path``, or the tracked measurements followed by the local results."""
+    if path is not None:
+        return load_results(path)
+    return (load_results(os.path.join(MEASUREMENTS_DIR, f"{name}.jsonl"))
+            + load_results(_stored_path(name)))
+
+
+def save_stored(name, params, result, path=None):
+    """Append ``result`` measured with ``params`` to .benchmarks/<name>.jsonl."""
+    path = _stored_path(name, path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    entry = {"params": params, "result": result, "host": platform.node(),
+             "commit": git_commit(), "timestamp": time.time()}
+    with open(path, "a") as f:
+        f.write(json.dumps(entry, default=_json_default) + "\n")
+
+
+def latest_stored(name, path=None):
+    """(params, result) of the last result stored for ``name``, or None."""
+    entries = _stored_entries(name, path)
+    return (entries[-1]["params"], entries[-1]["result"]) if entries else None
+
+
+def stored(name, params, compute, path=None):
+    """
+    The latest stored result of ``name`` for ``params``; if there is none,
+    ``compute()`` runs once and its result is stored. Scenes take measured
+    timings from here, so every render shows the same numbers (and manim's
+    play hashes stay the same) and scenes showing the same measurement share
+    it. Results come back as stored, i.e. numpy arrays as lists.
+    """
+    key = json.dumps(params, sort_keys=True, default=_json_default)
+    for entry in reversed(_stored_entries(name, path)):
+        if json.dumps(entry["params"], sort_keys=True) == key:
+            return entry["result"]
+    result = compute()
+    save_stored(name, params, result, path)
+    return json.loads(json.dumps(result, default=_json_default))
+
+
+def ship(args):
+    """Append the latest local result of ``args.name`` to measurements/."""
+    entries = load_results(_stored_path(args.name))
+    if not entries:
+        print(f"No stored result for {args.name} in {RESULTS_DIR}.")
+        return 2
+    os.makedirs(MEASUREMENTS_DIR, exist_ok=True)
+    with open(os.path.join(MEASUREMENTS_DIR, f"{args.name}.jsonl"), "a") as f:
+        f.write(json.dumps(entries[-1]) + "\n")
+    return 0
+
+
+def case_key(result):
+    return result["scene"], json.dumps(result["params"], sort_keys=True)
+
+
+def format_result(result):
+    params = ", ".join(f"{k}={v}" for k, v in result["params"].items()) or "-"
+    label = f"{result['scene']:<32} {params:<18}"
+    if "error" in result:
+        return f"{label} ERROR {result['error']}"
+    return (f"{label} {result['wall_time']:>9.3f}s {result['peak_rss_mb']:>8.1f}MB "
+            f"{result['plays']:>7} plays {result['mobjects']:>8} mobjects "
+            f"{result['points']:>10} points")
+
+
+def run(args):
+    commit = git_commit()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    for (scene_name, params), repeat in itertools.product(
+            suite_cases(args.suite), range(args.repeat)):
+        result = run_case(scene_name, params, timeout=args.timeout)
+        result.update(commit=commit, timestamp=time.time(), repeat=repeat)
+        print(format_result(result), flush=True)
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+def latest_by_case(results):
+    latest = {}
+    for result in results:
+        if "error" not in result:
+            latest[case_key(result)] = result
+    return latest
+
+
+def compare(args):
+    results = load_results(args.output)
+    commits = list(dict.fromkeys(result["commit"] for result in results))
+    if len(commits) < 2:
+        print("Need results from at least two commits to compare.")
+        return 0
+    current_commit = args.commit or commits[-1]
+    if current_commit not in commits:
+        print(f"Unknown commit {current_commit}; recorded: {', '.join(commits)}")
+        return 2
+    position = commits.index(current_commit)
+    if position == 0:
+        print(f"No previous run before {current_commit} to compare against.")
+        return 0
+    previous_commit = commits[position - 1]
+    current = latest_by_case(r for r in results if r["commit"] == current_commit)
+    previous = latest_by_case(r for r in results if r["commit"] == previous_commit)
+    print(f"{previous_commit} -> {current_commit}")
+    regressions = 0
+    for key in sorted(set(current) & set(previous)):
+        old, new = previous[key], current[key]
+        changes = []
+        for metric in METRICS:
+            if not old[metric]:
+                continue
+            ratio = new[metric] / old[metric]
+            flag = ""
+            if ratio > args.threshold:
+                flag = " !"
+                regressions += 1
+            if abs(ratio - 1) > 0.05 or flag:
+                changes.append(f"{metric} x{ratio:.2f}{flag}")
+        print(f"{key[0]:<32} {key[1]:<24} {'; '.join(changes) or 'unchanged'}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default=DEFAULT_RESULTS,
+                        help="JSON lines file with the stored results")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmark suites")
+    run_parser.add_argument("--suite", nargs="+", default=["maze", "tsp", "rsa"],
+                            choices=sorted(SUITES) + ["deck"])
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--timeout", type=float, default=600,
+                            help="seconds before a single case is aborted")
+
+    compare_parser = commands.add_parser("compare", help="compare two commits")
+    compare_parser.add_argument("--commit", help="commit to check (default: latest)")
+    compare_parser.add_argument("--threshold", type=float, default=1.25,
+                                help="ratio above which a metric is a regression")
+
+    ship_parser = commands.add_parser("ship", help="track the latest stored result of a measurement")
+    ship_parser.add_argument("name", help="e.g. mmap, scaling, exact_diag")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    if args.command == "ship":
+        return ship(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Exact diagonalization of spin-1/2 chains with a matrix-free Hamiltonian.
+
+Basis states are integers (bit i = spin i up). The Hamiltonian is never
+stored: matvec() computes H @ x from bit operations on the basis states,
+one bond at a time, so besides the basis only a few vectors of the sector
+dimension are in memory. Symmetry sectors shrink the dimension:
+
+  * heisenberg: H = J sum_<ij> (S^x S^x + S^y S^y + delta S^z S^z) conserves
+    the magnetization, so only states with a fixed number of up spins are
+    kept (C(n, n/2) instead of 2^n). Indices are found with two lookup tables
+    over the upper and lower half of the bits.
+  * tfim: H = -J sum_<ij> Z Z - h sum_i X conserves the parity prod_i X.
+    In the rotated basis (X <-> Z) that is the parity of the bit count, and
+    the index of a state is simply its upper n - 1 bits.
+
+lanczos() finds the ground state energy with three vectors of memory.
+Time grows about 5x per two spins (22 spins take ~15 s, 24 spins ~90 s,
+26 spins ~9 min in 0.7 GiB), so Anwendungen loads its sweep with
+stored_scaling() from the tracked measurements/exact_diag.jsonl (or a newer
+local run in .benchmarks/); --save measures and stores one:
+
+    python exact_diag.py --model heisenberg --spins 8 10 12 14 16 18 20 22 24 26 --save
+    python benchmarks.py ship exact_diag
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks import save_stored, stored
+
+MODELS = ["heisenberg", "tfim"]
+
+
+def _popcount(values):
+    return np.bitwise_count(values) if hasattr(np, "bitwise_count") else \
+        np.array([bin(int(v)).count("1") for v in values])
+
+
+def _bonds(n_spins, periodic):
+    bonds = [(i, i + 1) for i in range(n_spins - 1)]
+    return bonds + [(n_spins - 1, 0)] if periodic and n_spins > 2 else bonds
+
+
+class MagnetizationSector:
+    """All n-bit states with ``up`` set bits, sorted, with O(1) index lookup."""
+
+    def __init__(self, n_spins, up):
+        self.n_spins, self.up = n_spins, up
+        self.low_bits = n_spins // 2
+        low = np.arange(1 << self.low_bits, dtype=np.int64)
+        high = np.arange(1 << (n_spins - self.low_bits), dtype=np.int64)
+        low_count, high_count = _popcount(low), _popcount(high)
+        # Rank of every lower half among the lower halves with the same count.
+        self.low_rank = np.zeros(len(low), dtype=np.int64)
+        lows_by_count = {}
+        for count in range(self.low_bits + 1):
+            members = np.flatnonzero(low_count == count)
+            self.low_rank[members] = np.arange(len(members))
+            lows_by_count[count] = members
+        # Start of every upper half's block of states.
+        needed = up - high_count
+        sizes = np.array([len(lows_by_count.get(k, ())) if 0 <= k <= self.low_bits else 0
+                          for k in needed])
+        self.high_offset = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.states = np.concatenate([
+            (h << self.low_bits) | lows_by_count[k]
+            for h, k, size in zip(high, needed, sizes) if size
+        ]) if sizes.sum() else np.zeros(0, dtype=np.int64)
+
+    @property
+    def dimension(self):
+        return len(self.states)
+
+    def index(self, states):
+        mask = (1 << self.low_bits) - 1
+        return self.high_offset[states >> self.low_bits] + self.low_rank[states & mask]
+
+
+class ParitySector:
+    """All n-bit states with bit-count parity ``parity``; index = upper n - 1 bits."""
+
+    def __init__(self, n_spins, parity):
+        self.n_spins, self.parity = n_spins, parity
+        upper = np.arange(1 << (n_spins - 1), dtype=np.int64)
+        self.states = (upper << 1) | ((_popcount(upper) & 1) ^ parity)
+
+    @property
+    def dimension(self):
+        return len(self.states)
+
+    def index(self, states):
+        return states >> 1
+
+
+class SpinChain:
+    """
+    Matrix-free Hamiltonian of a chain in one symmetry sector. ``sector``
+    defaults to the ground state sector (S^z = 0 or even parity).
+    """
+
+    def __init__(self, n_spins, model="heisenberg", coupling=1.0, field=1.0, delta=1.0,
+                 periodic=True, sector=None):
+        if model not in MODELS:
+            raise ValueError(f"unknown model {model!r}")
+        self.n_spins, self.model = n_spins, model
+        self.coupling, self.field, self.delta = coupling, field, delta
+        self.bonds = _bonds(n_spins, periodic)
+        if model == "heisenberg":
+            self.sector = MagnetizationSector(n_spins, n_spins // 2 if sector is None else sector)
+        else:
+            self.sector = ParitySector(n_spins, 0 if sector is None else sector)
+        self.diagonal = self._diagonal()
+
+    @property
+    def dimension(self):
+        return self.sector.dimension
+
+    def _bit(self, i):
+        return (self.sector.states >> i) & 1
+
+    def _diagonal(self):
+        diagonal = np.zeros(self.dimension)
+        if self.model == "heisenberg":
+            for i, j in self.bonds:
+                aligned = self._bit(i) == self._bit(j)
+                diagonal += self.coupling * self.delta * np.where(aligned, 0.25, -0.25)
+        else:
+            # -h sum Z in the rotated basis.
+            for i in range(self.n_spins):
+                diagonal -= self.field * (1 - 2 * self._bit(i))
+        return diagonal
+
+    def matvec(self, x):
+        x = np.asarray(x).reshape(-1)
+        y = self.diagonal * x
+        states = self.sector.states
+        for i, j in self.bonds:
+            mask = (1 << i) | (1 << j)
+            if self.model == "heisenberg":
+                # S+S- + S-S+ flips antiparallel pairs with amplitude J / 2.
+                sources = np.flatnonzero(((states >> i) ^ (states >> j)) & 1)
+                amplitude = 0.5 * self.coupling
+            else:
+                # -J X X flips both bits of every state.
+                sources = slice(None)
+                amplitude = -self.coupling
+            y[self.sector.index(states[sources] ^ mask)] += amplitude * x[sources]
+        return y
+
+    def to_dense(self):
+        """Dense matrix of the sector (small chains only)."""
+        identity = np.eye(self.dimension)
+        return np.column_stack([self.matvec(column) for column in identity.T])
+
+
+def lanczos(matvec, dimension, tol=1e-10, max_iter=300, rng=None):
+    """Lowest eigenvalue of a symmetric operator with the plain Lanczos recursion."""
+    rng = rng if rng is not None else np.random.default_rng()
+    v = rng.normal(size=dimension)
+    v /= np.linalg.norm(v)
+    previous = np.zeros(dimension)
+    alphas, betas = [], []
+    beta, energy = 0.0, np.inf
+    for _ in range(min(max_iter, dimension)):
+        w = matvec(v)
+        alpha = float(np.dot(w, v))
+        w -= alpha * v + beta * previous
+        alphas.append(alpha)
+        ritz = np.linalg.eigvalsh(np.diag(alphas) + np.diag(betas, 1) + np.diag(betas, -1))[0]
+        beta = float(np.linalg.norm(w))
+        if abs(ritz - energy) < tol * max(1.0, abs(ritz)) or beta < tol:
+            return float(ritz)
+        energy = ritz
+        betas.append(beta)
+        previous, v = v, w / beta
+    return float(energy)
+
+
+def ground_state_energy(n_spins, model="heisenberg", rng=None, **parameters):
+    """Ground state energy with time and traced peak memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    chain = SpinChain(n_spins, model, **parameters)
+    energy = lanczos(chain.matvec, chain.dimension, rng=rng)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "spins": n_spins,
+        # Key names shared with rcs.extrapolate().
+        "qubits": n_spins,
+        "model": model,
+        "dimension": chain.dimension,
+        "full_dimension": 2 ** n_spins,
+        "energy": energy,
+        "energy_per_spin": energy / n_spins,
+        "seconds": seconds,
+        "peak_bytes": peak,
+    }
+
+
+def scaling(spin_counts, model="heisenberg", rng=None, **parameters):
+    return [ground_state_energy(n, model, rng, **parameters) for n in spin_counts]
+
+
+def _scaling_params(spin_counts, model, seed):
+    return {"spins": list(spin_counts), "model": model, "seed": seed}
+
+
+def stored_scaling(spin_counts, model="heisenberg", seed=0):
+    """scaling() as stored in .benchmarks/exact_diag.jsonl, measured on first use."""
+    return stored("exact_diag", _scaling_params(spin_counts, model, seed),
+                  lambda: scaling(spin_counts, model, np.random.default_rng(seed)))
+
+
+def validate(model="heisenberg", n_spins=8):
+    """Difference between Lanczos and the dense spectrum of the full Hilbert space."""
+    sectors = range(n_spins + 1) if model == "heisenberg" else (0, 1)
+    lowest = min(np.linalg.eigvalsh(SpinChain(n_spins, model, sector=s).to_dense())[0]
+                 for s in sectors)
+    # Full space built from the Pauli matrices for comparison.
+    x = np.array([[0, 1], [1, 0]])
+    z = np.diag([1.0, -1.0])
+    y = np.array([[0, -1j], [1j, 0]])
+
+    def site(op, i):
+        return np.kron(np.kron(np.eye(2 ** (n_spins - 1 - i)), op), np.eye(2 ** i))
+
+    full = np.zeros((2 ** n_spins, 2 ** n_spins), dtype=complex)
+    for i, j in _bonds(n_spins, True):
+        if model == "heisenberg":
+            full += 0.25 * sum(site(op, i) @ site(op, j) for op in (x, y, z))
+        else:
+            full -= site(z, i) @ site(z, j)
+    if model == "tfim":
+        full -= sum(site(x, i) for i in range(n_spins))
+    dense = np.linalg.eigvalsh(full)[0]
+    chain = SpinChain(n_spins, model)
+    return abs(lowest - dense), abs(lanczos(chain.matvec, chain.dimension) - dense)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact diagonalization of spin chains")
+    parser.add_argument("--model", choices=MODELS, default="heisenberg")
+    parser.add_argument("--spins", type=int, nargs="+", default=list(range(8, 27, 2)))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true",
+                        help="compare with dense diagonalization of the full space")
+    parser.add_argument("--save", action="store_true", help="store the sweep for Anwendungen")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        print("sector / Lanczos error vs. dense: %.1e / %.1e" % validate(args.model))
+    records = scaling(args.spins, args.model, np.random.default_rng(args.seed))
+    if args.save:
+        save_stored("exact_diag", _scaling_params(args.spins, args.model, args.seed), records)
+    for r in records:
+        print(f"{r['spins']:3d} spins: dimension {r['dimension']:>11,} of {r['full_dimension']:>13,}  "
+              f"E/N = {r['energy_per_spin']:.6f}  {r['seconds']:8.2f} s  "
+              f"{r['peak_bytes'] / 2 ** 20:9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
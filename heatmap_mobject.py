@@ -0,0 +1,43 @@
+"""
+Per-cell probabilities of a grid as one ImageMobject.
+
+One pixel per grid cell, drawn with nearest-neighbour resampling so that
+cells stay sharp squares; the probability sets the alpha of the pixel and
+walls stay transparent, so the maze underneath shows through. All frames
+are precomputed (e.g. QuantumWalk.probabilities); an updater only selects
+one and writes the alpha channel of the open cells in place:
+
+    heatmap = ProbabilityHeatmap(frames, walk.cells, walk.shape, cell_size).move_to(maze)
+    heatmap.add_updater(lambda m: m.set_frame(int(round(progress.get_value()))))
+"""
+import numpy as np
+from manim import BLUE, RESAMPLING_ALGORITHMS, ImageMobject, color_to_int_rgb
+
+
+class ProbabilityHeatmap(ImageMobject):
+    """
+    ``frames`` has shape (frames, cells) with the probability of the open
+    cell ``cells[i]`` = (row, col) of a grid of ``shape``. Each frame is
+    scaled to its maximum; ``gamma`` < 1 brightens the faint tails.
+    """
+
+    def __init__(self, frames, cells, shape, cell_size, color=BLUE, gamma=0.5, **kwargs):
+        self.frames = np.asarray(frames)
+        cells = np.asarray(cells)
+        self.rows, self.cols = cells[:, 0], cells[:, 1]
+        self.gamma = gamma
+        pixels = np.zeros((*shape, 4), dtype=np.uint8)
+        pixels[..., :3] = color_to_int_rgb(color)
+        super().__init__(pixels, **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.stretch_to_fit_height(shape[0] * cell_size)
+        self.stretch_to_fit_width(shape[1] * cell_size)
+        self.frame = 0
+        self.set_frame(0)
+
+    def set_frame(self, frame):
+        self.frame = int(np.clip(frame, 0, len(self.frames) - 1))
+        probabilities = self.frames[self.frame]
+        intensity = (probabilities / max(float(probabilities.max()), 1e-30)) ** self.gamma
+        self.pixel_array[self.rows, self.cols, 3] = np.round(255 * intensity).astype(np.uint8)
+        return self
@@ -0,0 +1,153 @@
+"""
+Equilibrium positions and normal modes of an ion chain in a linear Paul trap.
+
+Positions are measured in units of the length scale
+l = (e^2 / (4 pi eps0 m omega_z^2))^(1/3), in which the potential energy of
+N ions on the trap axis is
+
+    V(u) = sum_i u_i^2 / 2 + sum_{i<j} 1 / |u_i - u_j|.
+
+equilibrium() minimizes V with Newton's method on the analytic gradient and
+Hessian (all pairwise terms vectorized). The Hessian at the minimum gives the
+axial modes, the transverse analogue the radial modes; frequencies are in
+units of omega_z. Hundreds of ions take well under a second.
+
+    python ion_trap.py --ions 5
+"""
+import argparse
+
+import numpy as np
+
+ELEMENTARY_CHARGE = 1.602176634e-19
+VACUUM_PERMITTIVITY = 8.8541878128e-12
+ATOMIC_MASS = 1.66053906660e-27
+
+
+def _inverse_distances(u):
+    """1 / (u_i - u_j) with zeros on the diagonal."""
+    diff = u[:, None] - u[None, :]
+    np.fill_diagonal(diff, np.inf)
+    return 1.0 / diff
+
+
+def energy(u):
+    inverse = np.abs(_inverse_distances(u))
+    return 0.5 * np.dot(u, u) + 0.5 * inverse.sum()
+
+
+def gradient(u):
+    inverse = _inverse_distances(u)
+    return u - np.sum(np.sign(inverse) * inverse ** 2, axis=1)
+
+
+def axial_hessian(u):
+    coupling = 2.0 * np.abs(_inverse_distances(u)) ** 3
+    hessian = -coupling
+    hessian[np.diag_indices_from(hessian)] = 1.0 + coupling.sum(axis=1)
+    return hessian
+
+
+def radial_hessian(u, anisotropy):
+    """Hessian for transverse displacements; anisotropy = omega_r / omega_z."""
+    coupling = np.abs(_inverse_distances(u)) ** 3
+    hessian = coupling.copy()
+    hessian[np.diag_indices_from(hessian)] = anisotropy ** 2 - coupling.sum(axis=1)
+    return hessian
+
+
+def initial_guess(n):
+    """Evenly spaced chain with the asymptotic length 2 (3 N ln N / 4)^(1/3)."""
+    if n == 1:
+        return np.zeros(1)
+    half_length = max((0.75 * n * np.log(n)) ** (1 / 3), 0.63)
+    return np.linspace(-half_length, half_length, n)
+
+
+def equilibrium(n, tol=1e-12, max_iter=100):
+    """Equilibrium positions (sorted, dimensionless) of n ions."""
+    u = initial_guess(n)
+    for _ in range(max_iter):
+        g = gradient(u)
+        if np.max(np.abs(g)) < tol:
+            break
+        # The axial Hessian is positive definite for every ordered chain, so the
+        # Newton step is a descent direction; halve it until the ions keep
+        # their order and the energy decreases.
+        step = np.linalg.solve(axial_hessian(u), -g)
+        if np.max(np.abs(step)) < tol:
+            u = u + step
+            break
+        current = energy(u)
+        scale = 1.0
+        while scale > 1e-8:
+            candidate = u + scale * step
+            if np.all(np.diff(candidate) > 0) and energy(candidate) <= current:
+                break
+            scale /= 2
+        u = candidate
+    return u
+
+
+def modes(hessian):
+    """Frequencies (sqrt of the eigenvalues, NaN if unstable) and mode vectors."""
+    eigenvalues, vectors = np.linalg.eigh(hessian)
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(eigenvalues), vectors
+
+
+def length_scale(omega_z, mass):
+    """Length unit in meters for axial angular frequency omega_z and mass in kg."""
+    return (ELEMENTARY_CHARGE ** 2 / (4 * np.pi * VACUUM_PERMITTIVITY * mass * omega_z ** 2)) ** (1 / 3)
+
+
+class IonChain:
+    """
+    Linear ion chain in SI units. Frequencies are ordinary frequencies in Hz,
+    ``axial_vectors[:, k]`` is the participation of each ion in mode k.
+    """
+
+    def __init__(self, n_ions, axial_frequency=1e6, radial_frequency=5e6, mass_amu=40):
+        self.n_ions = n_ions
+        self.axial_frequency = axial_frequency
+        self.radial_frequency = radial_frequency
+        self.anisotropy = radial_frequency / axial_frequency
+        self.scale = length_scale(2 * np.pi * axial_frequency, mass_amu * ATOMIC_MASS)
+        self.dimensionless_positions = equilibrium(n_ions)
+        self.positions = self.scale * self.dimensionless_positions
+
+        axial, self.axial_vectors = modes(axial_hessian(self.dimensionless_positions))
+        radial, self.radial_vectors = modes(
+            radial_hessian(self.dimensionless_positions, self.anisotropy))
+        self.axial_frequencies = axial * axial_frequency
+        self.radial_frequencies = radial * axial_frequency
+
+    @property
+    def linear(self):
+        """False if the chain buckles into a zigzag (a radial mode is unstable)."""
+        return bool(np.all(np.isfinite(self.radial_frequencies)))
+
+    @property
+    def minimum_spacing(self):
+        return float(np.min(np.diff(self.positions))) if self.n_ions > 1 else float("inf")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ion chain equilibrium and normal modes")
+    parser.add_argument("--ions", type=int, default=5)
+    parser.add_argument("--axial", type=float, default=1e6, help="axial trap frequency in Hz")
+    parser.add_argument("--radial", type=float, default=5e6, help="radial trap frequency in Hz")
+    parser.add_argument("--mass", type=float, default=40, help="ion mass in amu (Ca-40)")
+    args = parser.parse_args(argv)
+
+    chain = IonChain(args.ions, args.axial, args.radial, args.mass)
+    print(f"{chain.n_ions} ions, chain length {1e6 * (chain.positions[-1] - chain.positions[0]):.1f} um, "
+          f"minimum spacing {1e6 * chain.minimum_spacing:.2f} um, "
+          f"{'linear' if chain.linear else 'zigzag (radial mode unstable)'}")
+    if chain.n_ions <= 20:
+        print("positions (um):", np.round(1e6 * chain.positions, 2))
+        print("axial modes (MHz):", np.round(chain.axial_frequencies / 1e6, 4))
+        print("radial modes (MHz):", np.round(chain.radial_frequencies / 1e6, 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Bar chart mobject that is updated in place from an array.
+
+manim's BarChart rebuilds its bars on change_bar_values() and scales them
+relative to their current height, which breaks down for bars at zero and
+costs new mobjects on every frame. LiveBarChart creates its bars, labels and
+value numbers once; set_values() only moves the corner points of the bars
+and the numbers, so it can run inside an updater for every frame:
+
+    chart = LiveBarChart(4, y_range=(-1, 1), bar_names=["00", "01", "10", "11"])
+    chart.add_updater(lambda m: m.set_values(histories[index()]))
+"""
+import numpy as np
+from manim import (
+    BLUE, DOWN, GRAY, LEFT, RIGHT, UP, WHITE,
+    DashedLine, DecimalNumber, Line, Rectangle, Text, VGroup,
+)
+
+MIN_BAR_HEIGHT = 1e-3
+
+
+class LiveBarChart(VGroup):
+    """Bars between y_range[0] and y_range[1], growing from 0 (or the lower end)."""
+
+    def __init__(self, n_bars, y_range=(0, 1), width=6, height=3, bar_names=None,
+                 bar_colors=None, bar_fill_opacity=0.8, bar_spacing=0.25,
+                 show_values=False, value_decimals=2, font_size=20, **kwargs):
+        super().__init__(**kwargs)
+        self.n_bars = n_bars
+        self.y_min, self.y_max = y_range
+        self.chart_width, self.chart_height = width, height
+        self.bar_spacing = bar_spacing
+        colors = bar_colors or [BLUE] * n_bars
+
+        # Invisible frame: its lower left corner anchors all bar geometry, so the
+        # chart can be moved like any other mobject.
+        self.frame = Rectangle(width=width, height=height, stroke_opacity=0)
+        self.y_axis = Line(self.frame.get_corner(DOWN + LEFT), self.frame.get_corner(UP + LEFT),
+                           color=GRAY, stroke_width=2)
+        base = self._y(max(self.y_min, min(0, self.y_max)))
+        self.baseline = Line(self.frame.get_corner(DOWN + LEFT) + UP * base,
+                             self.frame.get_corner(DOWN + RIGHT) + UP * base,
+                             color=WHITE, stroke_width=2)
+        self.bars = VGroup(*[
+            Rectangle(width=1, height=1, color=color, fill_color=color,
+                      fill_opacity=bar_fill_opacity, stroke_width=1)
+            for color in colors
+        ])
+        self.bar_labels = VGroup()
+        if bar_names:
+            for i, name in enumerate(bar_names):
+                label = Text(str(name), font_size=font_size)
+                label.next_to(self.frame.get_corner(DOWN + LEFT) + RIGHT * self._x(i)[1], DOWN, buff=0.15)
+                self.bar_labels.add(label)
+        self.value_labels = VGroup(*[
+            DecimalNumber(0, num_decimal_places=value_decimals, font_size=font_size)
+            for _ in range(n_bars)
+        ]) if show_values else VGroup()
+        self.add(self.frame, self.y_axis, self.bars, self.baseline, self.bar_labels, self.value_labels)
+        self.values = np.zeros(n_bars)
+        self.set_values(self.values)
+
+    def _y(self, value):
+        """Height above the bottom of the chart for a data value."""
+        value = np.clip(value, self.y_min, self.y_max)
+        return (value - self.y_min) / (self.y_max - self.y_min) * self.chart_height
+
+    def _x(self, index):
+        """Left edge and center of bar ``index`` measured from the left of the chart."""
+        slot = self.chart_width / self.n_bars
+        left = index * slot + slot * self.bar_spacing / 2
+        return left, index * slot + slot / 2
+
+    def add_reference_line(self, value, label=None, color=GRAY, font_size=18):
+        """Dashed horizontal line at a data value (e.g. a theoretical limit)."""
+        origin = self.frame.get_corner(DOWN + LEFT)
+        line = DashedLine(origin + UP * self._y(value),
+                          origin + UP * self._y(value) + RIGHT * self.chart_width, color=color)
+        self.add(line)
+        if label is not None:
+            self.add(Text(label, font_size=font_size, color=color).next_to(line, RIGHT, buff=0.1))
+        return line
+
+    def set_values(self, values):
+        """Reshape the bars to ``values`` in place."""
+        self.values = np.asarray(values, dtype=float)
+        origin = self.frame.get_corner(DOWN + LEFT)
+        base = self._y(max(self.y_min, min(0, self.y_max)))
+        bar_width = self.chart_width / self.n_bars * (1 - self.bar_spacing)
+        for i, (bar, value) in enumerate(zip(self.bars, self.values)):
+            left, _ = self._x(i)
+            top = self._y(value)
+            if abs(top - base) < MIN_BAR_HEIGHT:
+                top = base + MIN_BAR_HEIGHT
+            low, high = sorted((base, top))
+            bl = origin + RIGHT * left + UP * low
+            bar.set_points_as_corners([
+                bl, bl + RIGHT * bar_width, bl + RIGHT * bar_width + UP * (high - low),
+                bl + UP * (high - low), bl,
+            ])
+        for bar, number, value in zip(self.bars, self.value_labels, self.values):
+            number.set_value(value)
+            number.next_to(bar, UP if value >= 0 else DOWN, buff=0.1)
+        return self
@@ -0,0 +1,255 @@
+"""
+Out-of-core statevector in a memory-mapped file.
+
+The 2^n amplitudes live in a file and are processed in chunks of 2^c
+amplitudes (c = ``chunk_qubits``). Qubits below c are local: a gate on them
+only needs one chunk at a time. A gate on a qubit at or above c couples
+chunks whose indices differ in that bit, so those chunks are loaded
+together (a pair for one such qubit, four for two), the gate is applied with
+statevector.apply_matrix() to the stacked buffer and the chunks are written
+back. Diagonal gates never need partners. Every gate records its wall time
+and the bytes moved between the file and memory:
+
+    with MappedStatevector(32, directory="/scratch") as state:
+        state.apply(Gate("h", (31,), H))
+        print(state.records[-1])
+
+    python mmap_statevector.py --qubits 30 --directory /tmp
+
+FunctionalityComparison shows a stored sweep (one Hadamard on the highest
+qubit per size, including the flush to disk). The tracked
+measurements/mmap.jsonl holds one measured up to 32 qubits (32 GiB) on a
+machine with 6 GB of RAM; to measure again at sizes beyond the RAM of the
+machine, on a disk with enough space, and track the result:
+
+    python mmap_statevector.py --qubits 26 28 30 31 32 --directory /scratch --save
+    python benchmarks.py ship mmap
+"""
+import argparse
+import collections
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import save_stored
+from statevector import CNOT, DEFAULT_DTYPE, Gate, H, apply_matrix, max_qubits
+
+DEFAULT_CHUNK_QUBITS = 24
+
+GateRecord = collections.namedtuple(
+    "GateRecord", ["name", "qubits", "mode", "seconds", "bytes_read", "bytes_written"])
+
+
+class MappedStatevector:
+    """
+    |0...0> on ``n_qubits`` qubits in a (sparse) file. The file is removed on
+    close() unless ``path`` was given.
+    """
+
+    def __init__(self, n_qubits, path=None, directory=None, chunk_qubits=DEFAULT_CHUNK_QUBITS,
+                 dtype=DEFAULT_DTYPE):
+        self.n_qubits = n_qubits
+        self.chunk_qubits = min(chunk_qubits, n_qubits)
+        self.chunk = 1 << self.chunk_qubits
+        self.n_chunks = 1 << (n_qubits - self.chunk_qubits)
+        self.dtype = np.dtype(dtype)
+        self.temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".state", dir=directory)
+            os.close(handle)
+        self.path = path
+        # Opening with w+ truncates the file to its full size without writing
+        # it, so the zeros cost no I/O.
+        self.data = np.memmap(path, dtype=self.dtype, mode="w+", shape=(1 << n_qubits,))
+        self.data[0] = 1
+        self.records = []
+
+    @property
+    def nbytes(self):
+        return (1 << self.n_qubits) * self.dtype.itemsize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.data is None:
+            return
+        self.data.flush()
+        self.data = None
+        if self.temporary:
+            os.remove(self.path)
+
+    def _read(self, index):
+        start = index * self.chunk
+        return np.array(self.data[start:start + self.chunk])
+
+    def _write(self, index, values):
+        start = index * self.chunk
+        self.data[start:start + self.chunk] = values
+
+    def _groups(self, chunk_bits):
+        """Chunk indices that a gate on the given chunk-index bits couples."""
+        mask = sum(1 << bit for bit in chunk_bits)
+        offsets = [
+            sum(1 << bit for position, bit in enumerate(chunk_bits) if (j >> position) & 1)
+            for j in range(1 << len(chunk_bits))
+        ]
+        for base in range(self.n_chunks):
+            if not base & mask:
+                yield [base | offset for offset in offsets]
+
+    def _apply_diagonal(self, qubits, diagonal):
+        k = len(qubits)
+        local = np.arange(self.chunk)
+        local_basis = np.zeros(self.chunk, dtype=np.intp)
+        for position, q in enumerate(qubits):
+            if q < self.chunk_qubits:
+                local_basis |= ((local >> q) & 1) << (k - 1 - position)
+        for index in range(self.n_chunks):
+            offset = 0
+            for position, q in enumerate(qubits):
+                if q >= self.chunk_qubits:
+                    offset |= ((index >> (q - self.chunk_qubits)) & 1) << (k - 1 - position)
+            values = self._read(index)
+            values *= diagonal[local_basis | offset]
+            self._write(index, values)
+        return self.n_chunks
+
+    def _apply_grouped(self, qubits, matrix):
+        chunk_bits = [q - self.chunk_qubits for q in qubits if q >= self.chunk_qubits]
+        # Inside the stacked buffer, coupled chunk bit b becomes qubit c + b.
+        buffer_qubits = [
+            q if q < self.chunk_qubits else self.chunk_qubits + chunk_bits.index(q - self.chunk_qubits)
+            for q in qubits
+        ]
+        chunks = 0
+        for group in self._groups(chunk_bits):
+            buffer = np.concatenate([self._read(index) for index in group])
+            apply_matrix(buffer, self.chunk_qubits + len(chunk_bits), buffer_qubits, matrix)
+            for index, values in zip(group, np.split(buffer, len(group))):
+                self._write(index, values)
+            chunks += len(group)
+        return chunks
+
+    def apply(self, gate):
+        """Apply a statevector.Gate and record its cost."""
+        qubits = list(gate.qubits)
+        matrix = np.asarray(gate.matrix, dtype=self.dtype)
+        start = time.perf_counter()
+        if np.count_nonzero(matrix - np.diag(np.diag(matrix))) == 0:
+            mode = "diagonal"
+            chunks = self._apply_diagonal(qubits, np.diag(matrix))
+        else:
+            mode = "paired" if max(qubits) >= self.chunk_qubits else "local"
+            chunks = self._apply_grouped(qubits, matrix)
+        seconds = time.perf_counter() - start
+        moved = chunks * self.chunk * self.dtype.itemsize
+        self.records.append(GateRecord(gate.name, tuple(qubits), mode, seconds, moved, moved))
+        return self.records[-1]
+
+    def run(self, gates):
+        for gate in gates:
+            self.apply(gate)
+        return self
+
+    def flush(self):
+        """Write dirty pages to the file and return the time it took."""
+        start = time.perf_counter()
+        self.data.flush()
+        return time.perf_counter() - start
+
+    def norm(self):
+        return float(np.sqrt(sum(
+            np.sum(np.abs(self._read(index).astype(np.complex128)) ** 2)
+            for index in range(self.n_chunks))))
+
+    def to_array(self):
+        """The full state in memory (small n only)."""
+        return np.array(self.data)
+
+
+def demo_gates(n_qubits):
+    """H on the lowest and highest qubit and a CNOT between them: local, paired, paired."""
+    top = n_qubits - 1
+    return [Gate("h", (0,), H), Gate("h", (top,), H), Gate("cnot", (top, 0), CNOT)]
+
+
+def benchmark(n_qubits, directory=None, chunk_qubits=DEFAULT_CHUNK_QUBITS, gates=None):
+    """Per-gate records of ``gates`` (default demo_gates) on an n-qubit file state."""
+    gates = gates if gates is not None else demo_gates(n_qubits)
+    with MappedStatevector(n_qubits, directory=directory, chunk_qubits=chunk_qubits) as state:
+        state.run(gates)
+        flush = state.flush()
+        return {"qubits": n_qubits, "bytes": state.nbytes, "in_memory": n_qubits <= max_qubits(),
+                "records": state.records, "flush_seconds": flush}
+
+
+def sweep(qubit_counts, directory=None, chunk_qubits=DEFAULT_CHUNK_QUBITS):
+    """
+    One Hadamard on the highest qubit for every n: every chunk is read and
+    written once. Records are plain dicts so that the sweep can be stored.
+    The memory limit is taken once up front; after a large run the page
+    cache would make it look smaller.
+    """
+    limit = max_qubits()
+    results = []
+    for n in qubit_counts:
+        result = benchmark(n, directory, chunk_qubits, [Gate("h", (n - 1,), H)])
+        result["records"] = [record._asdict() for record in result["records"]]
+        result["in_memory"] = n <= limit
+        result["memory_limit_qubits"] = limit
+        results.append(result)
+    return results
+
+
+def validate(n_qubits=10, cycles=6, chunk_qubits=4, rng=None):
+    """Largest deviation from the in-memory simulator on a random circuit."""
+    from rcs import random_circuit
+    from statevector import run
+
+    rng = rng if rng is not None else np.random.default_rng()
+    gates = random_circuit(n_qubits, cycles, rng)
+    gates += [Gate("cnot", (n_qubits - 1, n_qubits - 2), CNOT), Gate("cnot", (0, n_qubits - 1), CNOT)]
+    reference = run(gates, n_qubits, dtype=np.complex128)
+    with MappedStatevector(n_qubits, chunk_qubits=chunk_qubits, dtype=np.complex128) as state:
+        return float(np.max(np.abs(state.run(gates).to_array() - reference)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core statevector gate timing")
+    parser.add_argument("--qubits", type=int, nargs="+", default=[28])
+    parser.add_argument("--directory", default=None, help="where the state file is created")
+    parser.add_argument("--chunk-qubits", type=int, default=DEFAULT_CHUNK_QUBITS)
+    parser.add_argument("--validate", action="store_true",
+                        help="compare with the in-memory simulator on a small random circuit")
+    parser.add_argument("--save", action="store_true",
+                        help="store a Hadamard sweep over --qubits for FunctionalityComparison")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        print(f"max amplitude error vs. in-memory simulation: {validate():.2e}")
+    if args.save:
+        results = sweep(args.qubits, args.directory, args.chunk_qubits)
+        save_stored("mmap", {"qubits": args.qubits, "chunk_qubits": args.chunk_qubits}, results)
+    else:
+        results = [benchmark(n, args.directory, args.chunk_qubits) for n in args.qubits]
+    for result in results:
+        print(f"{result['qubits']} qubits: {result['bytes'] / 2 ** 30:.2f} GiB state file, "
+              f"{'fits' if result['in_memory'] else 'does not fit'} into half the free RAM "
+              f"(limit {max_qubits()} qubits)")
+        for record in result["records"]:
+            record = GateRecord(**record) if isinstance(record, dict) else record
+            moved = record.bytes_read + record.bytes_written
+            print(f"  {record.name:5s} {str(record.qubits):10s} {record.mode:8s} "
+                  f"{record.seconds:8.3f} s  {moved / 2 ** 30:8.2f} GiB I/O  "
+                  f"{moved / record.seconds / 1e9:6.2f} GB/s")
+        print(f"  flush {result['flush_seconds']:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Matrix product state simulator for circuits with little entanglement.
+
+The state of n qubits is a chain of tensors A[i] of shape (left, 2, right);
+the bond dimensions between neighbours grow with the entanglement across
+the cut and are capped at ``max_bond``. A two-qubit gate on neighbours
+contracts their tensors, applies the gate and splits them again with an
+SVD, dropping the smallest singular values (at most ``cutoff`` of the norm,
+at most ``max_bond`` of them). Gates on distant qubits are routed with SWAPs
+along the chain and back. The state is kept in mixed canonical form, so
+every truncation is optimal and the product of the kept weights estimates
+the fidelity with the exact state.
+
+Memory is O(n * max_bond^2) instead of 2^n, which makes shallow circuits on
+a hundred qubits cheap while deep random circuits saturate the bond
+dimension and lose fidelity. WillowExplanation loads the runs from
+.benchmarks/mps.jsonl (stored_growth, computed on first use); --save stores
+them up front:
+
+    python mps.py --qubits 105 --cycles 8 --max-bond 8 32 --save
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import save_stored, stored
+
+DEFAULT_MAX_BOND = 64
+DEFAULT_CUTOFF = 1e-12
+SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+
+class MPS:
+    """|0...0> on ``n_qubits`` qubits, qubit i at site i."""
+
+    def __init__(self, n_qubits, max_bond=DEFAULT_MAX_BOND, cutoff=DEFAULT_CUTOFF,
+                 dtype=np.complex128):
+        self.n_qubits = n_qubits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.tensors = [np.zeros((1, 2, 1), dtype=dtype) for _ in range(n_qubits)]
+        for tensor in self.tensors:
+            tensor[0, 0, 0] = 1
+        self.center = 0
+        self.fidelity = 1.0
+        self.swaps = 0
+        self.truncations = 0
+
+    def bond_dimensions(self):
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    @property
+    def nbytes(self):
+        return sum(tensor.nbytes for tensor in self.tensors)
+
+    def _move_center(self, site):
+        """QR sweeps that move the orthogonality center to ``site``."""
+        while self.center < site:
+            c = self.center
+            left, _, right = self.tensors[c].shape
+            q, r = np.linalg.qr(self.tensors[c].reshape(left * 2, right))
+            self.tensors[c] = q.reshape(left, 2, -1)
+            self.tensors[c + 1] = np.einsum("ab,bsr->asr", r, self.tensors[c + 1])
+            self.center += 1
+        while self.center > site:
+            c = self.center
+            left, _, right = self.tensors[c].shape
+            q, r = np.linalg.qr(self.tensors[c].reshape(left, 2 * right).T)
+            self.tensors[c] = q.T.reshape(-1, 2, right)
+            self.tensors[c - 1] = np.einsum("lsa,ba->lsb", self.tensors[c - 1], r)
+            self.center -= 1
+
+    def apply_single(self, qubit, matrix):
+        self.tensors[qubit] = np.einsum("ab,lbr->lar", matrix, self.tensors[qubit])
+
+    def apply_adjacent(self, site, matrix):
+        """Two-qubit gate on sites (site, site + 1), first gate qubit at ``site``."""
+        self._move_center(site)
+        a, b = self.tensors[site], self.tensors[site + 1]
+        theta = np.einsum("xyab,lar,rbs->lxys", np.asarray(matrix).reshape(2, 2, 2, 2), a, b)
+        left, right = a.shape[0], b.shape[2]
+        u, s, vh = np.linalg.svd(theta.reshape(left * 2, 2 * right), full_matrices=False)
+        weights = s ** 2 / np.sum(s ** 2)
+        # Keep the fewest values whose discarded weight stays below the cutoff.
+        tail = np.cumsum(weights[::-1])[::-1]
+        keep = max(1, min(self.max_bond, int(np.sum(tail > self.cutoff))))
+        discarded = float(tail[keep]) if keep < len(s) else 0.0
+        if discarded > 0:
+            self.fidelity *= 1 - discarded
+            self.truncations += 1
+        s = s[:keep] / np.linalg.norm(s[:keep])
+        self.tensors[site] = u[:, :keep].reshape(left, 2, keep)
+        self.tensors[site + 1] = (s[:, None] * vh[:keep]).reshape(keep, 2, right)
+        self.center = site + 1
+
+    def apply_two(self, first, second, matrix):
+        """Two-qubit gate on any pair, routed with SWAPs if they are not neighbours."""
+        matrix = np.asarray(matrix)
+        if first > second:
+            # Same gate with the qubit order reversed.
+            matrix = matrix.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+            first, second = second, first
+        path = range(first, second - 1)
+        for site in path:
+            self.apply_adjacent(site, SWAP)
+        self.apply_adjacent(second - 1, matrix)
+        for site in reversed(path):
+            self.apply_adjacent(site, SWAP)
+        self.swaps += 2 * len(path)
+
+    def apply(self, gate):
+        """Apply a statevector.Gate."""
+        if len(gate.qubits) == 1:
+            self.apply_single(gate.qubits[0], gate.matrix)
+        elif len(gate.qubits) == 2:
+            self.apply_two(*gate.qubits, gate.matrix)
+        else:
+            raise ValueError(f"MPS gates act on one or two qubits, not {len(gate.qubits)}")
+        return self
+
+    def run(self, gates):
+        for gate in gates:
+            self.apply(gate)
+        return self
+
+    def to_statevector(self):
+        """Dense state (small n only), qubit q = bit q of the index."""
+        psi = self.tensors[0]
+        for tensor in self.tensors[1:]:
+            psi = np.tensordot(psi, tensor, axes=(psi.ndim - 1, 0))
+        psi = psi.reshape((2,) * self.n_qubits)
+        return psi.transpose(range(self.n_qubits - 1, -1, -1)).reshape(-1)
+
+
+def cycles_of(gates):
+    """Split a gate list into cycles: single-qubit gates followed by two-qubit gates."""
+    cycles, current = [], []
+    for gate in gates:
+        if len(gate.qubits) == 1 and current and len(current[-1].qubits) > 1:
+            cycles.append(current)
+            current = []
+        current.append(gate)
+    return cycles + [current] if current else cycles
+
+
+def growth(n_qubits, cycles, max_bond=DEFAULT_MAX_BOND, cutoff=DEFAULT_CUTOFF, rng=None):
+    """Largest bond, fidelity estimate, memory and time after every cycle of a random circuit."""
+    from rcs import random_circuit
+
+    rng = rng if rng is not None else np.random.default_rng()
+    state = MPS(n_qubits, max_bond, cutoff)
+    records = []
+    start = time.perf_counter()
+    for cycle, gates in enumerate(cycles_of(random_circuit(n_qubits, cycles, rng)), 1):
+        state.run(gates)
+        records.append({
+            "cycle": cycle,
+            "max_bond": max(state.bond_dimensions(), default=1),
+            "fidelity": state.fidelity,
+            "bytes": state.nbytes,
+            "seconds": time.perf_counter() - start,
+            "swaps": state.swaps,
+        })
+    return records
+
+
+def _growth_params(n_qubits, cycles, max_bond, cutoff, seed):
+    return {"qubits": n_qubits, "cycles": cycles, "max_bond": max_bond, "cutoff": cutoff, "seed": seed}
+
+
+def stored_growth(n_qubits, cycles, max_bond=DEFAULT_MAX_BOND, cutoff=DEFAULT_CUTOFF, seed=0):
+    """growth() as stored in .benchmarks/mps.jsonl, computed on first use."""
+    return stored("mps", _growth_params(n_qubits, cycles, max_bond, cutoff, seed),
+                  lambda: growth(n_qubits, cycles, max_bond, cutoff, np.random.default_rng(seed)))
+
+
+def validate(n_qubits=8, cycles=8, max_bond=4, rng=None):
+    """
+    Deviation from the statevector without truncation, and the estimated
+    versus the actual fidelity with a small bond dimension.
+    """
+    from rcs import random_circuit
+    from statevector import run
+
+    rng = rng if rng is not None else np.random.default_rng()
+    gates = random_circuit(n_qubits, cycles, rng)
+    exact = run(gates, n_qubits, dtype=np.complex128)
+    error = float(np.max(np.abs(MPS(n_qubits, max_bond=2 ** n_qubits).run(gates).to_statevector() - exact)))
+    truncated = MPS(n_qubits, max_bond=max_bond).run(gates)
+    overlap = abs(np.vdot(exact, truncated.to_statevector())) ** 2
+    return error, truncated.fidelity, float(overlap)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matrix product state simulation of random circuits")
+    parser.add_argument("--qubits", type=int, default=105)
+    parser.add_argument("--cycles", type=int, default=12)
+    parser.add_argument("--max-bond", type=int, nargs="+", default=[DEFAULT_MAX_BOND])
+    parser.add_argument("--cutoff", type=float, default=DEFAULT_CUTOFF)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true",
+                        help="compare small circuits with the statevector")
+    parser.add_argument("--save", action="store_true", help="store the runs for WillowExplanation")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        error, estimate, actual = validate(rng=np.random.default_rng(args.seed))
+        print(f"untruncated error {error:.1e}; bond 4: estimated fidelity {estimate:.3f}, "
+              f"actual {actual:.3f}")
+    for max_bond in args.max_bond:
+        # Every bond dimension runs the same circuit.
+        records = growth(args.qubits, args.cycles, max_bond, args.cutoff, np.random.default_rng(args.seed))
+        if args.save:
+            save_stored("mps", _growth_params(args.qubits, args.cycles, max_bond, args.cutoff, args.seed),
+                        records)
+        print(f"{args.qubits} qubits, bond dimension <= {max_bond}")
+        for r in records:
+            print(f"  cycle {r['cycle']:3d}: max bond {r['max_bond']:5d}  fidelity {r['fidelity']:.3e}  "
+                  f"{r['bytes'] / 2 ** 20:8.2f} MiB  {r['seconds']:7.2f} s  {r['swaps']} swaps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Static overlay compositing for the 3D slides.
+
+In a ThreeDScene the camera rotation or a per-frame updater makes every
+mobject "moving", so titles, boxes and formulas added with
+add_fixed_in_frame_mobjects are rasterized again for every frame although
+they never change on screen. OverlayThreeDCamera rasterizes every run of
+consecutive fixed-in-frame mobjects once into its own premultiplied RGBA
+buffer and alpha-composites the buffers onto each frame in display order, so
+the z-order is the same as with ThreeDCamera. A buffer is only redrawn when
+one of its mobjects changes (points, colors, stroke width, pixels, or the set
+of mobjects itself).
+"""
+import itertools as it
+import zlib
+
+import numpy as np
+from manim import ThreeDScene
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.mobject.types.image_mobject import AbstractImageMobject
+
+_STYLE_ATTRIBUTES = [
+    "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas",
+    "stroke_width", "background_stroke_width", "pixel_array",
+]
+
+
+def _fingerprint(mobject):
+    """Cheap checksum of everything that influences how a mobject is drawn."""
+    checksum = zlib.crc32(np.ascontiguousarray(mobject.points).tobytes())
+    for name in _STYLE_ATTRIBUTES:
+        value = getattr(mobject, name, None)
+        if value is None:
+            continue
+        checksum = zlib.crc32(np.ascontiguousarray(value).tobytes(), checksum)
+    return id(mobject), checksum
+
+
+class _OverlayLayer:
+    """One run of consecutive fixed-in-frame mobjects, rasterized into its own buffer."""
+
+    def __init__(self):
+        self.buffer = None
+        self.key = None
+        self.pixels = None
+
+
+class OverlayThreeDCamera(ThreeDCamera):
+    """
+    ThreeDCamera that keeps fixed-in-frame mobjects in cached overlays.
+
+    The display order of ThreeDCamera is kept: the mobjects are split into
+    runs at every boundary between overlay and 3D content, every overlay run
+    is one cached layer, and the runs are drawn and composited in order.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.overlay_layers = []
+        # Counters to check how often the overlay actually had to be redrawn.
+        self.overlay_rasterizations = 0
+        self.overlay_composites = 0
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        self.reset_rotation_matrix()
+        members = self.get_mobjects_to_display(mobjects, **kwargs)
+        layers = 0
+        for fixed, run in it.groupby(members, lambda mob: mob in self.fixed_in_frame_mobjects):
+            run = list(run)
+            if not fixed:
+                self._display(run, self.pixel_array)
+                continue
+            if layers == len(self.overlay_layers):
+                self.overlay_layers.append(_OverlayLayer())
+            layer = self.overlay_layers[layers]
+            layers += 1
+            key = (
+                self.pixel_array.shape,
+                tuple(self.frame_center),
+                self.frame_width,
+                self.frame_height,
+                tuple(_fingerprint(mob) for mob in run),
+            )
+            if key != layer.key:
+                self._rasterize_overlay(layer, run)
+                layer.key = key
+            self._composite_overlay(layer)
+
+    def _display(self, members, pixel_array):
+        # Same batching as Camera.capture_mobjects, but onto any pixel array.
+        for group_type, group in it.groupby(members, self.type_or_raise):
+            self.display_funcs[group_type](list(group), pixel_array)
+
+    def _rasterize_overlay(self, layer, run):
+        if layer.buffer is None or layer.buffer.shape != self.pixel_array.shape:
+            if layer.buffer is not None:
+                # Cairo contexts are cached by id(pixel_array).
+                self.pixel_array_to_cairo_context.pop(id(layer.buffer), None)
+            layer.buffer = np.zeros_like(self.pixel_array)
+        else:
+            layer.buffer.fill(0)
+        for group_type, group in it.groupby(run, self.type_or_raise):
+            if group_type is AbstractImageMobject:
+                # PIL composites images with straight alpha, Cairo draws premultiplied:
+                # draw the images on their own and premultiply before merging.
+                scratch = np.zeros_like(layer.buffer)
+                self.display_funcs[group_type](list(group), scratch)
+                _blend(layer.buffer, _premultiplied(scratch))
+            else:
+                self.display_funcs[group_type](list(group), layer.buffer)
+        # Only pixels the overlay actually covers need compositing.
+        flat = layer.buffer.reshape(-1, layer.buffer.shape[-1])
+        layer.pixels = np.flatnonzero(flat[:, 3])
+        self.overlay_rasterizations += 1
+
+    def _composite_overlay(self, layer):
+        depth = self.pixel_array.shape[-1]
+        overlay = layer.buffer.reshape(-1, depth)[layer.pixels]
+        frame = self.pixel_array.reshape(-1, depth)
+        frame[layer.pixels] = _over(overlay, frame[layer.pixels])
+        self.overlay_composites += 1
+
+
+def _premultiplied(pixels):
+    alpha = pixels[..., 3:4].astype(np.uint16)
+    result = pixels.copy()
+    result[..., :3] = (pixels[..., :3] * alpha + 127) // 255
+    return result
+
+
+def _over(source, target):
+    """Premultiplied "over": src + dst * (1 - src_alpha), on uint8 pixels."""
+    alpha = source[..., 3:4].astype(np.uint16)
+    return source + (target.astype(np.uint16) * (255 - alpha) + 127) // 255
+
+
+def _blend(target, source):
+    covered = source[..., 3] > 0
+    target[covered] = _over(source[covered], target[covered])
+
+
+class OverlayThreeDScene(ThreeDScene):
+    """ThreeDScene rendered with OverlayThreeDCamera."""
+
+    def __init__(self, camera_class=OverlayThreeDCamera, **kwargs):
+        super().__init__(camera_class=camera_class, **kwargs)
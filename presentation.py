@@ -1,7 +1,41 @@
 from manim import *
 import numpy as np
 
-class QuantumSuperposition3D(ThreeDScene):
+from profiling import install_from_env
+from overlay import OverlayThreeDScene
+from seeding import SeededScene, deck_seed
+from surface_code import DecodingGraph, RotatedSurfaceCode, suppression_factors, sweep
+from union_find_decoder import UnionFindDecoder
+from rcs import WILLOW_QUBITS, extrapolate, stored_scaling
+from tensor_network import classical_cost
+from ion_trap import IonChain
+from bell_sampler import BELL_STATES, CHSHAccumulator, sample as sample_bell
+from live_chart import LiveBarChart
+from shot_sampler import ShotAccumulator, ShotSampler, bloch_state
+from statevector import CZ, Gate, H, Z
+from gate_fusion import execute as execute_circuit, fuse
+from stabilizer import StabilizerState
+from mps import stored_growth as mps_growth
+from exact_diag import stored_scaling as ed_scaling
+from lindblad import BlochTrajectory
+from qubit_dynamics import Trajectory, hadamard, larmor, rabi
+from qaoa import stored_solve as solve_qaoa
+from annealing import solve as anneal_tsp
+from tsp_heuristics import solve as solve_large_tsp
+from route_mobject import RouteMobject
+from tsp_bruteforce import projection as brute_force_projection, stored_scaling as brute_force_scaling
+from quantum_walk import QuantumWalk
+from heatmap_mobject import ProbabilityHeatmap
+from benchmarks import latest_stored
+from scaling_benchmark import load as load_scaling, table_rows
+
+# Opt-in Render-Profiler (PRESENTATION_PROFILE=<Ordner>)
+install_from_env()
+
+class QuantumSuperposition3D(SeededScene, OverlayThreeDScene):
+    # Number of repeated measurements of the equal superposition
+    measurement_shots = 1_000_000
+
     def construct(self):
         # Set up camera
         self.set_camera_orientation(phi=70*DEGREES, theta=-30*DEGREES)
@@ -157,6 +191,24 @@ class QuantumSuperposition3D(ThreeDScene):
             Transform(state_1_dot, collapse_to_1_dot.copy())
         )
         self.wait(2)
+
+        # Repeat the measurement many times: the outcome frequencies follow the Born rule
+        checkpoints = np.unique(np.geomspace(1, self.measurement_shots, 200).astype(int))
+        sampler = ShotSampler(bloch_state(PI / 2))
+        frequencies = ShotAccumulator(sampler, self.np_rng("measurement")).history(checkpoints)
+        chart = LiveBarChart(
+            2, y_range=(0, 1), width=3, height=2.5, bar_names=["|0⟩", "|1⟩"],
+            bar_colors=[RED, GREEN], show_values=True,
+        ).to_corner(UL).shift(DOWN * 0.8)
+        chart.add_reference_line(0.5, "50%")
+        progress = ValueTracker(0)
+        chart.add_updater(lambda m: m.set_values(frequencies[int(round(progress.get_value()))]))
+        self.add_fixed_in_frame_mobjects(chart)
+        self.update_info_text(info_text, "Repeated measurements\n1 to 1,000,000 shots")
+        self.play(FadeIn(chart))
+        self.play(progress.animate.set_value(len(checkpoints) - 1), run_time=6, rate_func=linear)
+        chart.clear_updaters()
+        self.wait()
         
         # Final explanation
         final_text = Text("Quantum superposition allows a qubit to exist\nin multiple states until measured", 
@@ -180,7 +232,13 @@ class QuantumSuperposition3D(ThreeDScene):
 
 #######################
 
-class QuantumEntanglementScene(Scene):
+class QuantumEntanglementScene(SeededScene, Scene):
+    # Number of measurements in the Bell test
+    bell_shots = 1_000_000
+    # Size of the GHZ state (a square number, drawn as a grid) and measurement rounds
+    ghz_qubits = 1024
+    ghz_shots = 3
+
     def construct(self):
         # Create two circles to represent the entangled particles, placing them apart.
         left_particle = Circle(radius=0.7, color=BLUE).shift(LEFT * 3)
@@ -223,12 +281,100 @@ class QuantumEntanglementScene(Scene):
         connection = Line(left_particle.get_center(), right_particle.get_center(), color=YELLOW)
         self.play(Create(connection), run_time=1)
         self.wait(1)
+
+        # Bell test: many measurements with randomly chosen settings (CHSH).
+        # The statistics are sampled up front for fixed shot counts, so every
+        # frame shows the same numbers no matter which plays come from the cache.
+        checkpoints = np.unique(np.geomspace(10, self.bell_shots, 240).astype(int))
+        correlations, chsh_values = CHSHAccumulator(rng=self.np_rng("bell")).history(checkpoints)
+
+        bell_title = Text("Bell Test (CHSH)", font_size=36).to_edge(UP)
+        self.play(FadeOut(VGroup(left_particle, right_particle, connection)), Transform(title, bell_title))
+
+        chart = LiveBarChart(
+            4, y_range=(-1, 1), width=6, height=4,
+            bar_names=["a₀b₀", "a₀b₁", "a₁b₀", "a₁b₁"],
+            bar_colors=[BLUE, RED, BLUE, BLUE], show_values=True,
+        ).to_edge(LEFT, buff=1).shift(DOWN * 0.5)
+        chart_label = Text("Correlation E(a, b)", font_size=20).next_to(chart, UP, buff=0.3)
+
+        progress = ValueTracker(0)
+
+        def checkpoint():
+            return int(round(progress.get_value()))
+
+        s_value = DecimalNumber(0, num_decimal_places=3, font_size=48)
+        s_row = VGroup(MathTex("S =", font_size=48), s_value).arrange(RIGHT)
+        shots_value = Integer(0, font_size=32, group_with_commas=True)
+        shots_row = VGroup(Text("Measurements:", font_size=24), shots_value).arrange(RIGHT)
+        bounds = VGroup(
+            MathTex(r"\text{Classical: } S \le 2", font_size=32, color=RED),
+            MathTex(r"\text{Quantum: } S \le 2\sqrt{2} \approx 2.828", font_size=32, color=GREEN),
+        ).arrange(DOWN, aligned_edge=LEFT)
+        panel = VGroup(shots_row, s_row, bounds).arrange(DOWN, aligned_edge=LEFT, buff=0.5)
+        panel.to_edge(RIGHT, buff=0.8).shift(DOWN * 0.5)
+
+        chart.add_updater(lambda m: m.set_values(correlations[checkpoint()]))
+        s_value.add_updater(lambda m: m.set_value(chsh_values[checkpoint()]))
+        shots_value.add_updater(lambda m: m.set_value(checkpoints[checkpoint()]))
+        self.play(FadeIn(chart), Write(chart_label), FadeIn(panel))
+        self.play(progress.animate.set_value(len(checkpoints) - 1), run_time=8, rate_func=linear)
+        for mob in (chart, s_value, shots_value):
+            mob.clear_updaters()
+        self.play(Indicate(s_row, color=GREEN))
+        self.wait(2)
+
+        # Entanglement at scale: a GHZ state of ghz_qubits qubits (stabilizer tableau)
+        # next to the same number of independent qubits in superposition.
+        rng = self.np_rng("ghz")
+        ghz = StabilizerState.ghz(self.ghz_qubits)
+        ghz_rounds = [ghz.copy().measure_all(rng) for _ in range(self.ghz_shots)]
+        product = StabilizerState(self.ghz_qubits).h(np.arange(self.ghz_qubits))
+        product_rounds = [product.copy().measure_all(rng) for _ in range(self.ghz_shots)]
+
+        side = int(round(np.sqrt(self.ghz_qubits)))
+
+        def qubit_grid():
+            return VGroup(*[
+                Square(side_length=3.6 / side, stroke_width=0, fill_opacity=1, fill_color=GRAY)
+                for _ in range(self.ghz_qubits)
+            ]).arrange_in_grid(rows=side, cols=side, buff=0)
+
+        ghz_grid = qubit_grid().shift(LEFT * 3 + DOWN * 0.4)
+        product_grid = qubit_grid().shift(RIGHT * 3 + DOWN * 0.4)
+        labels = VGroup(
+            Text(f"GHZ state, {self.ghz_qubits:,} qubits", font_size=24).next_to(ghz_grid, UP),
+            Text(f"{self.ghz_qubits:,} independent qubits", font_size=24).next_to(product_grid, UP),
+        )
+        footer = MathTex(
+            rf"2^{{{self.ghz_qubits}}} \text{{ amplitudes}} \;\to\; "
+            rf"\text{{{ghz.nbytes / 2 ** 10:.0f} KiB tableau}}",
+            font_size=30,
+        ).to_edge(DOWN, buff=0.3)
+        scale_title = Text("Entanglement at Scale", font_size=36).to_edge(UP)
+        self.play(FadeOut(VGroup(chart, chart_label, panel)), Transform(title, scale_title))
+        self.play(FadeIn(ghz_grid), FadeIn(product_grid), Write(labels))
+        for ghz_outcomes, product_outcomes in zip(ghz_rounds, product_rounds):
+            for grid, outcomes in ((ghz_grid, ghz_outcomes), (product_grid, product_outcomes)):
+                for square, outcome in zip(grid, outcomes):
+                    square.set_fill(GREEN if outcome else RED)
+            self.wait(1.2)
+        self.play(Write(footer))
+        self.wait(2)
         
         
 from manim import *
 import numpy as np
 
-class SuperpositionSlide(ThreeDScene):
+class SuperpositionSlide(SeededScene, OverlayThreeDScene):
+    # Gemessener Zustand: Polarwinkel auf der Bloch-Kugel (|ψ⟩ = cos(θ/2)|0⟩ + sin(θ/2)|1⟩)
+    bloch_theta = 2 * PI / 3
+    measurement_shots = 1_000_000
+    # Pulsfolge vor der Messung: Rabi-Puls von |0⟩ auf θ, dann Larmor-Präzession mit ganzen Umläufen
+    rabi_time = 1.5
+    larmor_time = 2.5
+    larmor_turns = 2
+
     def construct(self):
         # Kamera-Einstellung
         self.set_camera_orientation(phi=70*DEGREES, theta=-30*DEGREES)
@@ -279,10 +425,22 @@ class SuperpositionSlide(ThreeDScene):
         state_1 = Text("|1⟩", color=GREEN).scale(0.7).move_to(axes.c2p(0, 0, 2.5))
         self.add_fixed_in_frame_mobjects(state_0, state_1)
         
+        # Zustandsvektor folgt der vorab berechneten Pulsfolge (endet im gemessenen Zustand θ)
+        trajectory = Trajectory.at_frame_rate(
+            [rabi(self.rabi_time, angle=self.bloch_theta, phase=PI / 2),
+             larmor(self.larmor_time, turns=self.larmor_turns)],
+            config.frame_rate,
+        )
+
+        def arrow_end(t):
+            x, y, z = trajectory.vector(t)
+            # |1⟩ liegt in dieser Darstellung oben
+            return 1.5 * np.array([x, y, -z])
+
         # Pfeil (Zustandsvektor)
         arrow = Arrow3D(
             start=ORIGIN,
-            end=[0, 0, 2],
+            end=arrow_end(0),
             color=YELLOW,
             thickness=0.05
         )
@@ -294,27 +452,20 @@ class SuperpositionSlide(ThreeDScene):
         self.add_fixed_in_frame_mobjects(formula)
         
         # Animation des Pfeils (Superposition)
-        def update_arrow(mob, dt):
-            t = self.time % 4
-            # Komplexere Bewegung für bessere Visualisierung
-            theta = t * TAU  # Volle Drehung in der XY-Ebene
-            phi = np.sin(t * PI) * PI/2  # Oszillation in Z-Richtung
-            
-            x = 1.5 * np.sin(phi) * np.cos(theta)
-            y = 1.5 * np.sin(phi) * np.sin(theta)
-            z = 1.5 * np.cos(phi)
-            
-            new_end = [x, y, z]
-            mob.become(Arrow3D(start=ORIGIN, end=new_end, color=YELLOW, thickness=0.05))
-        
-        arrow.add_updater(update_arrow)
-        self.wait(4)  # 4 Sekunden Superposition
+        progress = ValueTracker(0)
+        arrow.add_updater(lambda mob: mob.become(
+            Arrow3D(start=ORIGIN, end=arrow_end(progress.get_value()), color=YELLOW, thickness=0.05)))
+        self.play(progress.animate.set_value(trajectory.duration), run_time=trajectory.duration,
+                  rate_func=linear)
         
         # Kollaps der Wellenfunktion
         arrow.clear_updaters()
         
-        # Zufälligen Endzustand wählen (hier: |0⟩ oder |1⟩)
-        final_state = np.random.choice([0, 1])
+        # Messergebnisse nach der Bornschen Regel ziehen; der erste Schuss bestimmt den Kollaps
+        checkpoints = np.unique(np.geomspace(1, self.measurement_shots, 200).astype(int))
+        accumulator = ShotAccumulator(ShotSampler(bloch_state(self.bloch_theta)), self.np_rng("measurement"))
+        frequencies = accumulator.history(checkpoints)
+        final_state = int(np.argmax(frequencies[0]))
         collapsed_vector = [0, 0, 2] if final_state else [0, 0, -2]
         collapsed_arrow = Arrow3D(
             start=ORIGIN,
@@ -333,6 +484,26 @@ class SuperpositionSlide(ThreeDScene):
         self.play(Transform(arrow, collapsed_arrow))
         self.wait(2)
 
+        # Wiederholte Messungen: Häufigkeiten nähern sich |α|² und |β|²
+        probabilities = np.abs(bloch_state(self.bloch_theta)) ** 2
+        chart = LiveBarChart(
+            2, y_range=(0, 1), width=3, height=2.5, bar_names=["|0⟩", "|1⟩"],
+            bar_colors=[RED, GREEN], show_values=True,
+        ).to_corner(UL).shift(DOWN * 0.8)
+        for probability in probabilities:
+            chart.add_reference_line(probability)
+        progress = ValueTracker(0)
+        shots_value = Integer(1, group_with_commas=True, font_size=28)
+        shots_label = VGroup(Text("Messungen:", font_size=24), shots_value).arrange(RIGHT).next_to(chart, DOWN, buff=0.6)
+        chart.add_updater(lambda m: m.set_values(frequencies[int(round(progress.get_value()))]))
+        shots_value.add_updater(lambda m: m.set_value(checkpoints[int(round(progress.get_value()))]))
+        self.add_fixed_in_frame_mobjects(chart, shots_label)
+        self.play(FadeOut(collapsed_label), FadeIn(chart), FadeIn(shots_label))
+        self.play(progress.animate.set_value(len(checkpoints) - 1), run_time=6, rate_func=linear)
+        chart.clear_updaters()
+        shots_value.clear_updaters()
+        self.wait(2)
+
 
 
 from manim import *
@@ -375,7 +546,7 @@ class Gliederung(Scene):
         
         
         
-class Quantenverschraenkung(ThreeDScene):
+class Quantenverschraenkung(SeededScene, OverlayThreeDScene):
     def construct(self):
         # Kamera-Einstellung
         self.set_camera_orientation(phi=70*DEGREES, theta=-90*DEGREES, zoom=0.8)
@@ -458,9 +629,13 @@ class Quantenverschraenkung(ThreeDScene):
         self.add(arrow_left, arrow_right)
         
         # Zufällige Bewegung der Pfeile
+        # Die Winkel werden vorab gezogen und über die Bildnummer abgerufen, damit
+        # jedes Bild unabhängig davon gleich aussieht, welche Plays aus dem Cache kommen.
+        random_angles = self.np_rng("arrows").uniform(0, PI, size=1024)
+
         def update_arrows(mob1, mob2, dt):
             t = self.time % 4
-            angle1 = np.random.uniform(0, PI)
+            angle1 = random_angles[int(round(self.time * config.frame_rate)) % len(random_angles)]
             angle2 = PI - angle1  # Gegenläufige Bewegung
             
             end_left = [np.sin(angle1), 0, np.cos(angle1)]
@@ -474,7 +649,9 @@ class Quantenverschraenkung(ThreeDScene):
         
         # Kollaps der Wellenfunktion
         arrow_left.clear_updaters()
-        collapse_state = np.random.choice([0, 1])
+        # Messung beider Qubits in der Z-Basis: der Singulett-Zustand liefert immer entgegengesetzte Ergebnisse
+        outcome_left, _ = sample_bell(BELL_STATES["psi_minus"], [0.0], [0.0], self.np_rng("measurement"))
+        collapse_state = int(outcome_left[0] < 0)
         collapse_left = [0, 0, 0.9] if collapse_state else [0, 0, -0.9]
         collapse_right = [0, 0, -0.9] if collapse_state else [0, 0, 0.9]
         
@@ -501,6 +678,11 @@ class Quantenverschraenkung(ThreeDScene):
 from manim import *
 
 class BitsVergleich(Scene):
+    # Verstimmter Rabi-Antrieb des Zustandsvektors (Umläufe pro Sekunde bzw. Hz), 8 s ab |0⟩
+    rabi_frequency = 0.25
+    rabi_detuning = 0.25
+    rabi_time = 8
+
     def construct(self):
         # Titel und Unterstrich
         title = Text("Aufbau", font_size=48).to_edge(UP, buff=0.3)
@@ -552,8 +734,16 @@ class BitsVergleich(Scene):
         # Y-Achse (mit Tiefeneffekt)
         y_axis = Line(start=[3, -0.4, 0], end=[3, -1, 0], color=WHITE)
         
-        # Zustandsvektor/Pfeil
-        arrow = Arrow(start=[3, -0.7, 0], end=[3.7, -0.2, 0], color=YELLOW, buff=0)
+        # Zustandsvektor/Pfeil, Bewegung vorab aus dem Hamiltonoperator berechnet
+        trajectory = Trajectory.at_frame_rate(
+            [rabi(self.rabi_time, self.rabi_frequency, detuning=self.rabi_detuning)], config.frame_rate)
+
+        def arrow_end(t):
+            x, y, z = trajectory.vector(t)
+            # Schrägbild: |1⟩ oben, y-Achse auf ein Viertel verkürzt wie die Ellipse
+            return np.array([3 + 0.9 * x, -0.7 - 0.9 * z + 0.225 * y, 0])
+
+        arrow = Arrow(start=[3, -0.7, 0], end=arrow_end(0), color=YELLOW, buff=0)
         
         # Qubit-Zustandsbeschreibung
         qubit_arrow = Arrow(start=[3, -1.5, 0], end=[3, -2, 0])
@@ -581,34 +771,27 @@ class BitsVergleich(Scene):
         self.play(Create(arrow))
         self.play(Create(qubit_arrow), Write(qubit_state))
         
-        # Animation des Pfeils/Zustandsvektors mit mehr Bewegung nach unten
-        def arrow_updater(mob, dt):
-            t = self.renderer.time % 4  # Gesamter Animationszyklus: 4 Sekunden
-            
-            # Bewegung auf der Bloch-Kugel simulieren
-            theta = t * TAU / 4  # Rotation in der XY-Ebene
-            
-            # Mehr Bewegung nach unten durch angepasste Oszillation
-            phi = np.sin(t * PI) * PI/2 - PI/6  # Oszillation mit Bias nach unten
-            
-            # Kugel zu 2D projizieren
-            x = 0.9 * np.sin(phi) * np.cos(theta)
-            y = 0.9 * np.sin(phi) * np.sin(theta) * 0.5  # Elliptische Projektion
-            z = 0.9 * np.cos(phi)
-            
-            # Pfeil aktualisieren
-            new_end = [3 + x, -0.7 + z, 0]
-            mob.put_start_and_end_on([3, -0.7, 0], new_end)
+        # Animation des Pfeils/Zustandsvektors: Nachschlagen in der Trajektorie
+        progress = ValueTracker(0)
+
+        def arrow_updater(mob):
+            mob.put_start_and_end_on([3, -0.7, 0], arrow_end(progress.get_value()))
         
         arrow.add_updater(arrow_updater)
         
-        self.wait(8)  # Animation für 8 Sekunden laufen lassen
+        self.play(progress.animate.set_value(trajectory.duration), run_time=trajectory.duration,
+                  rate_func=linear)
         
         # Updater entfernen, wenn nicht mehr benötigt
         arrow.remove_updater(arrow_updater)
 
 
-class QubitVisualization(ThreeDScene):
+class QubitVisualization(OverlayThreeDScene):
+    # Pulsfolge des Zustandsvektors: Hadamard, Larmor-Präzession, Hadamard (zurück nach |1⟩)
+    hadamard_time = 1.5
+    larmor_time = 5.0
+    larmor_turns = 2
+
     def construct(self):
         # Kamera-Einstellung
         self.set_camera_orientation(phi=70*DEGREES, theta=-30*DEGREES)
@@ -689,30 +872,35 @@ class QubitVisualization(ThreeDScene):
         self.add_fixed_in_frame_mobjects(qubit_arrow, qubit_state)
         self.play(Create(qubit_arrow), Write(qubit_state))
         
-        # Animation des Pfeils mit mehr Bewegung nach unten
-        def update_arrow(mob, dt):
-            t = self.renderer.time % 4
-            # Komplexere Bewegung mit mehr Betonung nach unten
-            theta = t * TAU  # Volle Drehung in der XY-Ebene
-            
-            # Oszillation mit Bias nach unten
-            phi = np.sin(t * PI) * PI/2 - PI/4
-            
-            x = np.sin(phi) * np.cos(theta)
-            y = np.sin(phi) * np.sin(theta)
-            z = np.cos(phi)
-            
-            new_end = axes.get_origin() + [x, y, z]
+        # Animation des Pfeils entlang der vorab berechneten Pulsfolge (Start in |1⟩, oben)
+        trajectory = Trajectory.at_frame_rate(
+            [hadamard(self.hadamard_time), larmor(self.larmor_time, turns=self.larmor_turns),
+             hadamard(self.hadamard_time)],
+            config.frame_rate, state=(0, 1),
+        )
+        progress = ValueTracker(0)
+
+        def update_arrow(mob):
+            x, y, z = trajectory.vector(progress.get_value())
+            new_end = axes.get_origin() + [x, y, -z]
             mob.become(Arrow3D(start=axes.get_origin(), end=new_end, color=YELLOW, thickness=0.05))
         
         arrow.add_updater(update_arrow)
         
-        self.wait(8)  # 8 Sekunden Animation zeigen
+        self.play(progress.animate.set_value(trajectory.duration), run_time=trajectory.duration,
+                  rate_func=linear)
+        arrow.clear_updaters()
 
 from manim import *
 import numpy as np
 
 class ZahlenDarstellung(Scene):
+    # Gemessene Skalierung, nie beim Rendern gemessen: zuletzt gespeicherte Messung
+    # (python scaling_benchmark.py run) oder eine andere Ergebnisdatei
+    scaling_results = None
+    scaling_rows = (1, 2, 3, 10, 16, 20)
+    scaling_projection = (40, 50)
+
     def construct(self):
         # Titel und Unterstrich
         title = Text("Aufbau", font_size=48).to_edge(UP, buff=0.3)
@@ -774,6 +962,26 @@ class ZahlenDarstellung(Scene):
         
         self.wait(2)
 
+        # Gemessen auf diesem Rechner: Speicher und Rechenzeit wachsen mit 2^n
+        records = load_scaling(self.scaling_results)
+        if not records:
+            raise RuntimeError("no stored scaling sweep; run `python scaling_benchmark.py run` first")
+        largest = records[-1]["qubits"]
+        rows = table_rows(records, set(self.scaling_rows) | {largest},
+                          [n for n in self.scaling_projection if n > largest])
+        messung = Table(
+            rows,
+            col_labels=[Text(label) for label in ["n", "Speicher", "Anlegen", "Hadamard-Schicht", "CNOT-Kette"]],
+            include_outer_lines=True,
+            line_config={"stroke_width": 1},
+        ).scale(0.4).next_to(underline, DOWN, buff=0.4)
+        hinweis = Text("* hochgerechnet", font_size=20).next_to(messung, DOWN, aligned_edge=LEFT)
+
+        self.play(*[FadeOut(mob) for mob in self.mobjects if mob not in (title, underline)])
+        self.play(Create(messung))
+        self.play(FadeIn(hinweis))
+        self.wait(3)
+
 from manim import *
 
 class GateComparison(Scene):
@@ -850,6 +1058,10 @@ from manim import *
 import numpy as np
 
 class FunctionalityComparison(Scene):
+    # Gespeicherte Messung mit dem dateibasierten Zustandsvektor bei Größen über dem Arbeitsspeicher,
+    # mitgeliefert in measurements/mmap.jsonl (python mmap_statevector.py --qubits 26 28 30 31 32 --save)
+    mmap_results = None
+
     def construct(self):
         # Titel und Unterstrich
         title = Text("Aufbau", font_size=48).to_edge(UP, buff=0.3)
@@ -951,11 +1163,44 @@ class FunctionalityComparison(Scene):
         self.play(Write(formula))
         self.wait(3)
 
+        # Gemessen: ein Hadamard-Gatter auf dem höchsten Qubit muss den ganzen Zustand lesen und schreiben
+        self.play(*[FadeOut(mob) for mob in self.mobjects])
+        stored_run = latest_stored("mmap", self.mmap_results)
+        if stored_run is None:
+            raise RuntimeError("no stored out-of-core measurement; run "
+                               "`python mmap_statevector.py --qubits 26 28 30 31 32 --directory <disk> --save` first")
+        _, results = stored_run
+        rows = [["n", "\\text{Zustand}", "\\text{Zeit pro Gatter}", "\\text{Ein-/Ausgabe}"]]
+        for result in results:
+            record = result["records"][0]
+            rows.append([
+                str(result["qubits"]) + ("" if result["in_memory"] else "^*"),
+                f"{result['bytes'] / 2 ** 30:,.1f}\\text{{ GiB}}",
+                f"{record['seconds'] + result['flush_seconds']:,.1f}\\text{{ s}}",
+                f"{(record['bytes_read'] + record['bytes_written']) / 2 ** 30:,.1f}\\text{{ GiB}}",
+            ])
+        measured = MathTable(rows, include_outer_lines=True, line_config={"stroke_width": 1}).scale(0.6)
+        measured.to_edge(UP, buff=1.2)
+        limit = results[-1]["memory_limit_qubits"]
+        limit_text = MathTex(
+            rf"^*\text{{ Arbeitsspeicher des Messrechners: bis }} n = {limit}"
+            rf"\text{{, danach jedes Gatter }} 2 \cdot 2^n \cdot 8 \text{{ Byte von der Festplatte}}",
+            font_size=30,
+        ).next_to(measured, DOWN, buff=0.6)
+        self.play(Create(measured))
+        self.play(Write(limit_text))
+        self.wait(3)
+
 
 from manim import *
 import numpy as np
 
 class QuantumVsClassicalMaze(Scene):
+    # Quantenlauf: Hüpfrate, entwickelte Zeit (in 1/Hüpfrate) und Laufzeit der Animation in Sekunden
+    walk_gamma = 1.0
+    walk_duration = 8.0
+    walk_run_time = 5
+
     def construct(self):
         # Define maze structure (0 = path, 1 = wall)
         maze_grid = np.array([
@@ -986,9 +1231,8 @@ class QuantumVsClassicalMaze(Scene):
         classical_title = Text("Classical Computer\n(Serial Search)", font_size=24).to_edge(LEFT)
         quantum_title = Text("Quantum Computer\n(Parallel Search)", font_size=24).to_edge(RIGHT)
         
-        # Create path trackers
+        # Create path tracker
         classical_path = VGroup()
-        quantum_paths = VGroup()
         
         self.play(Create(maze), FadeIn(start), FadeIn(end), Write(title))
         self.wait(1)
@@ -1028,31 +1272,17 @@ class QuantumVsClassicalMaze(Scene):
             FadeIn(quantum_title)
         )
         
-        # Quantum parallel paths visualization
-        all_quantum_paths = [
-            [8,9,10,18,26,25,24,32,40],   # Correct path
-            [8,9,1],                      # Dead end
-            [8,16,24,32,40],              # Alternative path
-            [8,16,24,25,17,9,10,18,26,25,24,32,40]
-        ]
-        
-        quantum_runners = [
-            Dot(color=BLUE).move_to(start.get_center()) 
-            for _ in all_quantum_paths
-        ]
-        
-        for path, runner in zip(all_quantum_paths, quantum_runners):
-            q_path = VGroup()
-            for idx in path:
-                new_segment = Line(runner.get_center(), maze[idx].get_center(), color=BLUE)
-                q_path.add(new_segment)
-                self.play(
-                    runner.animate.move_to(maze[idx].get_center()),
-                    Create(new_segment),
-                    run_time=0.5,
-                    rate_func=linear
-                )
-            quantum_paths.add(q_path)
+        # Continuous-time quantum walk from the first open cell, all frames precomputed
+        walk = QuantumWalk(maze_grid == 0, self.walk_gamma)
+        frames = walk.probabilities((1, 1), self.walk_duration, int(self.walk_run_time * config.frame_rate) + 1)
+        # Row i of the grid is drawn upwards here, image rows run downwards.
+        display_cells = walk.cells * [-1, 1] + [maze_grid.shape[0] - 1, 0]
+        heatmap = ProbabilityHeatmap(frames, display_cells, maze_grid.shape, cell_size, color=YELLOW).move_to(maze)
+        progress = ValueTracker(0)
+        heatmap.add_updater(lambda m: m.set_frame(int(round(progress.get_value()))))
+        self.add(heatmap)
+        self.play(progress.animate.set_value(len(frames) - 1), run_time=self.walk_run_time, rate_func=linear)
+        heatmap.clear_updaters()
         
         # Final comparison
         self.play(
@@ -1060,14 +1290,14 @@ class QuantumVsClassicalMaze(Scene):
             start.animate.move_to(maze[8].get_center()),
             end.animate.move_to(maze[40].get_center()),
             classical_path.animate.set_color(RED).scale(0.7).shift(LEFT*2),
-            quantum_paths.animate.set_color(BLUE).scale(0.7).shift(RIGHT*2),
+            heatmap.animate.move_to(ORIGIN).scale(0.7),
             FadeOut(title),
             FadeOut(classical_title),
             FadeOut(quantum_title),
             run_time=2
         )
         
-        comparison_text = Text("Quantum exploration completes\nall paths simultaneously", 
+        comparison_text = Text("Quantum walk: amplitude spreads\nthrough all corridors at once", 
                              font_size=24).to_edge(DOWN)
         self.play(Write(comparison_text))
         self.wait(3)
@@ -1078,7 +1308,7 @@ from manim import *
 #from qiskit import QuantumCircuit, Aer, execute
 import numpy as np
 
-class QuantumMaze(ThreeDScene):
+class QuantumMaze(SeededScene, ThreeDScene):
     def construct(self):
         # Maze configuration
         maze_size = 15
@@ -1112,7 +1342,7 @@ class QuantumMaze(ThreeDScene):
         
         # Create false paths using probabilistic wall removal[6]
         for _ in range(int(size**2 * 0.3)):
-            x, y = np.random.randint(1, size-1, 2)
+            x, y = self.np_rng("maze").integers(1, size-1, 2)
             grid[x][y].set_fill(WHITE, 1)
         
         return VGroup(*[cell for row in grid for cell in row])
@@ -1126,23 +1356,20 @@ class QuantumMaze(ThreeDScene):
 
     def quantum_solver(self, maze):
         # Quantum path superposition using Grover's algorithm[10]
-        qc = QuantumCircuit(4, 4)
-        qc.h(range(4))
-        qc.barrier()
+        qubits = range(4)
+        gates = [Gate("h", (q,), H) for q in qubits]
         
         # Oracle for valid paths[9]
-        qc.append(self.create_oracle(maze), range(4))
+        gates += self.create_oracle(maze)
         
         # Grover diffusion
-        qc.h(range(4))
-        qc.z(range(4))
-        qc.cz(0,3)
-        qc.h(range(4))
+        gates += [Gate("h", (q,), H) for q in qubits]
+        gates += [Gate("z", (q,), Z) for q in qubits]
+        gates.append(Gate("cz", (0, 3), CZ))
+        gates += [Gate("h", (q,), H) for q in qubits]
         
-        # Simulate quantum paths
-        simulator = Aer.get_backend('statevector_simulator')
-        result = execute(qc, simulator).result()
-        statevector = result.get_statevector()
+        # Simulate quantum paths (fused: single-qubit runs and diagonals become one pass each)
+        statevector = execute_circuit(fuse(gates), 4)
         
         # Visualize superposition paths
         paths = VGroup()
@@ -1158,10 +1385,10 @@ class QuantumMaze(ThreeDScene):
         return paths
 
     def create_oracle(self, maze):
-        # Simplified path validity checker[8]
-        oracle = QuantumCircuit(4)
+        # Simplified path validity checker[8]: phase oracle as a single diagonal gate
+        oracle = np.ones(16)
         # ... (complex gate sequence validating maze paths)
-        return oracle
+        return [Gate("oracle", (0, 1, 2, 3), oracle)]
 
     def dfs_path(self, maze, start, end):
         # Traditional DFS implementation[4]
@@ -1184,11 +1411,18 @@ from manim import *
 import random
 import numpy as np
 
-class MazeComparison(Scene):
+class MazeComparison(SeededScene, Scene):
+    maze_size = 11 # Must be an odd number for our generation algorithm
+    # Quantenlauf: Hüpfrate, entwickelte Zeit pro Zelle Kantenlänge und Laufzeit der Animation in Sekunden
+    walk_gamma = 1.0
+    walk_time_per_cell = 1.0
+    walk_run_time = 5
+
     def construct(self):
 # PARAMETERS
-        maze_size = 11 # Must be an odd number for our generation algorithm
-        cell_size = 0.7 # Visual size of each cell (square)
+        maze_size = self.maze_size
+        # Visual size of each cell (square): at most 0.7, small enough for two mazes side by side
+        cell_size = min(0.7, (config.frame_width - 1.5) / (2 * maze_size), (config.frame_height - 1.5) / maze_size)
         extra_opening_prob = 0.1 # Chance to add extra openings (false paths)
 
         # Generate a perfect maze using recursive backtracking.
@@ -1196,14 +1430,15 @@ class MazeComparison(Scene):
         # Add extra openings so that there are more false paths.
         self.add_false_paths(maze, extra_opening_prob)
         # Guarantee that start and end cells are open.
-        maze = 1
+        maze[1][1] = 1
         maze[maze_size - 2][maze_size - 2] = 1
 
         # Create and display the maze visualization.
         # (Cells painted WHITE for passages and DARK_GRAY for walls)
         maze_vgroup = self.create_maze_visual(maze, cell_size)
-        # Position the maze to the left so that we have room to show the “quantum” results later.
-        maze_vgroup.shift(LEFT * 5)
+        # Center the maze in the left half so that the “quantum” maze fits into the right half later.
+        self.maze_offset = LEFT * config.frame_width / 4 - maze_vgroup.get_center()
+        maze_vgroup.shift(self.maze_offset)
         self.play(FadeIn(maze_vgroup))
         self.wait(1)
 
@@ -1232,15 +1467,21 @@ class MazeComparison(Scene):
         self.wait(1)
 
         # QUANTUM SOLVER (Quantumcomputer)
-        # We “simulate” a quantum algorithm by finding several different solution paths
-        # (i.e. going all possible paths at once).
-        quantum_paths = self.solve_maze_quantum(maze, start, end, max_paths=4)
-        quantum_group = VGroup(*quantum_paths)
-        # Position the quantum solutions on the right.
-        quantum_group.shift(RIGHT * 5)
-        label_quantum = Text("Quantumcomputer", font_size=24).next_to(quantum_group, UP)
-        self.play(FadeIn(label_quantum))
-        self.play(Create(quantum_group), run_time=3)
+        # A continuous-time quantum walk from the start cell: the amplitude spreads
+        # through all corridors at once. All frames are computed before the animation.
+        walk = QuantumWalk(np.array(maze) == 1, self.walk_gamma)
+        frames = walk.probabilities(start, self.walk_time_per_cell * maze_size,
+                                    int(self.walk_run_time * config.frame_rate) + 1)
+        # Position the quantum maze on the right.
+        quantum_maze = maze_vgroup.copy().shift(RIGHT * config.frame_width / 2)
+        heatmap = ProbabilityHeatmap(frames, walk.cells, walk.shape, cell_size).move_to(quantum_maze)
+        label_quantum = Text("Quantumcomputer", font_size=24).next_to(quantum_maze, UP)
+        self.play(FadeIn(quantum_maze), FadeIn(label_quantum))
+        progress = ValueTracker(0)
+        heatmap.add_updater(lambda m: m.set_frame(int(round(progress.get_value()))))
+        self.add(heatmap)
+        self.play(progress.animate.set_value(len(frames) - 1), run_time=self.walk_run_time, rate_func=linear)
+        heatmap.clear_updaters()
         self.wait(2)
 
     def generate_maze(self, size):
@@ -1254,20 +1495,29 @@ class MazeComparison(Scene):
         def in_bounds(x, y):
             return 0 <= x < size and 0 <= y < size
 
-        def carve(x, y):
-            maze[x][y] = 1  # Mark current cell as a passage.
+        def shuffled_directions():
             # Consider neighbors two cells away (N, S, E, W)
             directions = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-            random.shuffle(directions)
+            self.rng("maze").shuffle(directions)
+            return iter(directions)
+
+        # Start carving from cell (1,1). An explicit stack replaces the
+        # recursion so that large mazes do not hit the recursion limit.
+        maze[1][1] = 1  # Mark current cell as a passage.
+        stack = [(1, 1, shuffled_directions())]
+        while stack:
+            x, y, directions = stack[-1]
             for dx, dy in directions:
                 nx, ny = x + dx, y + dy
                 if in_bounds(nx, ny) and maze[nx][ny] == 0:
                     # Also open the wall between the current cell and the neighbor.
                     wall_x, wall_y = x + dx // 2, y + dy // 2
                     maze[wall_x][wall_y] = 1
-                    carve(nx, ny)
-        # Start carving from cell (1,1)
-        carve(1, 1)
+                    maze[nx][ny] = 1
+                    stack.append((nx, ny, shuffled_directions()))
+                    break
+            else:
+                stack.pop()
         return maze
 
     def add_false_paths(self, maze, probability):
@@ -1282,7 +1532,7 @@ class MazeComparison(Scene):
                     neighbors = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
                     for nx, ny in neighbors:
                         if maze[nx][ny] == 1:
-                            if random.random() < probability:
+                            if self.rng("false_paths").random() < probability:
                                 maze[x][y] = 1
                                 break
 
@@ -1312,10 +1562,10 @@ class MazeComparison(Scene):
     def cell_center(self, pos, cell_size):
         """
         Convert a maze grid coordinate pos=(row, col) into a point (in scene coordinates)
-        corresponding to the center of that cell.
+        corresponding to the center of that cell of the maze shifted by ``maze_offset``.
         """
         row, col = pos
-        return np.array([col * cell_size, -row * cell_size, 0])
+        return np.array([col * cell_size, -row * cell_size, 0]) + self.maze_offset
 
     def solve_maze_classical(self, maze, start, end):
         """
@@ -1357,49 +1607,11 @@ class MazeComparison(Scene):
             path.reverse()
         return explored_order, path
 
-    def solve_maze_quantum(self, maze, start, end, max_paths=4):
-        """
-        Simulate a “quantum” solver by using DFS to collect several (up to max_paths)
-        different simple paths from start to end. (In a true quantum algorithm, all paths
-        would be explored simultaneously.) Each solution will be drawn as a colored line.
-        """
-        size = len(maze)
-        solutions = []
-
-        def dfs(current, path, visited):
-            if current == end:
-                solutions.append(path.copy())
-                return
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = current + dx, current + dy
-                next_cell = (nx, ny)
-                if 0 <= nx < size and 0 <= ny < size and maze[nx][ny] == 1 and next_cell not in visited:
-                    visited.add(next_cell)
-                    path.append(next_cell)
-                    dfs(next_cell, path, visited)
-                    path.pop()
-                    visited.remove(next_cell)
-                    if len(solutions) >= max_paths:
-                        return
-
-        dfs(start, [start], {start})
-
-        # Create a list of VMobjects – one for each solution path.
-        paths_vobjects = []
-        colors = [RED, ORANGE, PINK, YELLOW]
-        for i, sol in enumerate(solutions):
-            points = [self.cell_center(pos, 0.7) for pos in sol]
-            line = VMobject(stroke_width=4)
-            line.set_points_as_corners(points)
-            line.set_color(colors[i % len(colors)])
-            paths_vobjects.append(line)
-        return paths_vobjects
-
 
 from manim import *
 import random
 
-class MazeWithFalsePaths(Scene):
+class MazeWithFalsePaths(SeededScene, Scene):
     def construct(self):
         # Maze configuration
         size = 21  # Must be an odd number to ensure proper cell/wall layout
@@ -1442,7 +1654,7 @@ class MazeWithFalsePaths(Scene):
                 if 0 < nx < size - 1 and 0 < ny < size - 1 and not visited[nx][ny]:
                     neighbors.append((nx, ny))
             if neighbors:
-                nx, ny = random.choice(neighbors)
+                nx, ny = self.rng("maze").choice(neighbors)
                 # Determine the wall cell between current cell (x,y) and neighbor (nx,ny)
                 wx, wy = (x + nx) // 2, (y + ny) // 2
 
@@ -1471,7 +1683,7 @@ class MazeWithFalsePaths(Scene):
                         left_color = grid[i][j - 1].get_color()
                         right_color = grid[i][j + 1].get_color()
                         if left_color == path_color and right_color == path_color:
-                            if random.random() < false_path_prob:
+                            if self.rng("false_paths").random() < false_path_prob:
                                 false_path_anims.append(
                                     grid[i][j].animate.set_color(path_color).set_fill_opacity(0.7)
                                 )
@@ -1480,7 +1692,7 @@ class MazeWithFalsePaths(Scene):
                         up_color = grid[i - 1][j].get_color()
                         down_color = grid[i + 1][j].get_color()
                         if up_color == path_color and down_color == path_color:
-                            if random.random() < false_path_prob:
+                            if self.rng("false_paths").random() < false_path_prob:
                                 false_path_anims.append(
                                     grid[i][j].animate.set_color(path_color).set_fill_opacity(0.7)
                                 )
@@ -1504,10 +1716,12 @@ from manim import *
 import random
 from collections import deque
 
-class MazeWithFalsePathsAndSolution(Scene):
+class MazeWithFalsePathsAndSolution(SeededScene, Scene):
+    size = 21            # Must be odd for proper maze cell & wall layout.
+
     def construct(self):
         # CONFIGURATION
-        size = 21            # Must be odd for proper maze cell & wall layout.
+        size = self.size
         cell_size = 0.35
         base_color = BLUE_E  # Initial wall color.
         path_color = GOLD    # Color for passages.
@@ -1555,7 +1769,7 @@ class MazeWithFalsePathsAndSolution(Scene):
                 if 0 < nx < size - 1 and 0 < ny < size - 1 and not visited[nx][ny]:
                     neighbors.append((nx, ny))
             if neighbors:
-                nx, ny = random.choice(neighbors)
+                nx, ny = self.rng("maze").choice(neighbors)
                 wx, wy = (x + nx) // 2, (y + ny) // 2  # wall cell between current and neighbor
 
                 # Animate the removal of the wall between cells.
@@ -1579,7 +1793,7 @@ class MazeWithFalsePathsAndSolution(Scene):
                     # For horizontal walls: check if cells to the left and right are open.
                     if i % 2 == 1 and j % 2 == 0:
                         if maze_map[i][j - 1] and maze_map[i][j + 1]:
-                            if random.random() < false_path_prob:
+                            if self.rng("false_paths").random() < false_path_prob:
                                 false_path_anims.append(
                                     grid[i][j].animate.set_color(path_color).set_fill_opacity(0.7)
                                 )
@@ -1587,7 +1801,7 @@ class MazeWithFalsePathsAndSolution(Scene):
                     # For vertical walls: check for open cells above and below.
                     elif j % 2 == 1 and i % 2 == 0:
                         if maze_map[i - 1][j] and maze_map[i + 1][j]:
-                            if random.random() < false_path_prob:
+                            if self.rng("false_paths").random() < false_path_prob:
                                 false_path_anims.append(
                                     grid[i][j].animate.set_color(path_color).set_fill_opacity(0.7)
                                 )
@@ -1653,7 +1867,17 @@ class MazeWithFalsePathsAndSolution(Scene):
         self.wait(2)
 from manim import *
 
-class WillowExplanation(Scene):
+class WillowExplanation(SeededScene, Scene):
+    # Qubit-Anzahlen und Zyklen der RCS-Statevector-Simulation (einmal gemessen, siehe rcs.py --save)
+    rcs_qubits = tuple(range(4, 21, 2))
+    rcs_cycles = 12
+    # Tiefe und Suchläufe für die Tensornetzwerk-Kostenabschätzung mit 105 Qubits
+    tn_cycles = 20
+    tn_trials = 2
+    # Matrixproduktzustand mit 105 Qubits: Zyklen und maximale Bonddimensionen
+    mps_cycles = 8
+    mps_bonds = (8, 32)
+
     def construct(self):
         # Quote from Hartmut Neven
         quote = Text(
@@ -1718,13 +1942,87 @@ class WillowExplanation(Scene):
             Write(rcs_explanation)
         )
         
-        # Show a fictitious time comparison between Willow and classical computers
+        # Measured classical cost: statevector simulation of Willow-style random circuits
+        records = stored_scaling(self.rcs_qubits, self.rcs_cycles, seed=deck_seed())
+        projection = extrapolate(records)
+        axes = Axes(
+            x_range=[0, WILLOW_QUBITS + 5, 15],
+            y_range=[-3, 24, 3],
+            x_length=8,
+            y_length=3.5,
+            x_axis_config={"numbers_to_include": range(0, WILLOW_QUBITS + 1, 15)},
+            y_axis_config={"scaling": LogBase(custom_labels=True)},
+            tips=False,
+        ).next_to(rcs_explanation, DOWN, buff=0.4)
+        x_label = Text("Qubits", font_size=20).next_to(axes.x_axis, DOWN, buff=0.4)
+        y_label = Text("Seconds", font_size=20).rotate(PI / 2).next_to(axes.y_axis, LEFT, buff=0.6)
+        measured = axes.plot_line_graph(
+            [r["qubits"] for r in records], [r["seconds"] for r in records],
+            line_color=BLUE, vertex_dot_style={"color": BLUE}, vertex_dot_radius=0.05,
+        )
+        last = records[-1]
+        projected = DashedLine(
+            axes.c2p(last["qubits"], last["seconds"]),
+            axes.c2p(WILLOW_QUBITS, projection["seconds"]),
+            color=RED,
+        )
+        self.play(Create(axes), Write(x_label), Write(y_label))
+        self.play(Create(measured))
+        self.play(Create(projected))
+
+        exponent = int(np.floor(np.log10(projection["years"])))
+        # Best contraction order found for one amplitude (never worse than the statevector), at Frontier's FLOP rate
+        tn_cost = classical_cost(WILLOW_QUBITS, self.tn_cycles, self.tn_trials, rng=self.np_rng("tensor_network"))
+        tn_exponent = int(np.floor(np.log10(tn_cost["years"])))
         time_comparison = VGroup(
             Text("Willow: 5 Minutes", font_size=24, color=GREEN),
-            Text("Classical Supercomputer: 10^25 Years", font_size=24, color=RED)
-        ).arrange(DOWN, aligned_edge=LEFT).next_to(rcs_explanation, DOWN, buff=0.5)
+            MathTex(rf"\text{{This computer (statevector): }} 10^{{{exponent}}} \text{{ Years}}",
+                    font_size=30, color=RED),
+            MathTex(rf"\text{{Frontier (best contraction order, one amplitude): }} 10^{{{tn_exponent}}} \text{{ Years}}",
+                    font_size=30, color=RED),
+            Text(f"measured up to {last['qubits']} qubits, x{projection['time_factor_per_qubit']:.2f} per qubit, "
+                 f"XEB {last['xeb_noisy']:.2f} at Willow error rates",
+                 font_size=18, color=GRAY),
+        ).arrange(DOWN, aligned_edge=LEFT).next_to(axes, DOWN, buff=0.5)
         self.play(Write(time_comparison))
-        
+
+        # Matrix product states: exact while entanglement is low, then the fidelity collapses
+        mps_title = Text("Matrix Product State, 105 Qubits", font_size=36, color=YELLOW).to_edge(UP)
+        self.play(
+            FadeOut(time_comparison),
+            FadeOut(VGroup(axes, x_label, y_label, measured, projected)),
+            Transform(rcs_explanation, mps_title),
+        )
+        mps_axes = Axes(
+            x_range=[0, self.mps_cycles, 1],
+            y_range=[-40, 0, 10],
+            x_length=8,
+            y_length=4,
+            x_axis_config={"numbers_to_include": range(0, self.mps_cycles + 1, 2)},
+            y_axis_config={"scaling": LogBase(custom_labels=True)},
+            tips=False,
+        ).next_to(mps_title, DOWN, buff=0.6)
+        mps_labels = VGroup(
+            Text("Cycles", font_size=20).next_to(mps_axes.x_axis, DOWN, buff=0.4),
+            Text("Fidelity", font_size=20).rotate(PI / 2).next_to(mps_axes.y_axis, LEFT, buff=0.6),
+        )
+        self.play(Create(mps_axes), Write(mps_labels))
+        mps_curves = VGroup()
+        for bond, color in zip(self.mps_bonds, [BLUE, GREEN, ORANGE]):
+            records = mps_growth(WILLOW_QUBITS, self.mps_cycles, bond, seed=deck_seed())
+            curve = mps_axes.plot_line_graph(
+                [0] + [r["cycle"] for r in records],
+                [1.0] + [max(r["fidelity"], 1e-40) for r in records],
+                line_color=color, vertex_dot_style={"color": color}, vertex_dot_radius=0.05,
+            )
+            label = Text(f"χ = {bond}: {records[-1]['bytes'] / 2 ** 20:.1f} MiB", font_size=18, color=color)
+            mps_curves.add(VGroup(curve, label))
+            self.play(Create(curve))
+        legend = VGroup(*[group[1] for group in mps_curves]).arrange(DOWN, aligned_edge=LEFT)
+        legend.next_to(mps_axes, DOWN, buff=0.5)
+        self.play(Write(legend))
+        self.wait(2)
+
         # 3. Illustrate the Many-Worlds Interpretation (Parallel Universes)
         multiverse_text = Text(
             "Many-Worlds Interpretation of Quantum Mechanics",
@@ -1732,7 +2030,7 @@ class WillowExplanation(Scene):
         ).to_edge(UP)
         self.play(
             FadeOut(rcs_explanation), 
-            FadeOut(time_comparison), 
+            FadeOut(VGroup(mps_axes, mps_labels, mps_curves)),
             Write(multiverse_text)
         )
         
@@ -1766,11 +2064,21 @@ import random
 from manim import *
 import numpy as np
 import random
-class TSPComparison(Scene):
+class TSPComparison(SeededScene, Scene):
+    num_cities = 20
+    # Klassischer Teil: Parallel Tempering, eine Replika pro Temperatur, Ablauf in Sekunden
+    anneal_replicas = 16
+    anneal_run_time = 6
+    # Vollständige Suche: gemessen für die ersten n Städte, hochgerechnet auf alle Städte und auf 30
+    brute_force_cities = tuple(range(8, 13))
+    brute_force_projected = 30
+    # QAOA-Teil: Start und die nächstgelegenen Städte (5 Städte = 16 Qubits), Tiefe p = 1 .. 3
+    qaoa_cities = 5
+    qaoa_layers = 3
+    # Realistische Instanz am Ende: Anzahl Städte (lokale Suche bis zum lokalen Optimum)
+    large_cities = 10_000
+
     def construct(self):
-        # Set seeds for reproducibility
-        np.random.seed(10)
-        random.seed(10)
         title = Text("Problem des Handlungsreisenden", font_size=48).to_edge(UP, buff=0.3)
         underline = Line(title.get_left(), title.get_right(), color=WHITE)
         underline.next_to(title, DOWN, buff=0.1)
@@ -1781,9 +2089,10 @@ class TSPComparison(Scene):
         end_point = start_point  # Same as start point
 
         # Generate intermediate points randomly spread between start and end
-        num_cities = 20
+        num_cities = self.num_cities
+        city_rng = self.rng("cities")
         intermediate_points = [
-            np.array([random.uniform(-5.5, 5.5), random.uniform(-3, 3), 0])
+            np.array([city_rng.uniform(-5.5, 5.5), city_rng.uniform(-3, 3), 0])
             for _ in range(num_cities - 2)
         ]
         city_positions = [start_point] + intermediate_points + [end_point]
@@ -1805,90 +2114,148 @@ class TSPComparison(Scene):
         self.play(Write(classical_title))
         self.wait(1)
 
-        def route_distance(route):
-            dist = 0
-            for i in range(len(route) - 1):
-                p1 = city_positions[route[i]]
-                p2 = city_positions[route[i + 1]]
-                dist += np.linalg.norm(p2 - p1)
-            return dist
-
-        classical_candidates = []
-        num_classical_candidates = 5
-        for _ in range(num_classical_candidates):
-            candidate = [0] + random.sample(range(1, num_cities - 1), num_cities - 2) + [num_cities - 1]
-            classical_candidates.append(candidate)
-
-        distances = [route_distance(route) for route in classical_candidates]
-        best_index = np.argmin(distances)
-        optimal_candidate = classical_candidates[best_index]
-
-        for idx, candidate in enumerate(classical_candidates):
-            points = [city_positions[i] for i in candidate]
-            line = VMobject()
-            line.set_points_as_corners(points)
-            line.set_stroke(color=RED, width=3)
-            
-            self.play(Create(line), run_time=1)
-            self.wait(0.8)
-            self.play(FadeOut(line), run_time=0.5)
-            self.wait(0.2)
-            
-        optimal_points = [city_positions[i] for i in optimal_candidate]
-        optimal_classical_line = VMobject()
-        optimal_classical_line.set_points_as_corners(optimal_points)
-        optimal_classical_line.set_stroke(color=GREEN, width=4)
-        
-        self.play(Create(optimal_classical_line), run_time=1)
-        optimal_label = Tex("Optimaler Weg", font_size=40, color=GREEN).next_to(optimal_classical_line, DOWN)
+        # Parallel Tempering: alle Replikas suchen gleichzeitig, Verlauf vorab berechnet
+        distinct_positions = city_positions[:-1]
+        annealing = anneal_tsp([p[:2] for p in distinct_positions], replicas=self.anneal_replicas,
+                               rng=self.np_rng("annealing"))
+        history = annealing["history"]
+
+        progress = ValueTracker(0)
+
+        def record():
+            return history[int(round(progress.get_value()))]
+
+        replica_lines = VGroup(*[
+            RouteMobject(distinct_positions, tour).set_stroke(color=RED, width=2, opacity=0.3)
+            for tour in history[0]["tours"]
+        ])
+        for k, line in enumerate(replica_lines):
+            line.add_updater(lambda m, k=k: m.set_route(record()["tours"][k]))
+        optimal_classical_line = RouteMobject(distinct_positions, history[0]["best_tour"]).set_stroke(color=GREEN, width=4)
+        optimal_classical_line.add_updater(lambda m: m.set_route(record()["best_tour"]))
+        step_label = Tex(f"{self.anneal_replicas} Replikas, {history[-1]['step']:,} Schritte".replace(",", "."),
+                         font_size=30).to_edge(DOWN, buff=0.2)
+        self.add(replica_lines, optimal_classical_line)
+        self.play(Write(step_label))
+        self.play(progress.animate.set_value(len(history) - 1), run_time=self.anneal_run_time, rate_func=linear)
+        for mob in (*replica_lines, optimal_classical_line):
+            mob.clear_updaters()
+        self.play(FadeOut(replica_lines))
+
+        optimal_label = Tex("Bester gefundener Weg", font_size=40, color=GREEN).next_to(optimal_classical_line, DOWN)
         self.play(Write(optimal_label))
         self.wait(2)
 
-        self.play(FadeOut(classical_title), FadeOut(optimal_label), FadeOut(optimal_classical_line))
+        self.play(FadeOut(optimal_label), FadeOut(optimal_classical_line), FadeOut(step_label), FadeOut(city_dots))
+
+        # Vollständige Suche über alle (n - 1)!/2 Wege, parallel in Präfix-Blöcken, einmal gemessen
+        brute_records = brute_force_scaling([p[:2] for p in distinct_positions], self.brute_force_cities)
+
+        def years(n):
+            value = brute_force_projection(brute_records, n)["years"]
+            if value < 1000:
+                return rf"{value:.1f}".replace(".", "{,}")
+            return rf"10^{{{int(np.floor(np.log10(value)))}}}"
+
+        brute_lines = VGroup(*[
+            MathTex(rf"n = {r['cities']}: \; {r['tours']:,} \text{{ Wege in }} ".replace(",", "{.}")
+                    + rf"{r['seconds']:.2f}".replace(".", "{,}") + r"\,\text{s}", font_size=34)
+            for r in brute_records
+        ]).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
+        rate_line = Tex(f"{brute_records[-1]['tours_per_second']:,.0f} Wege/s".replace(",", "."), font_size=30)
+        projected_lines = VGroup(*[
+            MathTex(rf"n = {n}: \; {years(n)} \text{{ Jahre}}", font_size=34, color=RED)
+            for n in (len(distinct_positions), self.brute_force_projected)
+        ]).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
+        brute_table = VGroup(brute_lines, rate_line, projected_lines).arrange(DOWN, buff=0.4).move_to(DOWN * 0.3)
+        self.play(LaggedStart(*[FadeIn(line) for line in brute_lines], lag_ratio=0.3), run_time=2)
+        self.play(Write(rate_line))
+        self.play(FadeIn(projected_lines))
+        self.wait(2)
+
+        self.play(FadeOut(classical_title), FadeOut(brute_table), FadeIn(city_dots))
         self.wait(1)
 
         #############################
         ## QUANTUM COMPUTER APPROACH
         #############################
-        quantum_title = Tex("Quantencomputer", font_size=40).next_to(start_label, UP, buff=0.3)
+        quantum_title = Tex("Quantencomputer (QAOA, simuliert)", font_size=40).next_to(start_label, UP, buff=0.3)
         self.play(Write(quantum_title))
         self.wait(1)
 
-        quantum_candidates = VGroup()
-        num_quantum_candidates = 30
-        quantum_routes = []
-        
-        for _ in range(num_quantum_candidates):
-            candidate = [0] + random.sample(range(1, num_cities - 1), num_cities - 2) + [num_cities - 1]
-            quantum_routes.append(candidate)
-            
-            points = [city_positions[i] for i in candidate]
-            candidate_line = VMobject()
-            candidate_line.set_points_as_corners(points)
-            candidate_line.set_stroke(color=BLUE, width=2, opacity=0.2)
-            quantum_candidates.add(candidate_line)
-        
-        self.play(FadeIn(quantum_candidates), run_time=1.5)
-        self.wait(2)
-        
-        quantum_distances = [route_distance(route) for route in quantum_routes]
-        quantum_best_index = np.argmin(quantum_distances)
-        quantum_optimal = quantum_routes[quantum_best_index]
+        # QAOA-Simulation auf dem Start und den nächstgelegenen Städten, einmal berechnet und gespeichert
+        nearest = sorted(range(1, num_cities - 1), key=lambda i: np.linalg.norm(city_positions[i] - start_point))
+        qaoa_indices = [0] + nearest[:self.qaoa_cities - 1]
+        qaoa_result = solve_qaoa([city_positions[i][:2] for i in qaoa_indices], self.qaoa_layers)
+        tours = list(qaoa_result["lengths"])
+
+        def tour_line(tour):
+            return RouteMobject([city_positions[i] for i in qaoa_indices], tour)
+
+        qaoa_cities = VGroup(*[city_dots[i].copy().set_color(BLUE).scale(1.5) for i in qaoa_indices[1:]])
+        qaoa_info = Tex(
+            f"QAOA: {self.qaoa_cities} Städte, {qaoa_result['qubits']} Qubits, "
+            f"{qaoa_result['seconds_per_layer'] * 1e3:.1f} ms pro Schicht (Simulation)",
+            font_size=30,
+        ).to_edge(DOWN, buff=0.2)
+        self.play(FadeIn(qaoa_cities), Write(qaoa_info))
+
+        # Alle Touren, Deckkraft proportional zur Messwahrscheinlichkeit nach p Schichten
+        quantum_candidates = VGroup(*[tour_line(tour).set_stroke(color=BLUE, width=3, opacity=0) for tour in tours])
+        self.add(quantum_candidates)
+        depth_label = VMobject()
+        for level in qaoa_result["levels"]:
+            top = max(level["distribution"].values())
+            new_label = Tex(
+                f"$p = {level['layers']}$: {100 * level['valid_probability']:.1f}\\,\\% gültige Touren",
+                font_size=30,
+            ).next_to(qaoa_info, UP, buff=0.15)
+            self.play(
+                *[line.animate.set_stroke(opacity=0.9 * level["distribution"][tour] / top)
+                  for line, tour in zip(quantum_candidates, tours)],
+                FadeOut(depth_label),
+                FadeIn(new_label),
+                run_time=1.5,
+            )
+            depth_label = new_label
+            self.wait(1)
         
-        optimal_points = [city_positions[i] for i in quantum_optimal]
-        optimal_quantum_line = VMobject()
-        optimal_quantum_line.set_points_as_corners(optimal_points)
-        optimal_quantum_line.set_stroke(color=GREEN, width=5)
+        # Wahrscheinlichste Tour der tiefsten Stufe, ehrlich mit dem Optimum verglichen
+        final_level = qaoa_result["levels"][-1]
+        quantum_optimal = final_level["best_tour"]
+        is_optimal = np.isclose(qaoa_result["lengths"][quantum_optimal], qaoa_result["optimum_length"])
+        optimal_quantum_line = tour_line(quantum_optimal)
+        optimal_quantum_line.set_stroke(color=GREEN if is_optimal else ORANGE, width=5)
         
         self.play(Create(optimal_quantum_line), run_time=1.5)
-        optimal_quantum_label = Tex("Optimaler Weg", font_size=40, color=GREEN).next_to(optimal_quantum_line, DOWN)
-        self.play(Write(optimal_quantum_label))
+        optimal_quantum_label = Tex(
+            "Optimaler Weg" if is_optimal else "Wahrscheinlichster Weg -- nicht optimal",
+            font_size=40, color=GREEN if is_optimal else ORANGE,
+        ).next_to(optimal_quantum_line, DOWN)
+        if not is_optimal:
+            optimum_line = DashedVMobject(tour_line(qaoa_result["optimum"]).set_stroke(color=GREEN, width=4))
+            optimal_quantum_label = VGroup(
+                optimal_quantum_label, Tex("Optimum", font_size=32, color=GREEN)
+            ).arrange(DOWN, buff=0.15).next_to(optimal_quantum_line, DOWN)
+            optimal_quantum_line = VGroup(optimal_quantum_line, optimum_line)
+            self.play(Create(optimum_line), run_time=1.5)
+        summary = Tex(
+            f"$p = {final_level['layers']}$: Optimum mit "
+            f"{100 * final_level['optimum_probability']:.1f}\\,\\% gemessen, "
+            f"nur {100 * final_level['valid_probability']:.1f}\\,\\% gültige Touren",
+            font_size=30,
+        ).move_to(depth_label)
+        self.play(Write(optimal_quantum_label), ReplacementTransform(depth_label, summary))
+        depth_label = summary
         self.wait(2)
         
         
         self.play(
             FadeOut(quantum_title),
             FadeOut(quantum_candidates),
+            FadeOut(qaoa_cities),
+            FadeOut(qaoa_info),
+            FadeOut(depth_label),
             FadeOut(optimal_quantum_line),
             FadeOut(optimal_quantum_label),
             FadeOut(city_dots),
@@ -1896,10 +2263,36 @@ class TSPComparison(Scene):
         )
         self.wait(1)
 
+        # Realistische Logistik-Instanz: Greedy-Kanten-Tour, dann 2-opt/Or-opt mit Nachbarlisten
+        large_rng = self.np_rng("large_instance")
+        large_points = np.column_stack([
+            large_rng.uniform(-6.5, 6.5, self.large_cities), large_rng.uniform(-3.2, 2.4, self.large_cities)
+        ])
+        large = solve_large_tsp(large_points)
+        large_title = Tex(f"{self.large_cities:,} Städte".replace(",", "."), font_size=40).next_to(underline, DOWN, buff=0.2)
+        greedy_route = RouteMobject(large_points, large["greedy_tour"]).set_stroke(color=RED, width=1)
+        greedy_label = Tex("Greedy-Kanten-Tour", font_size=30, color=RED).to_edge(DOWN, buff=0.2)
+        self.play(Write(large_title), Create(greedy_route), Write(greedy_label), run_time=2)
+        self.wait(1)
+
+        improved_route = RouteMobject(large_points, large["tour"]).set_stroke(color=GREEN, width=1)
+        improved_label = Tex(
+            f"2-opt/Or-opt: {100 * (1 - large['length'] / large['greedy_length']):.0f}\\,\\% kürzer",
+            font_size=30, color=GREEN,
+        ).to_edge(DOWN, buff=0.2)
+        self.play(Transform(greedy_route, improved_route), Transform(greedy_label, improved_label), run_time=2)
+        self.wait(2)
+        self.play(FadeOut(large_title), FadeOut(greedy_route), FadeOut(greedy_label))
+        self.wait(1)
+
 
 from manim import *
 
-class QuantumMultiverse(Scene):
+class QuantumMultiverse(SeededScene, Scene):
+    # Qubit-Anzahlen und Zyklen der RCS-Statevector-Simulation (einmal gemessen, siehe rcs.py --save)
+    rcs_qubits = tuple(range(4, 21, 2))
+    rcs_cycles = 12
+
     def construct(self):
         # Display the quote
         quote = Text(
@@ -1921,8 +2314,11 @@ class QuantumMultiverse(Scene):
         self.play(FadeOut(quote), FadeOut(author))
         
         # Display the time comparison
-        time_text = Text("10,000,000,000,000,000,000,000,000 Jahre", font_size=20, color=RED).scale(1.2).center()
-        subtext = Text("Supercomputer vs. under five minutes for Google's quantum computer", font_size=24).next_to(time_text, DOWN, buff=0.5)
+        # Hochrechnung der auf diesem Rechner gemessenen RCS-Simulation auf 105 Qubits
+        projection = extrapolate(stored_scaling(self.rcs_qubits, self.rcs_cycles, seed=deck_seed()))
+        exponent = int(np.floor(np.log10(projection["years"])))
+        time_text = MathTex(rf"10^{{{exponent}}} \text{{ Jahre}}", font_size=60, color=RED).center()
+        subtext = Text(f"Statevector-Simulation auf diesem Rechner vs. unter fünf Minuten für Googles Willow ({WILLOW_QUBITS} Qubits)", font_size=20).next_to(time_text, DOWN, buff=0.5)
         
         self.play(FadeIn(time_text), FadeIn(subtext))
         self.wait(3)
@@ -1934,6 +2330,11 @@ from manim import *
 from manim import *
 
 class IonTrapQuantumComputer(Scene):
+    # Ca-40-Kette in einer Falle mit 1 MHz axialer und 5 MHz radialer Frequenz
+    num_ions = 5
+    axial_frequency = 1e6
+    radial_frequency = 5e6
+
     def construct(self):
         # Titel
         title = Text("Ionenfallen-Quantencomputer", font_size=48).to_edge(UP, buff=0.3)
@@ -1951,10 +2352,15 @@ class IonTrapQuantumComputer(Scene):
         trap_label = Text("Paul-Falle", font_size=20).next_to(trap, UP, buff=0.1)
         self.play(Create(trap), Write(trap_label))
         
-        # Ionen
-        ions = VGroup(*[Dot(color=RED) for _ in range(5)]).arrange(RIGHT, buff=0.5).move_to(trap)
+        # Ionen an ihren Gleichgewichtspositionen (Coulomb-Kristall, außen weiter auseinander)
+        chain = IonChain(self.num_ions, self.axial_frequency, self.radial_frequency)
+        positions = chain.dimensionless_positions
+        scale = 0.8 * trap.width / 2 / max(np.max(np.abs(positions)), 1e-9)
+        ion_points = [trap.get_center() + RIGHT * scale * x for x in positions]
+        ions = VGroup(*[Dot(point, color=RED) for point in ion_points])
         ion_label = Text("Ionen (z.B. Ca-40, Yb-171)", font_size=20).next_to(ions, DOWN, buff=0.1)
-        self.play(Create(ions), Write(ion_label))
+        spacing_label = Text(f"Abstand ≈ {1e6 * chain.minimum_spacing:.1f} µm", font_size=16).next_to(trap, DOWN, buff=0.1)
+        self.play(Create(ions), Write(ion_label), Write(spacing_label))
         
         # Laser (jetzt nicht mehr auf der Vakuumkammer)
         laser1 = Arrow(start=chamber.get_top() + LEFT*2, end=ions[0].get_center(), color=GREEN)
@@ -1964,6 +2370,29 @@ class IonTrapQuantumComputer(Scene):
 
         self.wait(2)
 
+        # Bewegungsmoden der Kette: Schwerpunkts- und Atmungsmode
+        self.play(FadeOut(laser1), FadeOut(laser2))
+        phase = ValueTracker(0)
+        amplitude = 0.15
+        for mode in range(min(2, self.num_ions)):
+            vector = chain.axial_vectors[:, mode]
+            frequency = chain.axial_frequencies[mode] / chain.axial_frequency
+            mode_label = Text(
+                f"{['Schwerpunktsmode', 'Atmungsmode'][mode]}: {chain.axial_frequencies[mode] / 1e6:.2f} MHz",
+                font_size=20, color=GREEN,
+            ).next_to(chamber, DOWN, buff=0.2)
+            for ion, point, weight in zip(ions, ion_points, vector):
+                ion.add_updater(
+                    lambda m, p=point, w=weight, f=frequency:
+                        m.move_to(p + RIGHT * amplitude * w * np.sin(f * phase.get_value()))
+                )
+            self.play(FadeIn(mode_label))
+            # Zwei Schwingungsperioden der Schwerpunktsmode
+            self.play(phase.animate.set_value(phase.get_value() + 4 * PI), run_time=4, rate_func=linear)
+            for ion in ions:
+                ion.clear_updaters()
+            self.play(FadeOut(mode_label), *[ion.animate.move_to(p) for ion, p in zip(ions, ion_points)])
+
         # Alles ausblenden
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
@@ -1992,6 +2421,15 @@ class IonTrapQuantumComputer(Scene):
 from manim import *
 
 class Herausforderungen(Scene):
+    # Dekohärenz unter Rabi-Antrieb mit Willows T1/T2 (µs), 200 µs in 6 s abgespielt
+    decoherence_t1 = 68.0
+    decoherence_t2 = 89.0
+    decoherence_duration = 200.0
+    decoherence_rabi = 0.02
+    decoherence_run_time = 6
+    # GHZ-Zustand zum Vergleich der Fidelity
+    decoherence_ghz_qubits = 4
+
     def construct(self):
         # Titel
         title = Text("Herausforderungen", font_size=48).to_edge(UP, buff=0.3)
@@ -2007,8 +2445,69 @@ class Herausforderungen(Scene):
             Text("• Programmierung", font_size=40),
         ).arrange(DOWN, aligned_edge=LEFT, buff=0.5).next_to(underline, DOWN, buff=1.0)
         
-        # Einblenden der Stichpunkte
-        for point in points:
+        # Dekohärenz: Bloch-Vektor (x-z-Ebene) schrumpft, Fidelity fällt
+        self.play(Write(points[0]))
+        samples = int(self.decoherence_run_time * config.frame_rate) + 1
+        trajectories = [
+            BlochTrajectory(n, self.decoherence_t1, self.decoherence_t2, self.decoherence_duration,
+                            samples, self.decoherence_rabi)
+            for n in (1, self.decoherence_ghz_qubits)
+        ]
+        radius = 1.4
+        sphere = Circle(radius=radius, color=GRAY)
+        axis_labels = VGroup(
+            MathTex(r"|0\rangle", font_size=28).next_to(sphere, UP, buff=0.1),
+            MathTex(r"|1\rangle", font_size=28).next_to(sphere, DOWN, buff=0.1),
+        )
+        bloch = VGroup(sphere, axis_labels, DashedLine(sphere.get_left(), sphere.get_right(), color=GRAY))
+        axes = Axes(
+            x_range=[0, self.decoherence_duration, 50],
+            y_range=[0, 1, 0.25],
+            x_length=5,
+            y_length=2.8,
+            axis_config={"include_numbers": True, "font_size": 20},
+            tips=False,
+        )
+        axes_labels = VGroup(
+            Text("µs", font_size=20).next_to(axes.x_axis, DOWN, buff=0.4),
+            Text("Fidelity", font_size=20).rotate(PI / 2).next_to(axes.y_axis, LEFT, buff=0.5),
+        )
+        VGroup(bloch, VGroup(axes, axes_labels)).arrange(RIGHT, buff=1.2).next_to(points[0], DOWN, buff=0.6)
+        legend = Text(
+            f"T1 = {self.decoherence_t1:g} µs, T2 = {self.decoherence_t2:g} µs; "
+            f"blau: 1 Qubit, orange: GHZ mit {self.decoherence_ghz_qubits} Qubits",
+            font_size=18, color=GRAY,
+        ).next_to(VGroup(bloch, axes), DOWN, buff=0.3)
+        self.play(Create(bloch), Create(axes), Write(axes_labels), FadeIn(legend))
+
+        # Trajektorie ist vorab berechnet und wird nur abgespielt
+        progress = ValueTracker(0)
+        center = sphere.get_center()
+
+        def bloch_end():
+            vector, _ = trajectories[0].at(progress.get_value())
+            return center + radius * np.array([vector[0], vector[2], 0])
+
+        arrow = Arrow(center, bloch_end(), buff=0, color=YELLOW)
+        arrow.add_updater(lambda m: m.put_start_and_end_on(center, bloch_end()))
+        curves = VGroup(*[VMobject(color=color, stroke_width=4) for color in (BLUE, ORANGE)])
+
+        def update_curve(curve, trajectory):
+            count = max(2, int(round(progress.get_value() * (len(trajectory.times) - 1))) + 1)
+            curve.set_points_as_corners(
+                [axes.c2p(t, f) for t, f in zip(trajectory.times[:count], trajectory.fidelity[:count])])
+
+        for curve, trajectory in zip(curves, trajectories):
+            curve.add_updater(lambda m, trajectory=trajectory: update_curve(m, trajectory))
+        self.add(arrow, curves)
+        self.play(progress.animate.set_value(1), run_time=self.decoherence_run_time, rate_func=linear)
+        for mob in (arrow, *curves):
+            mob.clear_updaters()
+        self.wait(1)
+        self.play(FadeOut(VGroup(bloch, axes, axes_labels, legend, arrow, curves)))
+
+        # Restliche Stichpunkte einblenden
+        for point in points[1:]:
             self.play(Write(point))
             self.wait(0.5)
         
@@ -2016,15 +2515,29 @@ class Herausforderungen(Scene):
 
 from manim import *
 
-class WillowErrorCorrection(Scene):
+class WillowErrorCorrection(SeededScene, Scene):
+    # Monte-Carlo-Parameter für die Kurven der logischen Fehlerrate
+    code_distances = (3, 5, 7)
+    error_rates = (0.02, 0.04, 0.06, 0.08, 0.1)
+    shots = 20000
+    error_count = 3
+
     def construct(self):
         # Titel
         title = Text("Fehlerkorrektur im Google Willow Chip", font_size=40).to_edge(UP)
         self.play(Write(title))
 
-        # Physische Qubits darstellen
-        physical_qubits = VGroup(*[Circle(radius=0.2, color=BLUE) for _ in range(49)])
-        physical_qubits.arrange_in_grid(7, 7, buff=0.3).shift(DOWN)
+        # Physische Qubits darstellen (Surface Code mit Distanz 7)
+        code = RotatedSurfaceCode(7)
+        spacing = 0.7
+
+        def grid_point(row, col):
+            return np.array([(col - 3) * spacing, (3 - row) * spacing, 0]) + DOWN
+
+        physical_qubits = VGroup(*[
+            Circle(radius=0.2, color=BLUE).move_to(grid_point(*rc))
+            for rc in code.data_coordinates
+        ])
         self.play(Create(physical_qubits))
 
         # Logisches Qubit hervorheben
@@ -2032,25 +2545,104 @@ class WillowErrorCorrection(Scene):
         logical_label = Text("Logisches Qubit", font_size=24).next_to(logical_qubit, UP)
         self.play(Create(logical_qubit), Write(logical_label))
 
-        # Fehler simulieren
-        error = Cross(scale_factor=0.2, color=RED).move_to(physical_qubits[24])
-        self.play(Create(error))
-
-        # Fehlerkorrektur visualisieren
-        correction_arrows = VGroup(*[
-            Arrow(start=physical_qubits[i].get_center(), end=physical_qubits[24].get_center(), color=GREEN, buff=0.1)
-            for i in [23, 25, 17, 31]
+        # Zufällige X-Fehler simulieren
+        errors = self.np_rng("errors").choice(code.n_data, self.error_count, replace=False)
+        error_marks = VGroup(*[
+            Cross(scale_factor=0.2, color=RED).move_to(physical_qubits[q]) for q in errors
         ])
-        self.play(Create(correction_arrows))
+        self.play(Create(error_marks))
+
+        # Syndrom: alle Z-Stabilisatoren mit ungerader Anzahl an Fehlern
+        error_vector = np.zeros(code.n_data, dtype=np.uint8)
+        error_vector[errors] = 1
+        syndrome_bits = code.check_matrix("X") @ error_vector % 2
+        stabilizer_points = [grid_point(*rc) for rc in code.stabilizer_coordinates["Z"]]
+        syndrome = VGroup(*[
+            Square(side_length=0.25, color=ORANGE, fill_opacity=0.8).move_to(stabilizer_points[s])
+            for s in np.flatnonzero(syndrome_bits)
+        ])
+        self.play(FadeIn(syndrome))
+
+        # Union-Find-Decoder bestimmt die Korrekturkette
+        graph = DecodingGraph(code, "X")
+        events = np.concatenate([syndrome_bits, np.zeros_like(syndrome_bits)]).astype(bool)
+        correction = UnionFindDecoder(graph).correction(events)
+        corrected = [graph.edge_faults[edge][2] for edge in correction]
+        chain = VGroup()
+        for edge, qubit in zip(correction, corrected):
+            # Kette von Stabilisator über das korrigierte Qubit zum Nachbarn bzw. Rand
+            corners = [stabilizer_points[node] for node in (graph.edge_u[edge], graph.edge_v[edge])
+                       if node != graph.boundary]
+            corners.insert(1, physical_qubits[qubit].get_center())
+            chain.add(VMobject(color=GREEN, stroke_width=6).set_points_as_corners(corners))
+        self.play(Create(chain))
 
         # Fehler korrigieren
-        self.play(FadeOut(error), Flash(physical_qubits[24], color=GREEN, flash_radius=0.3))
+        self.play(
+            FadeOut(error_marks), FadeOut(syndrome),
+            *[Flash(physical_qubits[q], color=GREEN, flash_radius=0.3) for q in corrected],
+        )
+        residual = error_vector.copy()
+        residual[corrected] ^= 1
+        if residual[code.logical["X"]].sum() % 2:
+            verdict = Text("Logischer Fehler!", font_size=28, color=RED)
+        else:
+            verdict = Text("Fehler korrigiert", font_size=28, color=GREEN)
+        verdict.next_to(logical_qubit, RIGHT, buff=0.3)
+        self.play(Write(verdict))
+        self.wait(1)
+
+        # Logische Fehlerrate in Abhängigkeit der physikalischen Fehlerrate
+        self.play(FadeOut(VGroup(physical_qubits, logical_qubit, logical_label, chain, verdict)))
+        results = sweep(self.code_distances, self.error_rates, self.shots,
+                        decoder_class=UnionFindDecoder, rng=self.np_rng("surface_code"))
+
+        axes = Axes(
+            x_range=[0, max(self.error_rates) * 1.05, 0.02],
+            y_range=[-4, 0, 1],
+            x_length=8,
+            y_length=4.5,
+            x_axis_config={"numbers_to_include": self.error_rates, "decimal_number_config": {"num_decimal_places": 2}},
+            y_axis_config={"scaling": LogBase(custom_labels=True)},
+            tips=False,
+        ).shift(DOWN * 0.5)
+        x_label = Text("physikalische Fehlerrate p", font_size=20).next_to(axes.x_axis, DOWN, buff=0.5)
+        y_label = Text("logische Fehlerrate", font_size=20).rotate(PI / 2).next_to(axes.y_axis, LEFT, buff=0.6)
+        self.play(Create(axes), Write(x_label), Write(y_label))
+
+        colors = [BLUE, GREEN, YELLOW, ORANGE, RED]
+        curves = VGroup()
+        for distance, color in zip(self.code_distances, colors):
+            rows = [r for r in results if r["distance"] == distance]
+            # Fehlerraten von 0 liegen unterhalb der Auflösung von shots Durchläufen
+            rates = [max(r["logical_error_rate"], 0.5 / self.shots) for r in rows]
+            curve = axes.plot_line_graph(
+                [r["p"] for r in rows], rates, line_color=color,
+                vertex_dot_style={"color": color}, vertex_dot_radius=0.05,
+            )
+            label = Text(f"d = {distance}", font_size=20, color=color).next_to(curve["line_graph"].get_end(), RIGHT)
+            curves.add(VGroup(curve, label))
+            self.play(Create(curve), Write(label), run_time=1.5)
+
+        # Unterhalb der Schwelle senkt jede Distanzerhöhung die Fehlerrate um den Faktor Λ (Willow: Λ ≈ 2)
+        factors = suppression_factors(results)
+        if factors:
+            p_low = min(f["p"] for f in factors)
+            lam = np.mean([f["lambda"] for f in factors if f["p"] == p_low])
+            lambda_text = MathTex(rf"\Lambda = \varepsilon_d / \varepsilon_{{d+2}} \approx {lam:.1f}", font_size=32)
+            lambda_text.next_to(title, DOWN, buff=0.3)
+            self.play(Write(lambda_text))
 
         self.wait(2)
 
 from manim import *
 
-class Anwendungen(Scene):
+class Anwendungen(SeededScene, Scene):
+    # Spin-Anzahlen und Modell der exakten Diagonalisierung (Heisenberg-Kette), gemessen und
+    # mitgeliefert in measurements/exact_diag.jsonl (python exact_diag.py --save)
+    ed_spins = tuple(range(8, 27, 2))
+    ed_model = "heisenberg"
+
     def construct(self):
         # Titel
         title = Text("Anwendung", font_size=48).to_edge(UP, buff=0.3)
@@ -2079,8 +2671,22 @@ class Anwendungen(Scene):
         self.play(Write(comparison))
         self.wait(2)
         
+        # Exakte Diagonalisierung auf diesem Rechner und Hochrechnung auf 100 Atome
+        records = ed_scaling(self.ed_spins, self.ed_model, seed=deck_seed())
+        projection = extrapolate(records, 100)
+        largest = records[-1]
+        measured = VGroup(
+            MathTex(rf"\text{{Gemessen: }} {largest['spins']} \text{{ Spins in }} {largest['seconds']:.1f}\,\text{{s}}, "
+                    rf"\times {projection['time_factor_per_qubit']:.1f} \text{{ pro Spin}}", font_size=36),
+            MathTex(rf"100 \text{{ Atome: }} 10^{{{int(np.floor(np.log10(projection['years'])))}}} \text{{ Jahre}}, "
+                    rf"10^{{{int(np.floor(np.log10(projection['bytes'])))}}} \text{{ Byte}}", font_size=36, color=RED)
+        ).arrange(DOWN, buff=0.3).next_to(comparison, DOWN, buff=0.6)
+        
+        self.play(FadeIn(measured))
+        self.wait(2)
+        
         # Ausblenden des Vergleichs
-        self.play(FadeOut(comparison))
+        self.play(FadeOut(comparison), FadeOut(measured))
         
         # Restliche Stichpunkte einblenden
         for point in points[1:]:
@@ -2221,11 +2827,14 @@ from manim import *
 from manim import *
 
 class RSAPrimeFactorization(Scene):
+    # Anzahl der angezeigten Ziffern (None = alle 617)
+    rsa_digits = None
+
     def construct(self):
         # Die RSA-2048 Zahl als langer String
         rsa_number = (
             "251959084756578934940271832400483985714292821262040320277771378360436620207075955562640185258807844069182906412495150821892985591491761845028084891200728449926873928072877767359714183472702618963750149718246911650776133798590957000973304597488084284017974291006424586918171951187461215151726546322822168699875491824224336372590851418654620435767984233871847744479207399342365848238242812981631501067481045166037730605619676256133844143603833904414952634432190114657544454178424020924616515723350778707749817125772467962926386356373289912154831438167899885040445364023527381951378636564391212010397122822120720357"
-        )
+        )[:self.rsa_digits]
 
         # Bestimme, wieviele Ziffern pro Zeile angezeigt werden sollen
         digits_per_line = 70
@@ -0,0 +1,291 @@
+"""
+Opt-in render profiler for the scenes in presentation.py.
+
+The profiler wraps Scene.play (Scene.wait goes through play), the per-frame
+updater pass, rasterization and the partial movie writer, and records one
+entry per play call. Nothing is patched unless it is switched on, either
+from code with ``RenderProfiler().install()`` or from the shell:
+
+    PRESENTATION_PROFILE=profiles manim presentation.py MazeComparison
+
+After every rendered scene three files are written to the output directory:
+
+- ``<Scene>.json``    all play records plus per-scene totals
+- ``<Scene>.folded``  collapsed stacks for flamegraph.pl / speedscope
+- ``<Scene>.txt``     the top-N report (also printed to the console)
+"""
+import json
+import os
+import time
+from collections import defaultdict
+
+from manim import Scene, Wait
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+ENV_VARIABLE = "PRESENTATION_PROFILE"
+TOP_N_VARIABLE = "PRESENTATION_PROFILE_TOP"
+
+
+def _describe_animations(animations):
+    """Short human readable label for the animations of one play call."""
+    if not animations:
+        return "-"
+    label = str(animations[0])
+    if len(animations) > 1:
+        label += f" +{len(animations) - 1}"
+    return label
+
+
+class RenderProfiler:
+    """
+    Collects timing information for every play call of every rendered scene.
+
+    Each record is a plain dict with the keys
+    index, kind, animations, run_time, wall_time, frames, family_size,
+    updater_time, updater_calls, render_time, write_time and cached.
+    """
+
+    def __init__(self, output_dir=None, top_n=10):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.records = defaultdict(list)
+        self._current = None
+        self._originals = {}
+
+    # ------------------------------------------------------------------
+    # Installation
+    # ------------------------------------------------------------------
+    def install(self):
+        """Patch the manim classes. Calling install twice is harmless."""
+        if self._originals:
+            return self
+        profiler = self
+
+        original_play = Scene.play
+        original_update_mobjects = Scene.update_mobjects
+        original_render = Scene.render
+        original_update_frame = CairoRenderer.update_frame
+        original_write_frame = SceneFileWriter.write_frame
+        original_end_animation = SceneFileWriter.end_animation
+
+        def play(scene, *args, **kwargs):
+            # Nested plays (e.g. a play issued from inside an updater) are
+            # attributed to the outermost call.
+            if profiler._current is not None:
+                return original_play(scene, *args, **kwargs)
+            record = profiler._new_record(scene)
+            profiler._current = record
+            start = time.perf_counter()
+            try:
+                return original_play(scene, *args, **kwargs)
+            finally:
+                record["wall_time"] = time.perf_counter() - start
+                profiler._finish_record(scene, record)
+                profiler._current = None
+
+        def update_mobjects(scene, dt):
+            record = profiler._current
+            if record is None:
+                return original_update_mobjects(scene, dt)
+            start = time.perf_counter()
+            try:
+                return original_update_mobjects(scene, dt)
+            finally:
+                record["updater_time"] += time.perf_counter() - start
+                record["updater_calls"] += 1
+
+        def render(scene, *args, **kwargs):
+            try:
+                return original_render(scene, *args, **kwargs)
+            finally:
+                profiler.scene_finished(str(scene))
+
+        def update_frame(renderer, *args, **kwargs):
+            record = profiler._current
+            if record is None:
+                return original_update_frame(renderer, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return original_update_frame(renderer, *args, **kwargs)
+            finally:
+                record["render_time"] += time.perf_counter() - start
+
+        def write_frame(writer, *args, **kwargs):
+            record = profiler._current
+            if record is None:
+                return original_write_frame(writer, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return original_write_frame(writer, *args, **kwargs)
+            finally:
+                record["write_time"] += time.perf_counter() - start
+                record["frames"] += 1
+
+        def end_animation(writer, *args, **kwargs):
+            record = profiler._current
+            if record is None:
+                return original_end_animation(writer, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return original_end_animation(writer, *args, **kwargs)
+            finally:
+                record["write_time"] += time.perf_counter() - start
+
+        self._originals = {
+            (Scene, "play"): original_play,
+            (Scene, "update_mobjects"): original_update_mobjects,
+            (Scene, "render"): original_render,
+            (CairoRenderer, "update_frame"): original_update_frame,
+            (SceneFileWriter, "write_frame"): original_write_frame,
+            (SceneFileWriter, "end_animation"): original_end_animation,
+        }
+        Scene.play = play
+        Scene.update_mobjects = update_mobjects
+        Scene.render = render
+        CairoRenderer.update_frame = update_frame
+        SceneFileWriter.write_frame = write_frame
+        SceneFileWriter.end_animation = end_animation
+        return self
+
+    def uninstall(self):
+        """Restore the original manim methods."""
+        for (cls, name), method in self._originals.items():
+            setattr(cls, name, method)
+        self._originals = {}
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def _new_record(self, scene):
+        return {
+            "index": len(self.records[str(scene)]),
+            "kind": "play",
+            "animations": "-",
+            "run_time": 0.0,
+            "wall_time": 0.0,
+            "frames": 0,
+            "family_size": 0,
+            "updater_time": 0.0,
+            "updater_calls": 0,
+            "render_time": 0.0,
+            "write_time": 0.0,
+            "cached": False,
+        }
+
+    def _finish_record(self, scene, record):
+        animations = scene.animations or []
+        if len(animations) == 1 and isinstance(animations[0], Wait):
+            record["kind"] = "wait"
+        record["animations"] = _describe_animations(animations)
+        record["run_time"] = float(scene.duration or 0.0)
+        record["family_size"] = len(scene.get_mobject_family_members())
+        # The renderer flips skip_animations on when the play hash was found
+        # in the partial movie cache.
+        renderer = scene.renderer
+        record["cached"] = bool(
+            getattr(renderer, "skip_animations", False)
+            and not getattr(renderer, "_original_skipping_status", False)
+        )
+        self.records[str(scene)].append(record)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def totals(self, scene_name):
+        """Sum of all numeric fields of one scene."""
+        records = self.records.get(scene_name, [])
+        keys = ["run_time", "wall_time", "frames", "updater_time",
+                "updater_calls", "render_time", "write_time"]
+        totals = {key: sum(record[key] for record in records) for key in keys}
+        totals["plays"] = len(records)
+        totals["cached_plays"] = sum(record["cached"] for record in records)
+        totals["max_family_size"] = max(
+            (record["family_size"] for record in records), default=0)
+        return totals
+
+    def report(self, scene_name, top_n=None):
+        """Return a text report of the slowest play calls of a scene."""
+        top_n = top_n or self.top_n
+        records = self.records.get(scene_name, [])
+        totals = self.totals(scene_name)
+        lines = [
+            f"{scene_name}: {totals['plays']} plays "
+            f"({totals['cached_plays']} cached), "
+            f"{totals['frames']} frames, {totals['wall_time']:.2f}s wall, "
+            f"{totals['updater_time']:.2f}s updaters, "
+            f"{totals['render_time']:.2f}s rasterizing, "
+            f"{totals['write_time']:.2f}s writing",
+            f"{'#':>5} {'kind':<5} {'wall':>8} {'frames':>6} {'family':>7} "
+            f"{'updat.':>8} {'raster':>8} {'write':>8}  animations",
+        ]
+        slowest = sorted(records, key=lambda r: r["wall_time"], reverse=True)
+        for record in slowest[:top_n]:
+            lines.append(
+                f"{record['index']:>5} {record['kind']:<5} "
+                f"{record['wall_time']:>8.3f} {record['frames']:>6} "
+                f"{record['family_size']:>7} {record['updater_time']:>8.3f} "
+                f"{record['render_time']:>8.3f} {record['write_time']:>8.3f}  "
+                f"{record['animations']}"
+            )
+        return "\n".join(lines)
+
+    def folded_stacks(self, scene_name):
+        """
+        Collapsed stack lines ("frame;frame;frame weight") in microseconds.
+        The remainder of a play that is not updaters, rasterizing or writing
+        is reported as "other" (animation interpolation, hashing, ...).
+        """
+        lines = []
+        for record in self.records.get(scene_name, []):
+            frame = f"{scene_name};{record['kind']} {record['index']:04d} {record['animations']}"
+            frame = frame.replace(" ", "_")
+            parts = {
+                "updaters": record["updater_time"],
+                "rasterize": record["render_time"],
+                "write": record["write_time"],
+            }
+            parts["other"] = max(record["wall_time"] - sum(parts.values()), 0.0)
+            for name, seconds in parts.items():
+                weight = int(round(seconds * 1e6))
+                if weight > 0:
+                    lines.append(f"{frame};{name} {weight}")
+        return "\n".join(lines)
+
+    def export(self, scene_name, output_dir=None):
+        """Write the JSON, folded stack and text report files of a scene."""
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, scene_name)
+        with open(base + ".json", "w") as f:
+            json.dump({
+                "scene": scene_name,
+                "totals": self.totals(scene_name),
+                "plays": self.records.get(scene_name, []),
+            }, f, indent=2)
+        with open(base + ".folded", "w") as f:
+            f.write(self.folded_stacks(scene_name) + "\n")
+        with open(base + ".txt", "w") as f:
+            f.write(self.report(scene_name) + "\n")
+
+    def scene_finished(self, scene_name):
+        if not self.records.get(scene_name):
+            return
+        print(self.report(scene_name))
+        if self.output_dir:
+            self.export(scene_name)
+
+
+def install_from_env():
+    """Install a profiler if PRESENTATION_PROFILE is set, otherwise do nothing."""
+    output_dir = os.environ.get(ENV_VARIABLE)
+    if not output_dir:
+        return None
+    top_n = int(os.environ.get(TOP_N_VARIABLE, "10"))
+    return RenderProfiler(output_dir=output_dir, top_n=top_n).install()
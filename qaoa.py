@@ -0,0 +1,275 @@
+"""
+QAOA for small travelling salesman instances.
+
+A tour of n cities starting at city 0 is encoded in (n - 1)^2 binary
+variables x[t, c] = "city c is visited at position t" (c, t = 1 .. n - 1,
+city 0 fixed at position 0), so 4 cities need 9 qubits and 5 cities 16. The
+QUBO adds the tour length and a penalty P (1 - sum x)^2 for every row and
+column, so only permutation matrices are free of penalties.
+
+The diagonal cost Hamiltonian is evaluated once for all 2^m basis states
+(bit i of the index is variable i). A QAOA layer is then a phase exp(-i
+gamma C) times the transverse field mixer exp(-i beta sum X), applied as
+Kronecker blocks of four qubits on a reshaped view of the state. Angles are
+optimized with COBYLA layer by layer: depth p + 1 starts from the linearly
+interpolated angles of depth p. TSPComparison takes the result from
+.benchmarks/qaoa.jsonl (stored_solve), so the optimization runs once per
+instance and not on every render.
+
+    python qaoa.py --cities 5 --layers 3
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from benchmarks import stored
+
+DEFAULT_LAYERS = 3
+
+
+def distance_matrix(points):
+    points = np.asarray(points, dtype=float)
+    return np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+
+
+def variable(position, city, n_cities):
+    """Index of x[position, city], both counted from 1."""
+    return (position - 1) * (n_cities - 1) + city - 1
+
+
+def tsp_qubo(distances, penalty=None):
+    """
+    Symmetric Q and offset with cost(x) = x^T Q x + offset: the tour length for
+    permutation matrices, at least ``penalty`` more for every other assignment.
+    """
+    distances = np.asarray(distances, dtype=float)
+    n = len(distances)
+    # Dropping a city shortens the tour by at most two edges.
+    penalty = 3 * distances.max() if penalty is None else penalty
+    m = (n - 1) ** 2
+    q = np.zeros((m, m))
+    offset = 0.0
+
+    def add(i, j, weight):
+        q[i, j] += weight / 2
+        q[j, i] += weight / 2
+
+    cities = range(1, n)
+    for c in cities:
+        add(variable(1, c, n), variable(1, c, n), distances[0, c])
+        add(variable(n - 1, c, n), variable(n - 1, c, n), distances[c, 0])
+    for t in range(1, n - 1):
+        for c, d in itertools.permutations(cities, 2):
+            add(variable(t, c, n), variable(t + 1, d, n), distances[c, d])
+    # P (1 - sum x)^2 = P (1 - sum x + 2 sum_{i<j} x_i x_j) for binary x.
+    groups = [[variable(t, c, n) for c in cities] for t in cities] \
+        + [[variable(t, c, n) for t in cities] for c in cities]
+    for group in groups:
+        offset += penalty
+        for i in group:
+            add(i, i, -penalty)
+        for i, j in itertools.combinations(group, 2):
+            add(i, j, 2 * penalty)
+    return q, offset
+
+
+def diagonal_costs(q, offset=0.0, chunk=1 << 16):
+    """x^T Q x + offset for every basis state, in chunks of ``chunk`` states."""
+    m = len(q)
+    costs = np.empty(1 << m)
+    shifts = np.arange(m)
+    for start in range(0, 1 << m, chunk):
+        states = np.arange(start, min(start + chunk, 1 << m))
+        bits = ((states[:, None] >> shifts) & 1).astype(float)
+        costs[start:start + len(states)] = np.einsum("si,si->s", bits @ q, bits) + offset
+    return costs
+
+
+def tour_states(n_cities):
+    """Basis index of every tour (permutations of 1 .. n - 1 after city 0)."""
+    tours, indices = [], []
+    for order in itertools.permutations(range(1, n_cities)):
+        index = sum(1 << variable(t, c, n_cities) for t, c in enumerate(order, 1))
+        tours.append((0,) + order)
+        indices.append(index)
+    return tours, np.array(indices)
+
+
+def apply_mixer(state, n_qubits, beta, group=4):
+    """
+    exp(-i beta sum_q X_q) = Rx(2 beta) on every qubit, applied to ``group``
+    qubits at a time as one Kronecker block (one matmul per group).
+    """
+    rx = np.array([[np.cos(beta), -1j * np.sin(beta)], [-1j * np.sin(beta), np.cos(beta)]])
+    for q in range(0, n_qubits, group):
+        size = min(group, n_qubits - q)
+        block = rx
+        for _ in range(size - 1):
+            block = np.kron(block, rx)
+        view = state.reshape(-1, 1 << size, 1 << q)
+        view[...] = np.matmul(block, view)
+    return state
+
+
+class QAOA:
+    """QAOA with the transverse field mixer for a diagonal cost function ``costs``."""
+
+    def __init__(self, costs, scale=None):
+        self.costs = np.asarray(costs, dtype=float)
+        self.n_qubits = int(np.log2(len(self.costs)))
+        # Phases exp(-i gamma C / scale), so that gamma ~ 1 is a sensible range.
+        self.scale = scale if scale is not None else float(np.std(self.costs)) or 1.0
+        self.layer_seconds = 0.0
+        self.layers_applied = 0
+        self.evaluations = 0
+
+    def state(self, gammas, betas):
+        state = np.full(len(self.costs), 1 / np.sqrt(len(self.costs)), dtype=complex)
+        for gamma, beta in zip(gammas, betas):
+            start = time.perf_counter()
+            state *= np.exp(-1j * gamma / self.scale * self.costs)
+            apply_mixer(state, self.n_qubits, beta)
+            self.layer_seconds += time.perf_counter() - start
+            self.layers_applied += 1
+        return state
+
+    def probabilities(self, gammas, betas):
+        return np.abs(self.state(gammas, betas)) ** 2
+
+    def expectation(self, angles):
+        self.evaluations += 1
+        p = len(angles) // 2
+        return float(np.dot(self.probabilities(angles[:p], angles[p:]), self.costs))
+
+    @property
+    def seconds_per_layer(self):
+        return self.layer_seconds / max(1, self.layers_applied)
+
+    def optimize(self, layers=DEFAULT_LAYERS, grid=12, max_iter=200):
+        """
+        Angles for depth 1 .. ``layers``: a grid search for p = 1, then COBYLA,
+        each deeper level starting from the interpolated angles of the last.
+        """
+        from scipy.optimize import minimize
+
+        values = np.linspace(0, np.pi, grid, endpoint=False)
+        best = min(((g, b) for g in values for b in values / 2),
+                   key=lambda angles: self.expectation(np.array(angles)))
+        gammas, betas = np.array([best[0]]), np.array([best[1]])
+        results = []
+        for p in range(1, layers + 1):
+            if p > 1:
+                gammas, betas = _interpolate(gammas), _interpolate(betas)
+            result = minimize(self.expectation, np.concatenate([gammas, betas]), method="COBYLA",
+                              options={"maxiter": max_iter})
+            gammas, betas = result.x[:p], result.x[p:]
+            results.append((gammas.copy(), betas.copy(), float(result.fun)))
+        return results
+
+
+def _interpolate(angles):
+    """INTERP initialization: p angles stretched to p + 1."""
+    p = len(angles)
+    extended = np.concatenate([[0.0], angles, [0.0]])
+    return np.array([(i / p) * extended[i] + ((p - i) / p) * extended[i + 1] for i in range(p + 1)])
+
+
+def solve(points, layers=DEFAULT_LAYERS, penalty=None):
+    """
+    QAOA on the TSP of ``points`` (4-5 cities). Returns per depth the tour
+    distribution (tour -> probability), the weight on valid tours and the
+    best tour, together with simulation time per layer.
+    """
+    distances = distance_matrix(points)
+    n = len(distances)
+    start = time.perf_counter()
+    q, offset = tsp_qubo(distances, penalty)
+    costs = diagonal_costs(q, offset)
+    hamiltonian_seconds = time.perf_counter() - start
+    tours, indices = tour_states(n)
+    lengths = costs[indices]
+    optimum = tours[int(np.argmin(lengths))]
+    qaoa = QAOA(costs)
+    start = time.perf_counter()
+    levels = []
+    for gammas, betas, energy in qaoa.optimize(layers):
+        probabilities = qaoa.probabilities(gammas, betas)[indices]
+        order = np.argsort(-probabilities)
+        levels.append({
+            "layers": len(gammas),
+            "gammas": gammas,
+            "betas": betas,
+            "energy": energy,
+            "distribution": {tours[i]: float(probabilities[i]) for i in order},
+            "valid_probability": float(probabilities.sum()),
+            "best_tour": tours[order[0]],
+            "optimum_probability": float(probabilities[tours.index(optimum)]),
+        })
+    return {
+        "cities": n,
+        "qubits": qaoa.n_qubits,
+        "optimum": optimum,
+        "optimum_length": float(lengths.min()),
+        "lengths": dict(zip(tours, lengths.tolist())),
+        "levels": levels,
+        "hamiltonian_seconds": hamiltonian_seconds,
+        "optimize_seconds": time.perf_counter() - start,
+        "seconds_per_layer": qaoa.seconds_per_layer,
+        "evaluations": qaoa.evaluations,
+    }
+
+
+def _storable(result):
+    """solve() result with tours as lists instead of tuple keys (JSON)."""
+    return dict(
+        result,
+        optimum=list(result["optimum"]),
+        lengths=[[list(tour), length] for tour, length in result["lengths"].items()],
+        levels=[dict(level, gammas=list(level["gammas"]), betas=list(level["betas"]),
+                     distribution=[[list(tour), p] for tour, p in level["distribution"].items()],
+                     best_tour=list(level["best_tour"]))
+                for level in result["levels"]],
+    )
+
+
+def _restored(result):
+    return dict(
+        result,
+        optimum=tuple(result["optimum"]),
+        lengths={tuple(tour): length for tour, length in result["lengths"]},
+        levels=[dict(level, distribution={tuple(tour): p for tour, p in level["distribution"]},
+                     best_tour=tuple(level["best_tour"]))
+                for level in result["levels"]],
+    )
+
+
+def stored_solve(points, layers=DEFAULT_LAYERS, penalty=None):
+    """solve() as stored in .benchmarks/qaoa.jsonl, computed on first use."""
+    params = {"points": np.asarray(points, dtype=float).tolist(), "layers": layers, "penalty": penalty}
+    return _restored(stored("qaoa", params, lambda: _storable(solve(points, layers, penalty))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QAOA for small TSP instances")
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--layers", type=int, default=DEFAULT_LAYERS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    points = np.random.default_rng(args.seed).uniform(-3, 3, size=(args.cities, 2))
+    result = solve(points, args.layers)
+    print(f"{result['cities']} cities, {result['qubits']} qubits: cost Hamiltonian in "
+          f"{result['hamiltonian_seconds'] * 1e3:.1f} ms, {result['seconds_per_layer'] * 1e3:.2f} ms "
+          f"per layer, {result['evaluations']} evaluations in {result['optimize_seconds']:.1f} s")
+    print(f"optimal tour {result['optimum']} (length {result['optimum_length']:.3f})")
+    uniform = 1 / 2 ** result["qubits"]
+    for level in result["levels"]:
+        print(f"  p = {level['layers']}: valid tours {level['valid_probability']:.3f}, "
+              f"optimum {level['optimum_probability']:.4f} ({level['optimum_probability'] / uniform:.0f}x "
+              f"uniform), most likely {level['best_tour']}")
+
+
+if __name__ == "__main__":
+    main()
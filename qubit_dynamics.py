@@ -0,0 +1,138 @@
+"""
+Single-qubit dynamics under piecewise constant Hamiltonians.
+
+A pulse is H = (omega . sigma) / 2 for ``duration`` seconds of animation
+time; omega (rad/s) is the rotation axis times the angular speed of the
+Bloch vector. Its propagator has the closed form
+
+    U(t) = cos(|omega| t / 2) I - i sin(|omega| t / 2) (n . sigma),
+
+so a whole pulse sequence is evaluated for all frame times at once as a
+batch of 2x2 matrices. Trajectory holds the states and Bloch vectors at
+every frame; updaters only look them up.
+
+    python qubit_dynamics.py --validate
+"""
+import argparse
+import collections
+
+import numpy as np
+
+I2 = np.eye(2, dtype=complex)
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Y = np.array([[0, -1j], [1j, 0]])
+Z = np.diag([1.0 + 0j, -1.0])
+PAULIS = np.array([X, Y, Z])
+
+Pulse = collections.namedtuple("Pulse", ["name", "duration", "omega"])
+
+
+def rabi(duration, frequency=None, angle=None, phase=0.0, detuning=0.0):
+    """
+    Drive about the axis (cos phase, sin phase, 0), with ``frequency`` in turns
+    per second or the rotation ``angle`` reached after ``duration``; a
+    ``detuning`` (Hz) tilts the axis toward z.
+    """
+    speed = angle / duration if angle is not None else 2 * np.pi * frequency
+    return Pulse("rabi", duration,
+                 (speed * np.cos(phase), speed * np.sin(phase), 2 * np.pi * detuning))
+
+
+def larmor(duration, frequency=None, turns=None):
+    """Free precession about z with ``frequency`` (Hz) or a number of full ``turns``."""
+    speed = 2 * np.pi * (turns / duration if turns is not None else frequency)
+    return Pulse("larmor", duration, (0.0, 0.0, speed))
+
+
+def hadamard(duration):
+    """The Hadamard gate as a rotation by pi about (x + z) / sqrt(2), up to a global phase."""
+    speed = np.pi / duration
+    return Pulse("hadamard", duration, (speed / np.sqrt(2), 0.0, speed / np.sqrt(2)))
+
+
+def propagators(omega, times):
+    """exp(-i t (omega . sigma) / 2) for every entry of ``times``, shape (len(times), 2, 2)."""
+    omega = np.asarray(omega, dtype=float)
+    times = np.asarray(times, dtype=float)
+    speed = np.linalg.norm(omega)
+    if speed == 0:
+        return np.broadcast_to(I2, (len(times), 2, 2)).copy()
+    generator = np.tensordot(omega / speed, PAULIS, axes=1)
+    half = 0.5 * speed * times
+    return np.cos(half)[:, None, None] * I2 - 1j * np.sin(half)[:, None, None] * generator
+
+
+def bloch_vectors(states):
+    """(x, y, z) for a batch of states with shape (n, 2)."""
+    states = np.asarray(states)
+    return np.real(np.einsum("ni,kij,nj->nk", states.conj(), PAULIS, states))
+
+
+class Trajectory:
+    """States and Bloch vectors of a pulse sequence at ``samples`` evenly spaced times."""
+
+    def __init__(self, pulses, samples, state=(1, 0)):
+        self.pulses = list(pulses)
+        self.duration = sum(p.duration for p in self.pulses)
+        self.times = np.linspace(0, self.duration, samples)
+        self.states = np.empty((samples, 2), dtype=complex)
+        state = np.asarray(state, dtype=complex)
+        start = 0.0
+        for number, pulse in enumerate(self.pulses):
+            end = start + pulse.duration
+            last = number == len(self.pulses) - 1
+            inside = (self.times >= start) & ((self.times <= end) if last else (self.times < end))
+            self.states[inside] = np.einsum(
+                "nij,j->ni", propagators(pulse.omega, self.times[inside] - start), state)
+            state = propagators(pulse.omega, [pulse.duration])[0] @ state
+            start = end
+        self.final_state = state
+        self.vectors = bloch_vectors(self.states)
+
+    @classmethod
+    def at_frame_rate(cls, pulses, frame_rate, state=(1, 0)):
+        duration = sum(p.duration for p in pulses)
+        return cls(pulses, int(round(duration * frame_rate)) + 1, state)
+
+    def index(self, t):
+        return int(np.clip(round(t / self.duration * (len(self.times) - 1)), 0, len(self.times) - 1))
+
+    def vector(self, t):
+        """Bloch vector at time ``t`` (nearest sample)."""
+        return self.vectors[self.index(t)]
+
+
+def validate(samples=101, rng=None):
+    """Largest deviation of the closed form from scipy's expm, and of H|0> from |+>."""
+    from scipy.linalg import expm
+
+    rng = rng if rng is not None else np.random.default_rng()
+    omega = rng.normal(size=3)
+    times = np.linspace(0, 5, samples)
+    hamiltonian = 0.5 * np.tensordot(omega, PAULIS, axes=1)
+    reference = np.array([expm(-1j * hamiltonian * t) for t in times])
+    propagator_error = float(np.max(np.abs(propagators(omega, times) - reference)))
+    final = Trajectory([hadamard(1.0)], samples).final_state
+    plus = np.array([1, 1]) / np.sqrt(2)
+    hadamard_error = 1 - abs(np.vdot(plus, final)) ** 2
+    return propagator_error, float(hadamard_error)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bloch trajectories of pulse sequences")
+    parser.add_argument("--frame-rate", type=float, default=60)
+    parser.add_argument("--validate", action="store_true", help="compare with scipy.linalg.expm")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        print("propagator error %.1e, Hadamard infidelity %.1e" % validate())
+    sequence = [hadamard(1.5), larmor(5.0, turns=2), hadamard(1.5)]
+    trajectory = Trajectory.at_frame_rate(sequence, args.frame_rate)
+    print(f"{len(trajectory.times)} frames over {trajectory.duration:g} s")
+    for t in np.arange(0, trajectory.duration + 1e-9, 1.0):
+        x, y, z = trajectory.vector(t)
+        print(f"  t = {t:4.1f} s: ({x:+.3f}, {y:+.3f}, {z:+.3f})")
+
+
+if __name__ == "__main__":
+    main()
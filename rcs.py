@@ -0,0 +1,210 @@
+"""
+Random circuit sampling (RCS) and linear cross-entropy benchmarking.
+
+Circuits follow the structure of the Sycamore/Willow experiments: qubits on
+a grid, every cycle a random single-qubit gate out of {sqrt(X), sqrt(Y),
+sqrt(W)} per qubit (never the same gate twice in a row) followed by fSim
+gates on one of four coupler layers A, B, C, D in the order ABCDCDAB.
+
+The circuits are simulated with the chunked statevector of statevector.py,
+bitstrings are sampled from the ideal or a depolarized distribution and the
+linear XEB fidelity F = 2^n <p(x)> - 1 is computed. scaling() measures how
+time and memory of the simulation grow per added qubit on this machine and
+extrapolate() projects that curve to Willow's 105 qubits. The scenes take
+the sweep from .benchmarks/rcs.jsonl (stored_scaling), measured once; --save
+measures again and stores the result:
+
+    python rcs.py --qubits 4 6 8 10 12 14 16 18 20 --cycles 12 --save
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks import save_stored, stored
+from statevector import Gate, max_qubits, run, sample
+
+WILLOW_QUBITS = 105
+# Willow average error rates (Google Quantum AI, 2024).
+WILLOW_ERRORS = {"single": 0.00035, "two": 0.0033, "readout": 0.0077}
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def _sqrt_pauli(pauli):
+    # sqrt(P) = e^{i pi/4} (I - i P) / sqrt(2) for a Pauli P
+    return np.exp(1j * np.pi / 4) * (np.eye(2) - 1j * pauli) / np.sqrt(2)
+
+
+_PAULI_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_PAULI_Y = np.array([[0, -1j], [1j, 0]])
+SINGLE_QUBIT_GATES = {
+    "sqrt_x": _sqrt_pauli(_PAULI_X),
+    "sqrt_y": _sqrt_pauli(_PAULI_Y),
+    "sqrt_w": _sqrt_pauli((_PAULI_X + _PAULI_Y) / np.sqrt(2)),
+}
+PATTERN = "ABCDCDAB"
+
+
+def fsim(theta=np.pi / 2, phi=np.pi / 6):
+    """fSim gate as used on Sycamore (iSWAP-like plus a conditional phase)."""
+    c, s = np.cos(theta), -1j * np.sin(theta)
+    return np.array([[1, 0, 0, 0], [0, c, s, 0], [0, s, c, 0],
+                     [0, 0, 0, np.exp(-1j * phi)]])
+
+
+def grid(n_qubits):
+    """(rows, cols) of the most square grid holding n_qubits qubits."""
+    rows = int(np.floor(np.sqrt(n_qubits)))
+    return rows, -(-n_qubits // rows)
+
+
+def coupler_layers(n_qubits):
+    """
+    Couplers of a grid split into the layers A/B (horizontal) and C/D
+    (vertical). Qubit (r, c) has index r * cols + c, incomplete rows are cut.
+    """
+    rows, cols = grid(n_qubits)
+    layers = {name: [] for name in "ABCD"}
+    for r in range(rows):
+        for c in range(cols):
+            q = r * cols + c
+            if q >= n_qubits:
+                continue
+            if c + 1 < cols and q + 1 < n_qubits:
+                layers["AB"[c % 2]].append((q, q + 1))
+            if r + 1 < rows and q + cols < n_qubits:
+                layers["CD"[r % 2]].append((q, q + cols))
+    return layers
+
+
+def random_circuit(n_qubits, cycles, rng=None):
+    """Gate list of a random circuit with ``cycles`` cycles."""
+    rng = rng if rng is not None else np.random.default_rng()
+    names = list(SINGLE_QUBIT_GATES)
+    layers = coupler_layers(n_qubits)
+    two_qubit = fsim()
+    previous = [None] * n_qubits
+    gates = []
+    for cycle in range(cycles):
+        for q in range(n_qubits):
+            name = rng.choice([n for n in names if n != previous[q]])
+            previous[q] = name
+            gates.append(Gate(name, (q,), SINGLE_QUBIT_GATES[name]))
+        for pair in layers[PATTERN[cycle % len(PATTERN)]]:
+            gates.append(Gate("fsim", pair, two_qubit))
+    return gates
+
+
+def linear_xeb(probabilities, samples, n_qubits):
+    """Linear XEB fidelity of the samples under the ideal probabilities."""
+    return float((1 << n_qubits) * np.mean(probabilities[samples]) - 1)
+
+
+def noisy_samples(state, shots, fidelity, rng=None):
+    """Samples of a depolarized device: ideal with probability F, else uniform."""
+    rng = rng if rng is not None else np.random.default_rng()
+    samples = sample(state, shots, rng)
+    uniform = rng.random(shots) >= fidelity
+    samples[uniform] = rng.integers(0, len(state), size=int(uniform.sum()))
+    return samples
+
+
+def expected_fidelity(gates, n_qubits, errors=WILLOW_ERRORS):
+    """Digital error model: product of all gate and readout fidelities."""
+    singles = sum(len(g.qubits) == 1 for g in gates)
+    twos = len(gates) - singles
+    return ((1 - errors["single"]) ** singles * (1 - errors["two"]) ** twos
+            * (1 - errors["readout"]) ** n_qubits)
+
+
+def benchmark(n_qubits, cycles, shots=10000, rng=None):
+    """Simulate one random circuit and measure time, memory and XEB."""
+    rng = rng if rng is not None else np.random.default_rng()
+    gates = random_circuit(n_qubits, cycles, rng)
+    tracemalloc.start()
+    start = time.perf_counter()
+    state = run(gates, n_qubits)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    fidelity = expected_fidelity(gates, n_qubits)
+    probabilities = np.abs(state) ** 2
+    return {
+        "qubits": n_qubits,
+        "cycles": cycles,
+        "gates": len(gates),
+        "seconds": seconds,
+        "peak_bytes": peak,
+        "state_bytes": state.nbytes,
+        "xeb_ideal": linear_xeb(probabilities, sample(state, shots, rng), n_qubits),
+        "expected_fidelity": fidelity,
+        "xeb_noisy": linear_xeb(
+            probabilities, noisy_samples(state, shots, fidelity, rng), n_qubits),
+    }
+
+
+def scaling(qubit_counts, cycles, shots=10000, rng=None, memory=None):
+    """benchmark() for every qubit count that fits into memory."""
+    limit = max_qubits(memory)
+    return [benchmark(n, cycles, shots, rng) for n in qubit_counts if n <= limit]
+
+
+def _scaling_params(qubit_counts, cycles, shots, seed):
+    return {"qubits": list(qubit_counts), "cycles": cycles, "shots": shots, "seed": seed}
+
+
+def stored_scaling(qubit_counts, cycles, shots=10000, seed=0):
+    """scaling() as stored in .benchmarks/rcs.jsonl, measured on first use."""
+    return stored("rcs", _scaling_params(qubit_counts, cycles, shots, seed),
+                  lambda: scaling(qubit_counts, cycles, shots, np.random.default_rng(seed)))
+
+
+def extrapolate(records, n_qubits=WILLOW_QUBITS):
+    """
+    Fit log2(time) and log2(memory) linearly over the qubit count (using the
+    larger half of the records, where fixed overheads no longer dominate) and
+    project both to n_qubits.
+    """
+    records = sorted(records, key=lambda r: r["qubits"])[len(records) // 2:]
+    qubits = np.array([r["qubits"] for r in records], dtype=float)
+    time_slope, time_offset = np.polyfit(qubits, np.log2([r["seconds"] for r in records]), 1)
+    memory_slope, memory_offset = np.polyfit(
+        qubits, np.log2([r["peak_bytes"] for r in records]), 1)
+    seconds = float(2.0 ** (time_slope * n_qubits + time_offset))
+    return {
+        "qubits": n_qubits,
+        "time_factor_per_qubit": float(2.0 ** time_slope),
+        "memory_factor_per_qubit": float(2.0 ** memory_slope),
+        "seconds": seconds,
+        "years": seconds / SECONDS_PER_YEAR,
+        "bytes": float(2.0 ** (memory_slope * n_qubits + memory_offset)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Random circuit sampling benchmark")
+    parser.add_argument("--qubits", type=int, nargs="+", default=list(range(4, 21, 2)))
+    parser.add_argument("--cycles", type=int, default=12)
+    parser.add_argument("--shots", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", action="store_true", help="store the sweep for the scenes")
+    args = parser.parse_args(argv)
+
+    records = scaling(args.qubits, args.cycles, args.shots, np.random.default_rng(args.seed))
+    if args.save:
+        save_stored("rcs", _scaling_params(args.qubits, args.cycles, args.shots, args.seed), records)
+    for r in records:
+        print(f"n={r['qubits']:<3} {r['gates']:>5} gates {r['seconds']:>9.4f}s "
+              f"{r['peak_bytes'] / 2**20:>9.1f} MiB  XEB ideal {r['xeb_ideal']:.3f}  "
+              f"noisy {r['xeb_noisy']:.3f} (expected {r['expected_fidelity']:.3f})")
+    projection = extrapolate(records)
+    print(f"x{projection['time_factor_per_qubit']:.2f} time and "
+          f"x{projection['memory_factor_per_qubit']:.2f} memory per qubit; "
+          f"{projection['qubits']} qubits: {projection['years']:.2e} years, "
+          f"{projection['bytes']:.2e} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Dry-run render planner for the scenes in presentation.py.
+
+Runs the timeline of each scene with animations skipped (nothing is
+rasterized or written) and reports per scene the total duration, number of
+partial movie files, frames at the target frame rate, frames driven by
+updaters and an estimated render time:
+
+    python render_plan.py --fps 60
+    python render_plan.py MazeComparison TSPComparison --profiles profiles
+
+The render time estimate is a linear model (per rendered frame, per rendered
+frame and mobject, per frozen frame, per play) fitted to the profiles written
+by profiling.py. Without profiles rough default coefficients are used.
+Scenes with suspiciously many or very short plays are flagged, since each
+play becomes its own partial movie file.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from benchmarks import REPO_DIR, deck_scenes
+
+# Seconds per rendered frame, per rendered frame and mobject, per frozen
+# frame and per play when no profiles are available.
+DEFAULT_COEFFICIENTS = [0.02, 2e-5, 0.002, 0.15]
+MIN_PROFILE_RECORDS = 8
+MAX_PLAYS = 200
+SHORT_PLAY = 0.2
+MAX_SHORT_PLAYS = 50
+
+
+def _has_updaters(scene):
+    return bool(scene.updaters) or any(
+        mob.has_time_based_updater() for mob in scene.get_mobject_family_members())
+
+
+def _features(entry):
+    rendered = entry["frames"] - entry["static_frames"]
+    return [rendered, rendered * entry["family_size"], entry["static_frames"], 1.0]
+
+
+def fit_coefficients(profile_dir):
+    """
+    Fit the cost model to profiler output. Returns (coefficients, number of
+    records used); falls back to DEFAULT_COEFFICIENTS.
+    """
+    rows, costs = [], []
+    for path in glob.glob(os.path.join(profile_dir or "", "*.json")):
+        with open(path) as f:
+            try:
+                plays = json.load(f)["plays"]
+            except (ValueError, KeyError):
+                continue
+        for record in plays:
+            if record.get("cached") or not record.get("frames"):
+                continue
+            static = record["kind"] == "wait" and not record["updater_calls"]
+            rows.append(_features({
+                "frames": record["frames"],
+                "static_frames": record["frames"] if static else 0,
+                "family_size": record["family_size"],
+            }))
+            costs.append(record["wall_time"])
+    if len(rows) < MIN_PROFILE_RECORDS:
+        return list(DEFAULT_COEFFICIENTS), 0
+    solution, *_ = np.linalg.lstsq(np.array(rows, float), np.array(costs), rcond=None)
+    return [max(float(c), 0.0) for c in solution], len(rows)
+
+
+def plan_scene(scene_name, fps, params=None):
+    """Run one scene without rendering and return its list of play entries."""
+    from manim import tempconfig
+
+    import presentation
+
+    base = getattr(presentation, scene_name)
+    entries = []
+
+    def play(scene, *args, **kwargs):
+        updaters_before = _has_updaters(scene)
+        base.play(scene, *args, **kwargs)
+        run_time = float(scene.duration or 0.0)
+        frames = math.ceil(run_time * fps - 1e-9)
+        entries.append({
+            "run_time": run_time,
+            "frames": frames,
+            "static_frames": frames if scene.is_current_animation_frozen_frame() else 0,
+            "updater_frames": frames if updaters_before or _has_updaters(scene) else 0,
+            "family_size": len(scene.get_mobject_family_members()),
+        })
+
+    planned = type(scene_name, (base,), dict(params or {}, play=play))
+    with tempconfig({"dry_run": True, "disable_caching": True, "frame_rate": fps,
+                     "progress_bar": "none", "verbosity": "ERROR"}):
+        scene = planned(skip_animations=True)
+        scene.setup()
+        scene.construct()
+    return entries
+
+
+def summarize(scene_name, entries, coefficients):
+    estimate = sum(float(np.dot(coefficients, _features(e))) for e in entries)
+    short_plays = sum(e["run_time"] < SHORT_PLAY for e in entries)
+    warnings = []
+    if len(entries) > MAX_PLAYS:
+        warnings.append(f"{len(entries)} plays / partial movie files")
+    if short_plays > MAX_SHORT_PLAYS:
+        warnings.append(f"{short_plays} plays shorter than {SHORT_PLAY}s")
+    return {
+        "scene": scene_name,
+        "duration": sum(e["run_time"] for e in entries),
+        "partial_movie_files": len(entries),
+        "frames": sum(e["frames"] for e in entries),
+        "updater_frames": sum(e["updater_frames"] for e in entries),
+        "static_frames": sum(e["static_frames"] for e in entries),
+        "estimated_render_time": estimate,
+        "warnings": warnings,
+    }
+
+
+def format_summary(summary):
+    if "error" in summary:
+        return f"{summary['scene']:<32} ERROR {summary['error']}"
+    line = (f"{summary['scene']:<32} {summary['duration']:>8.1f}s "
+            f"{summary['partial_movie_files']:>6} {summary['frames']:>8} "
+            f"{summary['updater_frames']:>8} {summary['estimated_render_time']:>10.0f}s")
+    if summary["warnings"]:
+        line += "  ! " + "; ".join(summary["warnings"])
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help="scenes to plan (default: all)")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--profiles", default=os.environ.get("PRESENTATION_PROFILE"),
+                        help="directory with profiling.py output for calibration")
+    parser.add_argument("--json", help="also write the plan to this file")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_DIR)
+    coefficients, calibration_records = fit_coefficients(args.profiles)
+    if calibration_records:
+        print(f"Cost model fitted to {calibration_records} profiled plays")
+    else:
+        print("No profiles found, using default cost model")
+    print(f"{'scene':<32} {'duration':>9} {'movies':>6} {'frames':>8} "
+          f"{'updater':>8} {'estimate':>11}")
+
+    summaries = []
+    for scene_name in args.scenes or deck_scenes():
+        try:
+            entries = plan_scene(scene_name, args.fps)
+            summary = summarize(scene_name, entries, coefficients)
+        except Exception as e:
+            summary = {"scene": scene_name, "error": f"{type(e).__name__}: {e}"}
+        summaries.append(summary)
+        print(format_summary(summary), flush=True)
+
+    planned = [s for s in summaries if "error" not in s]
+    print(f"{'total':<32} {sum(s['duration'] for s in planned):>8.1f}s "
+          f"{sum(s['partial_movie_files'] for s in planned):>6} "
+          f"{sum(s['frames'] for s in planned):>8} "
+          f"{sum(s['updater_frames'] for s in planned):>8} "
+          f"{sum(s['estimated_render_time'] for s in planned):>10.0f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"fps": args.fps, "coefficients": coefficients,
+                       "scenes": summaries}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
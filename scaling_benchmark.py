@@ -0,0 +1,166 @@
+"""
+How statevector simulation scales with the number of qubits on this machine.
+
+For n = 1, 2, ... the harness measures (best of ``repeats``)
+  * allocation:    2^n amplitudes, written once,
+  * Hadamard layer: H on every qubit,
+  * CNOT ladder:    CNOT(q, q + 1) for q = 0 .. n - 2,
+together with the tracemalloc peak, and stops at the memory limit or once a
+single step takes longer than ``budget`` seconds. ``run`` stores the sweep
+in .benchmarks/scaling.jsonl with host name and git commit; ZahlenDarstellung
+never measures, it shows the latest stored sweep (local, or the tracked one
+in measurements/) through table_rows():
+
+    python scaling_benchmark.py run --budget 5
+    python scaling_benchmark.py show
+    python benchmarks.py ship scaling
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks import latest_stored, save_stored
+from rcs import extrapolate
+from statevector import CNOT, DEFAULT_DTYPE, H, apply_matrix, max_qubits
+
+STEPS = ["allocation", "hadamard", "cnot"]
+
+
+def _allocate(n_qubits, dtype):
+    """|0...0> with every page written: np.zeros only maps the pages lazily."""
+    state = np.empty(1 << n_qubits, dtype=dtype)
+    state[:] = 0
+    state[0] = 1
+    return state
+
+
+def _timed(function, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure(n_qubits, repeats=3, dtype=DEFAULT_DTYPE):
+    """Times (seconds) of the three steps and the peak traced memory for n qubits."""
+    tracemalloc.start()
+    allocation, state = _timed(lambda: _allocate(n_qubits, dtype), repeats)
+
+    def hadamard_layer():
+        for q in range(n_qubits):
+            apply_matrix(state, n_qubits, [q], H)
+
+    def cnot_ladder():
+        for q in range(n_qubits - 1):
+            apply_matrix(state, n_qubits, [q, q + 1], CNOT)
+
+    hadamard, _ = _timed(hadamard_layer, repeats)
+    cnot, _ = _timed(cnot_ladder, repeats)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "qubits": n_qubits,
+        "allocation": allocation,
+        "hadamard": hadamard,
+        "cnot": cnot,
+        # Key names shared with rcs.extrapolate().
+        "seconds": hadamard + cnot,
+        "peak_bytes": peak,
+        "state_bytes": state.nbytes,
+    }
+
+
+def sweep(first=1, last=None, repeats=3, budget=5.0, memory=None):
+    """measure() for n = first.. until the memory limit, ``last`` or the time budget."""
+    # apply_matrix needs a chunk of temporary memory next to the state.
+    limit = max_qubits(memory, fraction=0.4)
+    last = limit if last is None else min(last, limit)
+    records = []
+    for n in range(first, last + 1):
+        record = measure(n, repeats)
+        records.append(record)
+        if max(record[step] for step in STEPS) > budget:
+            break
+    return records
+
+
+def save(records, params, path=None):
+    """Store a sweep measured with ``params`` (see main) as one entry."""
+    save_stored("scaling", params, records, path)
+
+
+def load(path=None):
+    """Records of the latest stored sweep, or [] if there is none."""
+    stored_run = latest_stored("scaling", path)
+    return stored_run[1] if stored_run is not None else []
+
+
+def format_bytes(value):
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB"]:
+        if value < 1024 or unit == "EiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def format_seconds(value):
+    if value < 1e-3:
+        return f"{value * 1e6:.0f} µs"
+    if value < 1:
+        return f"{value * 1e3:.1f} ms"
+    if value < 3600:
+        return f"{value:.1f} s"
+    if value < 86400 * 365.25:
+        return f"{value / 3600:.1f} h"
+    return f"{value / (86400 * 365.25):.1e} Jahre"
+
+
+def table_rows(records, qubits=None, project=()):
+    """
+    Rows (n, memory, allocation, hadamard, cnot) as strings for the chosen
+    qubit counts (default: all), followed by projections for ``project``.
+    """
+    chosen = [r for r in records if qubits is None or r["qubits"] in qubits]
+    rows = [[str(r["qubits"]), format_bytes(r["state_bytes"])]
+            + [format_seconds(r[step]) for step in STEPS] for r in chosen]
+    for n in project:
+        projection = extrapolate(records, n)
+        # The H layer and CNOT ladder make up ``seconds``; split it like the last record.
+        share = records[-1]["hadamard"] / records[-1]["seconds"]
+        itemsize = records[-1]["state_bytes"] / 2 ** records[-1]["qubits"]
+        rows.append([f"{n}*", format_bytes(2.0 ** n * itemsize),
+                     "-", format_seconds(share * projection["seconds"]),
+                     format_seconds((1 - share) * projection["seconds"])])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Statevector scaling benchmark")
+    parser.add_argument("command", choices=["run", "show"])
+    parser.add_argument("--first", type=int, default=1)
+    parser.add_argument("--last", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="stop once a single step takes longer (seconds)")
+    parser.add_argument("--output", default=None, help="default: .benchmarks/scaling.jsonl")
+    parser.add_argument("--project", type=int, nargs="*", default=[40, 50])
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        records = sweep(args.first, args.last, args.repeats, args.budget)
+        save(records, {"first": args.first, "last": args.last, "repeats": args.repeats,
+                       "budget": args.budget}, args.output)
+    else:
+        records = load(args.output)
+        if not records:
+            parser.error("no stored sweep; measure it with `python scaling_benchmark.py run`")
+    print(f"{'n':>4} {'state':>10} {'alloc':>10} {'H layer':>10} {'CNOT ladder':>12}")
+    for row in table_rows(records, project=args.project):
+        print(f"{row[0]:>4} {row[1]:>10} {row[2]:>10} {row[3]:>10} {row[4]:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Bit-packed stabilizer (Clifford) simulator after Aaronson and Gottesman (CHP).
+
+An n-qubit stabilizer state is stored as a tableau of 2n Pauli operators:
+rows 0..n-1 are the destabilizers, rows n..2n-1 the stabilizer generators.
+Row i is (-1)^signs[i] * i^(x.z) X^x Z^z, and x and z are packed into
+ceil(n / 64) uint64 words, so one gate is a handful of numpy operations over
+all 2n rows and the memory is O(n^2) bits instead of 2^n amplitudes.
+
+Single-qubit gates (h, s, x, y, z) take any number of qubits at once;
+cnot and cz take arrays of disjoint pairs (one layer). Products of rows
+use the sign rule of the X^x Z^z form,
+
+    (X^a Z^b)(X^c Z^d) = (-1)^(b.c) X^(a+c) Z^(b+d),
+
+so collapsing a measurement updates all affected rows in one step:
+
+    state = StabilizerState.ghz(4096)
+    outcomes = state.measure_all(rng)      # all equal
+
+    python stabilizer.py --qubits 4096 --state ghz
+"""
+import argparse
+import time
+
+import numpy as np
+
+WORD_BITS = 64
+# CNOT layers with more pairs than this use whole-word shifts instead of single columns.
+WIDE_LAYER = 32
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1)
+
+
+def _shift(words, offset):
+    """Shift the bit string of every row by ``offset`` qubits (towards higher qubits if > 0)."""
+    shifted = np.zeros_like(words)
+    count = words.shape[1]
+    whole, bits = divmod(abs(offset), WORD_BITS)
+    if whole >= count:
+        return shifted
+    if offset >= 0:
+        shifted[:, whole:] = words[:, :count - whole] << np.uint64(bits)
+        if bits:
+            shifted[:, whole + 1:] |= words[:, :count - whole - 1] >> np.uint64(WORD_BITS - bits)
+    else:
+        shifted[:, :count - whole] = words[:, whole:] >> np.uint64(bits)
+        if bits:
+            shifted[:, :count - whole - 1] |= words[:, whole + 1:] << np.uint64(WORD_BITS - bits)
+    return shifted
+
+
+def _weight(words):
+    """Number of set bits per row (last axis summed)."""
+    return _popcount(words).sum(axis=-1, dtype=np.int64)
+
+
+class StabilizerState:
+    """|0...0> on ``n_qubits`` qubits."""
+
+    def __init__(self, n_qubits):
+        self.n_qubits = n_qubits
+        self.words = (n_qubits + WORD_BITS - 1) // WORD_BITS
+        rows = np.arange(n_qubits)
+        self.x_bits = np.zeros((2 * n_qubits, self.words), dtype=np.uint64)
+        self.z_bits = np.zeros((2 * n_qubits, self.words), dtype=np.uint64)
+        self.signs = np.zeros(2 * n_qubits, dtype=np.uint8)
+        # Destabilizer i = X_i, stabilizer i = Z_i.
+        self.x_bits[rows, rows // WORD_BITS] = np.uint64(1) << (rows % WORD_BITS).astype(np.uint64)
+        self.z_bits[rows + n_qubits, rows // WORD_BITS] = self.x_bits[rows, rows // WORD_BITS]
+
+    def copy(self):
+        other = object.__new__(StabilizerState)
+        other.n_qubits, other.words = self.n_qubits, self.words
+        other.x_bits, other.z_bits = self.x_bits.copy(), self.z_bits.copy()
+        other.signs = self.signs.copy()
+        return other
+
+    @property
+    def nbytes(self):
+        return self.x_bits.nbytes + self.z_bits.nbytes + self.signs.nbytes
+
+    def _mask(self, qubits):
+        qubits = np.atleast_1d(np.asarray(qubits, dtype=np.int64))
+        mask = np.zeros(self.words, dtype=np.uint64)
+        np.bitwise_or.at(mask, qubits // WORD_BITS,
+                         np.uint64(1) << (qubits % WORD_BITS).astype(np.uint64))
+        return mask
+
+    def _columns(self, bits, qubits):
+        """Bits of the given qubits for every row, shape (2n, len(qubits))."""
+        qubits = np.asarray(qubits, dtype=np.int64)
+        shifts = (qubits % WORD_BITS).astype(np.uint64)
+        return ((bits[:, qubits // WORD_BITS] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+    def _scatter(self, bits, qubits, values):
+        """XOR per-row column ``values`` (2n, len(qubits)) into the given qubits."""
+        qubits = np.asarray(qubits, dtype=np.int64)
+        shifted = values.astype(np.uint64) << (qubits % WORD_BITS).astype(np.uint64)
+        for word in np.unique(qubits // WORD_BITS):
+            columns = qubits // WORD_BITS == word
+            bits[:, word] ^= np.bitwise_xor.reduce(shifted[:, columns], axis=1)
+
+    # Single-qubit Clifford gates on any set of qubits.
+
+    def h(self, qubits):
+        mask = self._mask(qubits)
+        self.signs ^= (_weight(self.x_bits & self.z_bits & mask) & 1).astype(np.uint8)
+        x, z = self.x_bits & mask, self.z_bits & mask
+        self.x_bits ^= x ^ z
+        self.z_bits ^= x ^ z
+        return self
+
+    def s(self, qubits):
+        mask = self._mask(qubits)
+        self.signs ^= (_weight(self.x_bits & self.z_bits & mask) & 1).astype(np.uint8)
+        self.z_bits ^= self.x_bits & mask
+        return self
+
+    def x(self, qubits):
+        self.signs ^= (_weight(self.z_bits & self._mask(qubits)) & 1).astype(np.uint8)
+        return self
+
+    def z(self, qubits):
+        self.signs ^= (_weight(self.x_bits & self._mask(qubits)) & 1).astype(np.uint8)
+        return self
+
+    def y(self, qubits):
+        mask = self._mask(qubits)
+        self.signs ^= (_weight((self.x_bits ^ self.z_bits) & mask) & 1).astype(np.uint8)
+        return self
+
+    # Two-qubit gates on a layer of disjoint pairs.
+
+    def cnot(self, controls, targets):
+        controls, targets = np.atleast_1d(controls), np.atleast_1d(targets)
+        if len(controls) > WIDE_LAYER:
+            # Pairs are disjoint, so groups with the same offset can go one after another.
+            offsets = targets - controls
+            for offset in np.unique(offsets):
+                self._cnot_shifted(controls[offsets == offset], int(offset))
+            return self
+        xc, zc = self._columns(self.x_bits, controls), self._columns(self.z_bits, controls)
+        xt, zt = self._columns(self.x_bits, targets), self._columns(self.z_bits, targets)
+        self.signs ^= np.bitwise_xor.reduce(xc & zt & (xt ^ zc ^ 1), axis=1)
+        self._scatter(self.x_bits, targets, xc)
+        self._scatter(self.z_bits, controls, zt)
+        return self
+
+    def _cnot_shifted(self, controls, offset):
+        """CNOTs from ``controls`` to ``controls + offset`` with packed bit shifts."""
+        mask = self._mask(controls)
+        xc, zc = self.x_bits & mask, self.z_bits & mask
+        # Target bits moved onto the positions of their controls.
+        xt, zt = _shift(self.x_bits, -offset) & mask, _shift(self.z_bits, -offset) & mask
+        self.signs ^= (_weight(xc & zt & ~(xt ^ zc)) & 1).astype(np.uint8)
+        self.x_bits ^= _shift(xc, offset)
+        self.z_bits ^= zt
+        return self
+
+    def cz(self, first, second):
+        self.h(second)
+        self.cnot(first, second)
+        return self.h(second)
+
+    # Measurement.
+
+    def _multiply_into(self, rows, source):
+        """Row ``source`` times each of ``rows`` (all commuting with it), in place."""
+        x_s, z_s = self.x_bits[source], self.z_bits[source]
+        x_r, z_r = self.x_bits[rows], self.z_bits[rows]
+        new_x, new_z = x_r ^ x_s, z_r ^ z_s
+        exponent = (2 * self.signs[rows].astype(np.int64) + 2 * int(self.signs[source])
+                    + _weight(x_r & z_r) + int(_weight(x_s & z_s)) + 2 * _weight(z_s & x_r)
+                    - _weight(new_x & new_z))
+        self.x_bits[rows], self.z_bits[rows] = new_x, new_z
+        self.signs[rows] = ((exponent % 4) // 2).astype(np.uint8)
+
+    def _product_sign(self, rows):
+        """Sign bit of the product of commuting ``rows`` that multiply to a Z-type Pauli."""
+        x, z = self.x_bits[rows], self.z_bits[rows]
+        before = np.bitwise_xor.accumulate(z, axis=0)
+        before = np.vstack([np.zeros((1, self.words), dtype=np.uint64), before[:-1]])
+        product_x, product_z = np.bitwise_xor.reduce(x, axis=0), np.bitwise_xor.reduce(z, axis=0)
+        exponent = (2 * int(self.signs[rows].sum()) + int(_weight(x & z).sum())
+                    + 2 * int(_weight(before & x).sum()) - int(_weight(product_x & product_z)))
+        return (exponent % 4) // 2
+
+    def is_deterministic(self, qubit):
+        return not self._columns(self.x_bits[self.n_qubits:], [qubit]).any()
+
+    def measure(self, qubit, rng=None):
+        """Measure ``qubit`` in the Z basis, collapse the state and return 0 or 1."""
+        n = self.n_qubits
+        column = self._columns(self.x_bits, [qubit])[:, 0]
+        anticommuting = np.flatnonzero(column[n:])
+        if len(anticommuting) == 0:
+            # Z_qubit is a product of the stabilizers paired with the destabilizers
+            # that anticommute with it.
+            return self._product_sign(n + np.flatnonzero(column[:n]))
+        rng = rng if rng is not None else np.random.default_rng()
+        p = n + anticommuting[0]
+        rows = np.flatnonzero(column)
+        rows = rows[(rows != p) & (rows != p - n)]
+        if len(rows):
+            self._multiply_into(rows, p)
+        self.x_bits[p - n], self.z_bits[p - n], self.signs[p - n] = \
+            self.x_bits[p], self.z_bits[p], self.signs[p]
+        outcome = int(rng.integers(2))
+        self.x_bits[p] = 0
+        self.z_bits[p] = self._mask([qubit])
+        self.signs[p] = outcome
+        return outcome
+
+    def measure_all(self, rng=None, qubits=None):
+        qubits = range(self.n_qubits) if qubits is None else qubits
+        return np.array([self.measure(q, rng) for q in qubits], dtype=np.uint8)
+
+    def stabilizers(self):
+        """Stabilizer generators as strings like '+XZI' (qubit 0 first)."""
+        x = self._columns(self.x_bits[self.n_qubits:], np.arange(self.n_qubits))
+        z = self._columns(self.z_bits[self.n_qubits:], np.arange(self.n_qubits))
+        letters = np.array(["I", "X", "Z", "Y"])[x + 2 * z]
+        return [("-" if sign else "+") + "".join(row)
+                for sign, row in zip(self.signs[self.n_qubits:], letters)]
+
+    @classmethod
+    def ghz(cls, n_qubits):
+        """(|0...0> + |1...1>) / sqrt(2) with CNOT layers that double the entangled block."""
+        state = cls(n_qubits).h([0])
+        block = 1
+        while block < n_qubits:
+            controls = np.arange(min(block, n_qubits - block))
+            state.cnot(controls, controls + block)
+            block *= 2
+        return state
+
+    @classmethod
+    def cluster(cls, rows, columns):
+        """2D cluster state: H on every qubit, CZ between grid neighbours (four layers)."""
+        state = cls(rows * columns).h(np.arange(rows * columns))
+        grid = np.arange(rows * columns).reshape(rows, columns)
+        for parity in (0, 1):
+            left = grid[:, parity:-1:2].ravel()
+            state.cz(left, left + 1)
+            top = grid[parity:-1:2, :].ravel()
+            state.cz(top, top + columns)
+        return state
+
+
+def validate(n_qubits=6, depth=30, rng=None):
+    """
+    Random Clifford circuit with mid-circuit measurements, checked against
+    the statevector: every generator must stabilize the state and every
+    outcome must have the probability the tableau claims (1 or 1/2).
+    Returns the largest deviation.
+    """
+    from statevector import CNOT, CZ, H, X, Y, Z, apply_matrix
+
+    rng = rng if rng is not None else np.random.default_rng()
+    paulis = {"I": np.eye(2), "X": X, "Y": Y, "Z": Z}
+    single = {"h": H, "s": np.diag([1, 1j]), "x": X, "y": Y, "z": Z}
+    state = StabilizerState(n_qubits)
+    vector = np.zeros(1 << n_qubits, dtype=np.complex128)
+    vector[0] = 1
+    error = 0.0
+    for _ in range(depth):
+        kind = rng.choice(["h", "s", "x", "y", "z", "cnot", "cz", "measure"])
+        a, b = (int(q) for q in rng.choice(n_qubits, 2, replace=False))
+        if kind in single:
+            getattr(state, kind)([a])
+            apply_matrix(vector, n_qubits, [a], single[kind])
+        elif kind in ("cnot", "cz"):
+            getattr(state, kind)([a], [b])
+            apply_matrix(vector, n_qubits, [a, b], CNOT if kind == "cnot" else CZ)
+        else:
+            deterministic = state.is_deterministic(a)
+            outcome = state.measure(a, rng)
+            selected = ((np.arange(1 << n_qubits) >> a) & 1) == outcome
+            probability = np.sum(np.abs(vector[selected]) ** 2)
+            error = max(error, abs(probability - (1.0 if deterministic else 0.5)))
+            vector[~selected] = 0
+            vector /= np.linalg.norm(vector)
+    for generator in state.stabilizers():
+        image = vector.copy()
+        for q, letter in enumerate(generator[1:]):
+            apply_matrix(image, n_qubits, [q], paulis[letter])
+        sign = -1 if generator[0] == "-" else 1
+        error = max(error, abs(sign * np.vdot(vector, image) - 1))
+    return error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stabilizer states on many qubits")
+    parser.add_argument("--qubits", type=int, default=4096)
+    parser.add_argument("--state", choices=["ghz", "cluster"], default="ghz")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true",
+                        help="compare random Clifford circuits with the statevector")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    if args.validate:
+        print(f"max deviation vs. statevector: {max(validate(rng=rng) for _ in range(20)):.2e}")
+    start = time.perf_counter()
+    if args.state == "ghz":
+        state = StabilizerState.ghz(args.qubits)
+    else:
+        side = int(np.sqrt(args.qubits))
+        state = StabilizerState.cluster(side, side)
+    prepared = time.perf_counter() - start
+    start = time.perf_counter()
+    outcomes = state.measure_all(rng)
+    measured = time.perf_counter() - start
+    print(f"{args.state} on {state.n_qubits} qubits: prepared in {1e3 * prepared:.1f} ms, "
+          f"all qubits measured in {1e3 * measured:.1f} ms, tableau {state.nbytes / 2 ** 20:.1f} MiB")
+    print(f"outcomes: {int(outcomes.sum())} ones, {state.n_qubits - int(outcomes.sum())} zeros")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Small statevector simulator shared by the simulation modules of the deck.
+
+Qubit q is bit q of the basis state index (little endian). Gate matrices act
+on their qubits in the given order with the first qubit as the most
+significant bit, so CNOT(control, target) is the textbook 4x4 matrix.
+
+apply_matrix() works on chunks of the state, so besides the state itself it
+never needs more than ``chunk`` amplitudes of temporary memory. This keeps
+the memory limit at one state vector instead of two or three.
+"""
+import collections
+import os
+
+import numpy as np
+
+DEFAULT_DTYPE = np.complex64
+# Amplitudes per chunk of temporary memory in apply_matrix().
+DEFAULT_CHUNK = 1 << 20
+
+Gate = collections.namedtuple("Gate", ["name", "qubits", "matrix"])
+
+SQRT_HALF = np.sqrt(0.5)
+H = np.array([[1, 1], [1, -1]]) * SQRT_HALF
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Y = np.array([[0, -1j], [1j, 0]])
+Z = np.diag([1, -1]).astype(complex)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+CZ = np.diag([1, 1, 1, -1]).astype(complex)
+
+
+def zero_state(n_qubits, dtype=DEFAULT_DTYPE):
+    """|0...0> on n_qubits qubits."""
+    state = np.zeros(1 << n_qubits, dtype=dtype)
+    state[0] = 1
+    return state
+
+
+def available_memory():
+    """Currently available physical memory in bytes (None if unknown)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def max_qubits(memory=None, dtype=DEFAULT_DTYPE, fraction=0.5):
+    """Largest n whose state vector fits into ``fraction`` of the memory."""
+    memory = memory if memory is not None else available_memory()
+    if not memory:
+        return 24
+    return int(np.log2(memory * fraction / np.dtype(dtype).itemsize))
+
+
+def _chunk_views(state, n_qubits, qubits, chunk):
+    """
+    Views of the state as n axes (axis i is qubit n - 1 - i), split along the
+    highest non-target qubits so that every view has at most ``chunk`` amplitudes.
+    """
+    tensor = state.reshape((2,) * n_qubits)
+    free = [q for q in range(n_qubits - 1, -1, -1) if q not in qubits]
+    split = []
+    size = state.size
+    for q in free:
+        if size <= chunk:
+            break
+        split.append(q)
+        size //= 2
+    for values in range(1 << len(split)):
+        index = [slice(None)] * n_qubits
+        for bit, q in enumerate(split):
+            index[n_qubits - 1 - q] = (values >> bit) & 1
+        yield tensor[tuple(index)], [q for q in range(n_qubits - 1, -1, -1) if q not in split]
+
+
+def apply_matrix(state, n_qubits, qubits, matrix, chunk=DEFAULT_CHUNK):
+    """Apply a 2^k x 2^k matrix to the given k qubits in place."""
+    qubits = list(qubits)
+    k = len(qubits)
+    matrix = np.asarray(matrix, dtype=state.dtype)
+    for view, view_qubits in _chunk_views(state, n_qubits, qubits, chunk):
+        axes = [view_qubits.index(q) for q in qubits]
+        blocks = []
+        for basis in range(1 << k):
+            index = [slice(None)] * view.ndim
+            for position, axis in enumerate(axes):
+                index[axis] = (basis >> (k - 1 - position)) & 1
+            blocks.append(tuple(index))
+        old = np.stack([view[index] for index in blocks]).reshape(1 << k, -1)
+        new = matrix @ old
+        for row, index in enumerate(blocks):
+            view[index] = new[row].reshape(view[index].shape)
+    return state
+
+
+def apply_diagonal(state, n_qubits, qubits, diagonal, chunk=DEFAULT_CHUNK):
+    """Multiply by a diagonal gate (given as its 2^k diagonal) in place."""
+    qubits = list(qubits)
+    k = len(qubits)
+    diagonal = np.asarray(diagonal, dtype=state.dtype)
+    for start in range(0, state.size, chunk):
+        indices = np.arange(start, min(start + chunk, state.size))
+        basis = np.zeros(len(indices), dtype=np.intp)
+        for position, q in enumerate(qubits):
+            basis |= ((indices >> q) & 1) << (k - 1 - position)
+        state[start:start + len(indices)] *= diagonal[basis]
+    return state
+
+
+def run(gates, n_qubits, state=None, dtype=DEFAULT_DTYPE, chunk=DEFAULT_CHUNK):
+    """Apply a gate list to ``state`` (default |0...0>) and return it."""
+    if state is None:
+        state = zero_state(n_qubits, dtype)
+    for gate in gates:
+        apply_matrix(state, n_qubits, gate.qubits, gate.matrix, chunk)
+    return state
+
+
+def probabilities(state):
+    """Measurement probabilities in float64."""
+    return np.abs(state.astype(np.complex128, copy=False)) ** 2
+
+
+def sample(state, shots, rng=None):
+    """Sample basis state indices from the state."""
+    rng = rng if rng is not None else np.random.default_rng()
+    cdf = np.cumsum(probabilities(state))
+    samples = np.searchsorted(cdf, rng.random(shots) * cdf[-1], side="right")
+    return np.minimum(samples, len(cdf) - 1)
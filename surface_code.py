@@ -0,0 +1,474 @@
+"""
+Monte Carlo simulation of the rotated surface code.
+
+The simulator samples depolarizing data errors and syndrome measurement
+errors over several rounds and computes detection events with a bit-packed
+Pauli frame: every row of a frame is one qubit, every bit of a uint64 word is
+one shot, so a stabilizer measurement is the XOR of at most four rows and
+covers 64 shots per word operation.
+
+Decoding happens on a DecodingGraph whose nodes are detectors (stabilizer,
+round) plus one boundary node. MatchingDecoder is the exact minimum-weight
+perfect matching decoder, meant for small distances; the command line uses
+the union-find decoder from union_find_decoder.py by default. sweep() combines
+sampling and decoding into logical error rate curves for WillowErrorCorrection:
+
+    python surface_code.py --distances 3 5 7 --shots 20000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+# Depolarizing errors are drawn sparsely below this probability.
+SPARSE_PROBABILITY = 0.02
+DEFAULT_BATCH = 1 << 14
+
+
+# ----------------------------------------------------------------------
+# Bit packing
+# ----------------------------------------------------------------------
+def pack_shots(bits):
+    """Pack a bool array (..., shots) into uint64 words (..., ceil(shots / 64))."""
+    bits = np.asarray(bits, dtype=bool)
+    padding = (-bits.shape[-1]) % 64
+    if padding:
+        bits = np.pad(bits, [(0, 0)] * (bits.ndim - 1) + [(0, padding)])
+    return np.packbits(bits, axis=-1, bitorder="little").view(np.uint64)
+
+
+def unpack_shots(words, shots):
+    """Inverse of pack_shots."""
+    raw = np.ascontiguousarray(words).view(np.uint8)
+    return np.unpackbits(raw, axis=-1, count=shots, bitorder="little").astype(bool)
+
+
+# ----------------------------------------------------------------------
+# Code layout
+# ----------------------------------------------------------------------
+class RotatedSurfaceCode:
+    """
+    Distance-d rotated surface code with d*d data qubits on a grid.
+
+    Data qubit (row, col) has index row * d + col. Stabilizers sit on the
+    plaquettes between four data qubits; X-type weight-2 stabilizers run along
+    the top and bottom edge, Z-type ones along the left and right edge.
+    Stabilizers are stored as (m, 4) index arrays padded with ``n_data``,
+    which points at an always-zero row of the Pauli frame.
+
+    Errors are named after their Pauli type: "X" errors are detected by the
+    Z stabilizers and flip the logical Z operator (top row), "Z" errors are
+    detected by the X stabilizers and flip the logical X operator (left column).
+    """
+
+    def __init__(self, distance):
+        if distance < 3 or distance % 2 == 0:
+            raise ValueError("distance must be an odd number >= 3")
+        self.distance = d = distance
+        self.n_data = d * d
+        rows, cols = np.divmod(np.arange(self.n_data), d)
+        self.data_coordinates = np.stack([rows, cols], axis=1).astype(float)
+
+        plaquettes = {"X": [], "Z": []}
+        for r in range(-1, d):
+            for c in range(-1, d):
+                kind = "X" if (r + c) % 2 == 0 else "Z"
+                on_top_bottom = r in (-1, d - 1)
+                on_left_right = c in (-1, d - 1)
+                if on_top_bottom and on_left_right:
+                    continue
+                if on_top_bottom and kind != "X":
+                    continue
+                if on_left_right and kind != "Z":
+                    continue
+                qubits = [(r + dr) * d + (c + dc)
+                          for dr in (0, 1) for dc in (0, 1)
+                          if 0 <= r + dr < d and 0 <= c + dc < d]
+                plaquettes[kind].append((r + 0.5, c + 0.5, qubits))
+
+        self.stabilizers = {}
+        self.stabilizer_coordinates = {}
+        for kind, entries in plaquettes.items():
+            support = np.full((len(entries), 4), self.n_data, dtype=np.intp)
+            for i, (_, _, qubits) in enumerate(entries):
+                support[i, :len(qubits)] = qubits
+            self.stabilizers[kind] = support
+            self.stabilizer_coordinates[kind] = np.array([e[:2] for e in entries])
+
+        # Which stabilizers detect which error type, and which logical
+        # operator an error type flips.
+        self.detecting = {"X": "Z", "Z": "X"}
+        self.logical = {
+            "X": np.arange(d),                # logical Z: top row
+            "Z": np.arange(0, self.n_data, d),  # logical X: left column
+        }
+
+    def check_matrix(self, error_type):
+        """Dense (m, n_data) parity check matrix of the detecting stabilizers."""
+        support = self.stabilizers[self.detecting[error_type]]
+        matrix = np.zeros((len(support), self.n_data + 1), dtype=np.uint8)
+        np.put_along_axis(matrix, support, 1, axis=1)
+        return matrix[:, :-1]
+
+    def syndrome(self, frame, error_type):
+        """Packed syndrome (m, words) of a packed Pauli frame (n_data, words)."""
+        padded = np.concatenate([frame, np.zeros((1,) + frame.shape[1:], frame.dtype)])
+        support = self.stabilizers[self.detecting[error_type]]
+        result = padded[support[:, 0]].copy()
+        for column in range(1, support.shape[1]):
+            result ^= padded[support[:, column]]
+        return result
+
+    def observable(self, frame, error_type):
+        """Packed logical flips (words,) of a packed Pauli frame."""
+        return np.bitwise_xor.reduce(frame[self.logical[error_type]], axis=0)
+
+
+# ----------------------------------------------------------------------
+# Sampling
+# ----------------------------------------------------------------------
+def _bernoulli_positions(rng, total, probability):
+    if probability <= 0:
+        return np.empty(0, dtype=np.int64)
+    if probability < SPARSE_PROBABILITY:
+        count = rng.binomial(total, probability)
+        return np.sort(rng.choice(total, count, replace=False))
+    return np.flatnonzero(rng.random(total) < probability)
+
+
+def sample_depolarizing(rng, n_qubits, shots, probability):
+    """Packed X and Z parts of independent depolarizing errors."""
+    total = n_qubits * shots
+    positions = _bernoulli_positions(rng, total, probability)
+    kinds = rng.integers(0, 3, size=len(positions))  # 0: X, 1: Y, 2: Z
+    x_bits = np.zeros(total, dtype=bool)
+    z_bits = np.zeros(total, dtype=bool)
+    x_bits[positions[kinds != 2]] = True
+    z_bits[positions[kinds != 0]] = True
+    shape = (n_qubits, shots)
+    return pack_shots(x_bits.reshape(shape)), pack_shots(z_bits.reshape(shape))
+
+
+def sample_flips(rng, rows, shots, probability):
+    """Packed independent bit flips, e.g. syndrome measurement errors."""
+    bits = np.zeros(rows * shots, dtype=bool)
+    bits[_bernoulli_positions(rng, rows * shots, probability)] = True
+    return pack_shots(bits.reshape(rows, shots))
+
+
+class SampleBatch:
+    """
+    Detection events and logical flips of one batch of shots.
+
+    ``detectors[error_type]`` is a packed array (rounds + 1, m, words):
+    layer t compares the measurement of round t with round t - 1, the last
+    layer compares the final data readout with the last measurement round.
+    ``observables[error_type]`` is packed (words,).
+    """
+
+    def __init__(self, shots, detectors, observables):
+        self.shots = shots
+        self.detectors = detectors
+        self.observables = observables
+
+    def detection_events(self, error_type):
+        """Bool array (shots, detectors) in DecodingGraph node order."""
+        packed = self.detectors[error_type]
+        flat = packed.reshape(-1, packed.shape[-1])
+        return unpack_shots(flat, self.shots).T
+
+    def logical_flips(self, error_type):
+        return unpack_shots(self.observables[error_type], self.shots)
+
+
+def sample(code, shots, p, p_measure=0.0, rounds=1, rng=None):
+    """
+    Sample ``shots`` experiments of ``rounds`` noisy stabilizer measurement
+    rounds followed by a perfect data readout.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    frames = {t: np.zeros((code.n_data, (shots + 63) // 64), np.uint64) for t in "XZ"}
+    detectors = {t: [] for t in "XZ"}
+    previous = {t: 0 for t in "XZ"}
+    for _ in range(rounds):
+        x_errors, z_errors = sample_depolarizing(rng, code.n_data, shots, p)
+        frames["X"] ^= x_errors
+        frames["Z"] ^= z_errors
+        for error_type in "XZ":
+            measured = code.syndrome(frames[error_type], error_type)
+            if p_measure > 0:
+                measured ^= sample_flips(rng, len(measured), shots, p_measure)
+            detectors[error_type].append(measured ^ previous[error_type])
+            previous[error_type] = measured
+    for error_type in "XZ":
+        final = code.syndrome(frames[error_type], error_type)
+        detectors[error_type].append(final ^ previous[error_type])
+    return SampleBatch(
+        shots,
+        {t: np.stack(detectors[t]) for t in "XZ"},
+        {t: code.observable(frames[t], t) for t in "XZ"},
+    )
+
+
+def syndrome_throughput(distance, shots=1 << 20, p=1e-3, rounds=1, rng=None):
+    """Shots per second of sample() including syndrome extraction."""
+    code = RotatedSurfaceCode(distance)
+    rng = rng if rng is not None else np.random.default_rng()
+    start = time.perf_counter()
+    done = 0
+    while done < shots:
+        batch = min(DEFAULT_BATCH * 4, shots - done)
+        sample(code, batch, p, p_measure=p, rounds=rounds, rng=rng)
+        done += batch
+    return shots / (time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+def _weight(probability):
+    probability = min(max(probability, 1e-12), 0.5 - 1e-12)
+    return float(np.log((1 - probability) / probability))
+
+
+class DecodingGraph:
+    """
+    Detector graph of one error type. Node ``t * m + s`` is stabilizer s in
+    layer t, node ``n_detectors`` is the boundary. Every edge is one fault:
+    a data error in a round ("data", round, qubit) or a measurement error
+    ("measure", round, stabilizer). ``edge_observable`` marks faults that flip
+    the logical operator.
+    """
+
+    def __init__(self, code, error_type, rounds=1, p=1e-3, p_measure=0.0):
+        self.code = code
+        self.error_type = error_type
+        self.rounds = rounds
+        support = code.stabilizers[code.detecting[error_type]]
+        self.n_stabilizers = m = len(support)
+        self.n_detectors = (rounds + 1) * m
+        self.boundary = self.n_detectors
+
+        stabilizers_of = [[] for _ in range(code.n_data)]
+        for s, qubits in enumerate(support):
+            for q in qubits:
+                if q < code.n_data:
+                    stabilizers_of[q].append(s)
+        logical = set(code.logical[error_type].tolist())
+        # Depolarizing noise: each error type occurs with probability 2p/3.
+        data_weight = _weight(2 * p / 3)
+        measure_weight = _weight(p_measure) if p_measure > 0 else None
+
+        u, v, weights, observable, faults = [], [], [], [], []
+        for t in range(rounds):
+            for q, stabilizers in enumerate(stabilizers_of):
+                nodes = [t * m + s for s in stabilizers] + [self.boundary]
+                u.append(nodes[0])
+                v.append(nodes[1])
+                weights.append(data_weight)
+                observable.append(q in logical)
+                faults.append(("data", t, q))
+            if measure_weight is not None:
+                for s in range(m):
+                    u.append(t * m + s)
+                    v.append((t + 1) * m + s)
+                    weights.append(measure_weight)
+                    observable.append(False)
+                    faults.append(("measure", t, s))
+        self.edge_u = np.array(u, dtype=np.intp)
+        self.edge_v = np.array(v, dtype=np.intp)
+        self.edge_weight = np.array(weights)
+        self.edge_observable = np.array(observable, dtype=bool)
+        self.edge_faults = faults
+
+    def adjacency(self):
+        """Symmetric scipy.sparse weight matrix over all nodes."""
+        from scipy.sparse import coo_matrix
+
+        size = self.n_detectors + 1
+        matrix = coo_matrix(
+            (np.concatenate([self.edge_weight, self.edge_weight]),
+             (np.concatenate([self.edge_u, self.edge_v]),
+              np.concatenate([self.edge_v, self.edge_u]))),
+            shape=(size, size))
+        # Parallel edges (two boundary qubits of one stabilizer) must not add up.
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        matrix.data = np.minimum(matrix.data, self.edge_weight.max())
+        return matrix
+
+
+class MatchingDecoder:
+    """
+    Exact minimum-weight perfect matching decoder (networkx blossom).
+
+    All-pairs shortest paths and their logical parity are precomputed, so a
+    shot costs one matching on its active detectors. Fine for validation and
+    small distances; use the union-find decoder for large sweeps.
+    """
+
+    def __init__(self, graph):
+        from scipy.sparse.csgraph import dijkstra
+
+        self.graph = graph
+        distances, predecessors = dijkstra(graph.adjacency(), return_predecessors=True)
+        self.distances = distances
+        edge_parity = {}
+        for a, b, flip in zip(graph.edge_u, graph.edge_v, graph.edge_observable):
+            # Among parallel edges the cheaper one wins; all have equal weight
+            # here, so keep the first.
+            edge_parity.setdefault((a, b), flip)
+            edge_parity.setdefault((b, a), flip)
+        size = len(distances)
+        self.parity = np.zeros((size, size), dtype=bool)
+        for source in range(size):
+            order = np.argsort(distances[source])
+            for node in order[1:]:
+                previous = predecessors[source, node]
+                if previous < 0:
+                    continue
+                self.parity[source, node] = (
+                    self.parity[source, previous] ^ edge_parity[(previous, node)])
+        self._cache = {}
+
+    def decode_one(self, events):
+        """Predicted logical flip for one shot (bool array over detectors)."""
+        import networkx as nx
+
+        active = np.flatnonzero(events)
+        if len(active) == 0:
+            return False
+        key = active.tobytes()
+        if key in self._cache:
+            return self._cache[key]
+        boundary = self.graph.boundary
+        matching_graph = nx.Graph()
+        for i, a in enumerate(active):
+            matching_graph.add_edge(("d", a), ("b", a), weight=-self.distances[a, boundary])
+            for b in active[i + 1:]:
+                matching_graph.add_edge(("d", a), ("d", b), weight=-self.distances[a, b])
+                matching_graph.add_edge(("b", a), ("b", b), weight=0.0)
+        flip = False
+        for left, right in nx.max_weight_matching(matching_graph, maxcardinality=True):
+            if left[0] == "b" and right[0] == "b":
+                continue
+            if left[0] == "b":
+                left, right = right, left
+            target = boundary if right[0] == "b" else right[1]
+            flip ^= bool(self.parity[left[1], target])
+        self._cache[key] = flip
+        return flip
+
+    def decode(self, events):
+        """Predicted logical flips (shots,) for detection events (shots, detectors)."""
+        return np.array([self.decode_one(row) for row in events], dtype=bool)
+
+
+# ----------------------------------------------------------------------
+# Sweeps
+# ----------------------------------------------------------------------
+def logical_error_rate(distance, p, shots, p_measure=0.0, rounds=1,
+                       decoder_class=MatchingDecoder, rng=None, batch=DEFAULT_BATCH):
+    """Fraction of shots where either the X or the Z sector is decoded wrongly."""
+    code = RotatedSurfaceCode(distance)
+    rng = rng if rng is not None else np.random.default_rng()
+    decoders = {
+        t: decoder_class(DecodingGraph(code, t, rounds, p, p_measure)) for t in "XZ"
+    }
+    failures = 0
+    sample_time = decode_time = 0.0
+    done = 0
+    while done < shots:
+        size = min(batch, shots - done)
+        start = time.perf_counter()
+        result = sample(code, size, p, p_measure, rounds, rng)
+        sample_time += time.perf_counter() - start
+        start = time.perf_counter()
+        failed = np.zeros(size, dtype=bool)
+        for error_type, decoder in decoders.items():
+            predicted = decoder.decode(result.detection_events(error_type))
+            failed |= predicted != result.logical_flips(error_type)
+        decode_time += time.perf_counter() - start
+        failures += int(failed.sum())
+        done += size
+    return {
+        "distance": distance,
+        "p": p,
+        "p_measure": p_measure,
+        "rounds": rounds,
+        "shots": shots,
+        "failures": failures,
+        "logical_error_rate": failures / shots,
+        "sample_shots_per_second": shots / sample_time if sample_time else None,
+        "decode_shots_per_second": shots / decode_time if decode_time else None,
+    }
+
+
+def sweep(distances, error_rates, shots, measurement_ratio=0.0, rounds=None,
+          decoder_class=MatchingDecoder, rng=None):
+    """
+    Logical error rate for every combination of distance and physical error
+    rate. ``rounds`` defaults to d rounds with measurement errors and a single
+    round without.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    results = []
+    for distance in distances:
+        for p in error_rates:
+            n_rounds = rounds or (distance if measurement_ratio else 1)
+            results.append(logical_error_rate(
+                distance, p, shots, p_measure=measurement_ratio * p,
+                rounds=n_rounds, decoder_class=decoder_class, rng=rng))
+    return results
+
+
+def suppression_factors(results):
+    """
+    Lambda = eps_d / eps_(d+2) per physical error rate; Lambda > 1 means the
+    code is below threshold (Willow reports about 2.1).
+    """
+    by_key = {(r["p"], r["distance"]): r["logical_error_rate"] for r in results}
+    factors = []
+    for (p, d), rate in sorted(by_key.items()):
+        larger = by_key.get((p, d + 2))
+        if larger:
+            factors.append({"p": p, "distance": d, "lambda": rate / larger})
+    return factors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rotated surface code Monte Carlo")
+    parser.add_argument("--distances", type=int, nargs="+", default=[3, 5, 7])
+    parser.add_argument("--rates", type=float, nargs="+",
+                        default=[0.01, 0.02, 0.04, 0.06, 0.08, 0.1])
+    parser.add_argument("--shots", type=int, default=10000)
+    parser.add_argument("--measurement-ratio", type=float, default=0.0,
+                        help="measurement error rate as a multiple of p")
+    parser.add_argument("--decoder", choices=["union-find", "matching"], default="union-find")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.decoder == "union-find":
+        from union_find_decoder import UnionFindDecoder as decoder_class
+    else:
+        decoder_class = MatchingDecoder
+    rng = np.random.default_rng(args.seed)
+    results = sweep(args.distances, args.rates, args.shots,
+                    measurement_ratio=args.measurement_ratio,
+                    decoder_class=decoder_class, rng=rng)
+    for r in results:
+        print(f"d={r['distance']:<3} p={r['p']:<7g} rounds={r['rounds']:<3} "
+              f"P_L={r['logical_error_rate']:.5f} "
+              f"({r['sample_shots_per_second']:.3g} shots/s sampled, "
+              f"{r['decode_shots_per_second']:.3g} shots/s decoded)")
+    for factor in suppression_factors(results):
+        print(f"Lambda(p={factor['p']:g}, d={factor['distance']}) = {factor['lambda']:.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Tensor-network cost estimator for the classical side of random circuit sampling.
+
+A random circuit from rcs.py becomes a closed tensor network for a single
+amplitude <x|C|0...0>: one tensor per initial state, gate and final
+projection, one index of dimension 2 per wire segment. Every index connects
+exactly two tensors, so contracting tensors A and B costs 2^|A u B|
+multiply-adds and leaves a tensor with the indices A ^ B.
+
+Contraction orders are searched with
+  * time-ordered:   contract the gates in circuit order into the state, i.e.
+                    a statevector simulation; never wider than n + 2 indices,
+  * greedy:         pick the pair whose contraction costs the fewest FLOPs
+                    relative to its larger tensor, then the fewest FLOPs,
+  * random-greedy:  the same with Gumbel noise on the costs, repeated,
+  * partition:      split the tensor graph into communities, contract each
+                    community greedily and then the communities,
+and the cheapest order that is not wider than n + 2 is reported as FLOPs,
+largest intermediate tensor and time at a given FLOP rate, so the estimate
+is never worse than simulating the statevector. Small networks can be
+contracted with numpy to check the order against the statevector amplitude:
+
+    python tensor_network.py --qubits 12 --cycles 8 --validate
+    python tensor_network.py --qubits 105 --cycles 20 --trials 4
+"""
+import argparse
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from rcs import SECONDS_PER_YEAR, random_circuit
+
+# Real FLOPs per complex multiply-add and bytes per complex64 amplitude.
+FLOPS_PER_OPERATION = 8
+BYTES_PER_ENTRY = 8
+# Frontier (Oak Ridge), the machine used for Google's 10^25 years estimate.
+FRONTIER_FLOPS = 1.1e18
+# Louvain resolutions sampled by optimize() (log-uniform).
+PARTITION_RESOLUTIONS = (0.05, 0.5)
+
+
+class TensorNetwork:
+    """
+    Closed tensor network given by the index tuples of its tensors
+    (``indices[i]``) and, for small networks, their arrays.
+    """
+
+    def __init__(self, indices, arrays=None):
+        self.indices = [tuple(ix) for ix in indices]
+        self.arrays = arrays
+
+    @classmethod
+    def from_circuit(cls, gates, n_qubits, bitstring=0, with_arrays=True):
+        """Network for the amplitude of ``bitstring`` after the gate list."""
+        counter = itertools.count()
+        wires = [next(counter) for _ in range(n_qubits)]
+        indices = [(wire,) for wire in wires]
+        arrays = [np.array([1, 0], dtype=np.complex128) for _ in wires]
+        for gate in gates:
+            k = len(gate.qubits)
+            inputs = [wires[q] for q in gate.qubits]
+            outputs = [next(counter) for _ in range(k)]
+            for q, out in zip(gate.qubits, outputs):
+                wires[q] = out
+            indices.append(tuple(outputs + inputs))
+            arrays.append(np.asarray(gate.matrix, dtype=np.complex128).reshape((2,) * (2 * k)))
+        for q, wire in enumerate(wires):
+            indices.append((wire,))
+            arrays.append(np.eye(2, dtype=np.complex128)[(bitstring >> q) & 1])
+        return cls(indices, arrays if with_arrays else None)
+
+    def adjacency(self):
+        """index -> ids of the tensors carrying it."""
+        tensors_of = {}
+        for i, ix in enumerate(self.indices):
+            for index in ix:
+                tensors_of.setdefault(index, []).append(i)
+        return tensors_of
+
+
+class _Contraction:
+    """Bookkeeping while building a contraction path (SSA tensor ids)."""
+
+    def __init__(self, network):
+        self.tensors = {i: frozenset(ix) for i, ix in enumerate(network.indices)}
+        self.tensors_of = {index: set(ids) for index, ids in network.adjacency().items()}
+        self.next_id = len(self.tensors)
+        self.path = []
+        self.log2_flops = []
+        self.max_width = max((len(ix) for ix in self.tensors.values()), default=0)
+
+    def neighbours(self, tensor):
+        found = set()
+        for index in self.tensors[tensor]:
+            found |= self.tensors_of[index]
+        found.discard(tensor)
+        return found
+
+    def contract(self, a, b):
+        left, right = self.tensors.pop(a), self.tensors.pop(b)
+        result = left ^ right
+        new = self.next_id
+        self.next_id += 1
+        for index in left | right:
+            owners = self.tensors_of[index]
+            owners.discard(a)
+            owners.discard(b)
+            if index in result:
+                owners.add(new)
+        self.tensors[new] = result
+        self.path.append((a, b))
+        self.log2_flops.append(len(left | right))
+        self.max_width = max(self.max_width, len(result))
+        return new
+
+    def score(self, a, b, temperature, rng):
+        """
+        log2 of the FLOPs of contracting a and b relative to the larger of the
+        two, then of the FLOPs themselves; lower is contracted first. Plain
+        cheapest-first grows many mid-sized tensors that collide later.
+        """
+        left, right = self.tensors[a], self.tensors[b]
+        cost = len(left | right)
+        relative = cost - max(len(left), len(right))
+        if temperature <= 0:
+            return relative, cost
+        return relative - temperature * math.log(-math.log(rng.random())), cost
+
+    def greedy(self, ids, temperature=0.0, rng=None):
+        """Greedily contract connected tensors among ``ids``; returns what is left."""
+        alive = set(ids)
+        heap = []
+        tie = itertools.count()
+        for a in alive:
+            for b in self.neighbours(a):
+                if b in alive and a < b:
+                    heapq.heappush(heap, (self.score(a, b, temperature, rng), next(tie), a, b))
+        while heap:
+            _, _, a, b = heapq.heappop(heap)
+            if a not in alive or b not in alive:
+                continue
+            alive -= {a, b}
+            new = self.contract(a, b)
+            alive.add(new)
+            for other in self.neighbours(new):
+                if other in alive:
+                    heapq.heappush(heap, (self.score(new, other, temperature, rng), next(tie), new, other))
+        return alive
+
+    def finish(self, ids):
+        """Contract whatever is left (disconnected parts) smallest first."""
+        remaining = sorted(ids, key=lambda t: len(self.tensors[t]))
+        while len(remaining) > 1:
+            a, b = remaining.pop(0), remaining.pop(0)
+            remaining.append(self.contract(a, b))
+            remaining.sort(key=lambda t: len(self.tensors[t]))
+        return remaining
+
+    def summary(self, method):
+        log2_total = float(np.logaddexp2.reduce(self.log2_flops)) if self.log2_flops else 0.0
+        return {
+            "method": method,
+            "path": self.path,
+            "log10_operations": log2_total * math.log10(2),
+            "log10_flops": log2_total * math.log10(2) + math.log10(FLOPS_PER_OPERATION),
+            "max_width": self.max_width,
+            "max_bytes": BYTES_PER_ENTRY * 2.0 ** self.max_width,
+        }
+
+
+def time_ordered_path(network):
+    """
+    Contract the tensors in the order they were added. For a network from
+    from_circuit() that is the initial states, then every gate in time order
+    into the running state, then the projections: a statevector simulation
+    whose widest contraction has n + 2 indices.
+    """
+    state = _Contraction(network)
+    ids = list(state.tensors)
+    current = ids[0]
+    for tensor in ids[1:]:
+        current = state.contract(current, tensor)
+    return state.summary("time-ordered")
+
+
+def greedy_path(network, temperature=0.0, rng=None):
+    state = _Contraction(network)
+    state.finish(state.greedy(list(state.tensors), temperature, rng))
+    return state.summary("random-greedy" if temperature else "greedy")
+
+
+def partition_path(network, rng=None, resolution=0.2, temperature=0.0):
+    """
+    Split the tensor graph into communities (Louvain modularity), contract
+    every community greedily and then the community results with each other.
+    Low resolutions give few large communities with thin cuts between them.
+    """
+    import networkx as nx
+
+    rng = rng if rng is not None else np.random.default_rng()
+    graph = nx.Graph()
+    graph.add_nodes_from(range(len(network.indices)))
+    for ids in network.adjacency().values():
+        if len(ids) == 2:
+            graph.add_edge(*ids)
+    communities = nx.community.louvain_communities(
+        graph, resolution=resolution, seed=int(rng.integers(2 ** 31)))
+    state = _Contraction(network)
+    remaining = set()
+    for community in communities:
+        remaining |= state.greedy(community, temperature, rng)
+    state.finish(state.greedy(remaining, temperature, rng))
+    return state.summary("partition")
+
+
+def optimize(network, trials=8, rng=None, temperature=0.1, max_width=None):
+    """
+    Best of the time-ordered order, greedy, ``trials`` random-greedy and
+    ``trials`` partition orders (with random resolutions in
+    PARTITION_RESOLUTIONS). Orders with an intermediate wider than
+    ``max_width`` indices are discarded.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    candidates = [time_ordered_path(network), greedy_path(network)]
+    for _ in range(trials):
+        candidates.append(greedy_path(network, temperature, rng))
+        resolution = float(np.exp(rng.uniform(*np.log(PARTITION_RESOLUTIONS))))
+        candidates.append(partition_path(network, rng, resolution))
+    if max_width is not None:
+        candidates = [c for c in candidates if c["max_width"] <= max_width]
+        if not candidates:
+            raise ValueError(f"no contraction order within {max_width} indices")
+    return min(candidates, key=lambda c: (c["log10_flops"], c["max_width"]))
+
+
+def contract(network, path):
+    """Contract the network along ``path`` with numpy and return the scalar."""
+    arrays = dict(enumerate(network.arrays))
+    indices = dict(enumerate(network.indices))
+    next_id = len(arrays)
+    for a, b in path:
+        left, right = indices.pop(a), indices.pop(b)
+        result = tuple(sorted(set(left) ^ set(right)))
+        labels = {index: i for i, index in enumerate(sorted(set(left) | set(right)))}
+        arrays[next_id] = np.einsum(
+            arrays.pop(a), [labels[i] for i in left],
+            arrays.pop(b), [labels[i] for i in right],
+            [labels[i] for i in result])
+        indices[next_id] = result
+        next_id += 1
+    (value,) = arrays.values()
+    return complex(value)
+
+
+def classical_cost(n_qubits, cycles, trials=8, samples=1, flops_per_second=FRONTIER_FLOPS,
+                   rng=None):
+    """Cost of ``samples`` amplitudes of one random circuit at the given FLOP rate."""
+    rng = rng if rng is not None else np.random.default_rng()
+    gates = random_circuit(n_qubits, cycles, rng)
+    network = TensorNetwork.from_circuit(gates, n_qubits, with_arrays=False)
+    # A statevector simulation needs n + 2 indices; anything wider is a bad order.
+    best = optimize(network, trials, rng, max_width=n_qubits + 2)
+    seconds = samples * 10 ** best["log10_flops"] / flops_per_second
+    best.update(qubits=n_qubits, cycles=cycles, tensors=len(network.indices),
+                seconds=seconds, years=seconds / SECONDS_PER_YEAR)
+    return best
+
+
+def validate(n_qubits, cycles, trials=2, rng=None):
+    """Largest deviation between contracted amplitudes and the statevector."""
+    from statevector import run
+
+    rng = rng if rng is not None else np.random.default_rng()
+    gates = random_circuit(n_qubits, cycles, rng)
+    state = run(gates, n_qubits, dtype=np.complex128)
+    error = 0.0
+    for bitstring in rng.integers(0, 1 << n_qubits, size=3):
+        network = TensorNetwork.from_circuit(gates, n_qubits, int(bitstring))
+        for path in (greedy_path(network), optimize(network, trials, rng)):
+            error = max(error, abs(contract(network, path["path"]) - state[bitstring]))
+    return error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tensor-network contraction cost of RCS")
+    parser.add_argument("--qubits", type=int, default=53)
+    parser.add_argument("--cycles", type=int, default=12)
+    parser.add_argument("--trials", type=int, default=8)
+    parser.add_argument("--samples", type=float, default=1,
+                        help="number of amplitudes to compute")
+    parser.add_argument("--flops", type=float, default=FRONTIER_FLOPS,
+                        help="FLOP/s of the classical machine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true",
+                        help="contract the network with numpy and compare with the statevector")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    cost = classical_cost(args.qubits, args.cycles, args.trials, args.samples, args.flops, rng)
+    print(f"{cost['qubits']} qubits, {cost['cycles']} cycles, {cost['tensors']} tensors: "
+          f"best order by {cost['method']}")
+    print(f"10^{cost['log10_flops']:.1f} FLOP, largest tensor 2^{cost['max_width']} entries "
+          f"({cost['max_bytes']:.2e} bytes), {cost['seconds']:.2e} s = {cost['years']:.2e} years "
+          f"at {args.flops:.2e} FLOP/s")
+    if args.validate:
+        print(f"max amplitude error vs. statevector: {validate(min(args.qubits, 16), args.cycles, rng=rng):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Exact travelling salesman by enumerating every tour, in parallel.
+
+City 0 is fixed at the start and a tour and its reverse are counted once
+(first city after 0 < last city), so n cities have (n - 1)! / 2 tours. The
+space is split into independent chunks by their first ``prefix`` cities.
+Within a chunk the remaining r cities run through a table of all r!
+permutations, sorted by the last city, so the tours allowed by the
+reversal rule form one contiguous slice of it. Their lengths are one
+gather of the flat distance matrix plus a row sum. Chunks are evaluated in
+a process pool, which scaling() starts once for all n; the pool startup is
+not part of any timing, and a single batch of chunks runs in-process.
+
+Measured tours per second give the projected time for larger n.
+TSPComparison loads its sweep from .benchmarks/tsp_bruteforce.jsonl
+(stored_scaling), keyed by its cities, so it is measured once:
+
+    python tsp_bruteforce.py --cities 8 9 10 11 12 13 14 --project 16 20 25
+"""
+import argparse
+import concurrent.futures
+import itertools
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from benchmarks import stored
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+# Cities left after the prefix; 8! = 40320 rows per chunk.
+MAX_REST = 8
+
+_tables = {}
+
+
+def tour_count(n_cities):
+    """(n - 1)! / 2 distinct tours of n >= 3 cities."""
+    return math.factorial(n_cities - 1) // 2
+
+
+def permutation_table(r):
+    """
+    All permutations of range(r) sorted by their last entry, together with
+    the flat index (i * r + j) of every consecutive pair.
+    """
+    if r not in _tables:
+        perms = np.array(list(itertools.permutations(range(r))), dtype=np.intp).reshape(-1, r)
+        perms = perms[np.argsort(perms[:, -1], kind="stable")]
+        _tables[r] = perms, perms[:, :-1] * r + perms[:, 1:]
+    return _tables[r]
+
+
+def chunks(n_cities, prefix):
+    """Prefixes (orders of ``prefix`` cities after city 0) that still admit a tour."""
+    cities = range(1, n_cities)
+    rest = n_cities - 1 - prefix
+    for order in itertools.permutations(cities, prefix):
+        # Something after the prefix must be larger than its first city.
+        if rest > 0 and any(c > order[0] for c in cities if c not in order):
+            yield order
+        elif rest == 0 and order[0] < order[-1]:
+            yield order
+
+
+def evaluate_chunk(distances, order):
+    """Shortest tour starting 0, *order, its length and the number of tours in the chunk."""
+    n = len(distances)
+    rest = np.array([c for c in range(1, n) if c not in order], dtype=np.intp)
+    head = distances[0, order[0]] + sum(distances[a, b] for a, b in zip(order, order[1:]))
+    if len(rest) == 0:
+        return head + distances[order[-1], 0], tuple(order), 1
+    perms, pairs = permutation_table(len(rest))
+    # Rows whose last city is larger than the first city after 0.
+    block = len(perms) // len(rest)
+    start = int(np.searchsorted(rest, order[0], side="right")) * block
+    perms, pairs = perms[start:], pairs[start:]
+    inner = distances[np.ix_(rest, rest)].reshape(-1)
+    lengths = inner[pairs].sum(axis=1) if pairs.shape[1] else np.zeros(len(perms))
+    lengths += distances[order[-1], rest][perms[:, 0]] + distances[rest, 0][perms[:, -1]]
+    best = int(np.argmin(lengths))
+    return head + float(lengths[best]), tuple(order) + tuple(rest[perms[best]].tolist()), len(perms)
+
+
+def _started(_):
+    return os.getpid()
+
+
+def process_pool(workers):
+    """Spawn pool of ``workers`` processes, all started before it is returned."""
+    pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    # Processes are spawned on demand; one task per worker brings them all up.
+    list(pool.map(_started, range(workers)))
+    return pool
+
+
+def _evaluate(orders, distances):
+    best = (math.inf, None)
+    count = 0
+    for order in orders:
+        length, tour, tours = evaluate_chunk(distances, order)
+        count += tours
+        if length < best[0]:
+            best = (length, tour)
+    return best[0], best[1], count
+
+
+def solve(distances, workers=None, max_rest=MAX_REST, pool=None):
+    """
+    Shortest tour of ``distances`` by full enumeration, with tours per second.
+    Prefixes are handed to ``pool`` (started here if None) in batches of about
+    64 per task; only their evaluation is timed.
+    """
+    distances = np.asarray(distances, dtype=float)
+    n = len(distances)
+    if n < 3:
+        raise ValueError("need at least 3 cities")
+    prefix = max(1, n - 1 - max_rest)
+    orders = list(chunks(n, prefix))
+    batches = [orders[i:i + 64] for i in range(0, len(orders), 64)]
+    workers = 1 if len(batches) == 1 else workers or os.cpu_count() or 1
+    if workers > 1 and pool is None:
+        with process_pool(workers) as pool:
+            return solve(distances, workers, max_rest, pool)
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_evaluate(batch, distances) for batch in batches]
+    else:
+        results = list(pool.map(_evaluate, batches, itertools.repeat(distances, len(batches))))
+    seconds = time.perf_counter() - start
+    length, tour, _ = min(results, key=lambda result: result[0])
+    tours = sum(result[2] for result in results)
+    assert tours == tour_count(n)
+    return {
+        "cities": n,
+        "tour": (0,) + tour,
+        "length": length,
+        "tours": tours,
+        "chunks": len(orders),
+        "workers": workers,
+        "seconds": seconds,
+        "tours_per_second": tours / seconds,
+    }
+
+
+def scaling(points, cities, workers=None):
+    """solve() on the first n of ``points`` for every n in ``cities``, sharing one pool."""
+    from qaoa import distance_matrix
+
+    distances = distance_matrix(points)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [solve(distances[:n, :n], 1) for n in cities]
+    with process_pool(workers) as pool:
+        return [solve(distances[:n, :n], workers, pool=pool) for n in cities]
+
+
+def stored_scaling(points, cities, workers=None):
+    """scaling() as stored in .benchmarks/tsp_bruteforce.jsonl, measured on first use."""
+    params = {"points": np.asarray(points, dtype=float).tolist(), "cities": list(cities)}
+    return stored("tsp_bruteforce", params, lambda: scaling(points, cities, workers))
+
+
+def projection(records, n_cities):
+    """Time for all tours of ``n_cities`` at the rate of the largest measured instance."""
+    rate = max(records, key=lambda r: r["cities"])["tours_per_second"]
+    seconds = tour_count(n_cities) / rate
+    return {"cities": n_cities, "tours": tour_count(n_cities), "seconds": seconds,
+            "years": seconds / SECONDS_PER_YEAR}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel brute-force TSP")
+    parser.add_argument("--cities", type=int, nargs="+", default=list(range(8, 13)))
+    parser.add_argument("--project", type=int, nargs="+", default=[16, 20, 25, 30])
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true", help="compare with itertools on 8 cities")
+    args = parser.parse_args(argv)
+
+    points = np.random.default_rng(args.seed).uniform(0, 1, size=(max(args.cities + [8]), 2))
+    if args.validate:
+        from annealing import brute_force
+        from qaoa import distance_matrix
+
+        _, reference = brute_force(distance_matrix(points[:8]))
+        print(f"8 cities: itertools {reference:.6f}, chunked {solve(distance_matrix(points[:8]), 1)['length']:.6f}")
+    records = scaling(points, args.cities, args.workers)
+    for r in records:
+        print(f"{r['cities']:>3} cities: {r['tours']:>14,} tours in {r['seconds']:8.3f} s "
+              f"({r['tours_per_second']:,.0f} tours/s, {r['chunks']:,} chunks, {r['workers']} workers), "
+              f"shortest {r['length']:.4f}")
+    for n in args.project:
+        p = projection(records, n)
+        print(f"{n:>3} cities: {p['tours']:.2e} tours, projected {p['seconds']:.2e} s = {p['years']:.2e} years")
+
+
+if __name__ == "__main__":
+    main()
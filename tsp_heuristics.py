@@ -0,0 +1,301 @@
+"""
+TSP heuristics for large instances (10k - 100k cities).
+
+  1. greedy_edge:  the k nearest neighbours of every city (KD-tree) are the
+     candidate edges; they are added shortest first unless a city already has
+     two edges or the edge would close a cycle. The remaining path fragments
+     are chained by nearest free endpoint (again via a KD-tree).
+  2. local_search: 2-opt and Or-opt moves, but only towards the k nearest
+     neighbours of a city and only for cities whose don't-look bit is off. A
+     city's bit is set when no improving move starts at it and cleared when
+     one of its tour edges changes. 2-opt reverses the shorter side of the
+     tour as a numpy slice; Or-opt moves segments of 1 - 3 cities.
+
+Distances are Euclidean and computed on the fly, so memory is O(n k).
+
+    python tsp_heuristics.py --cities 100000 --time-limit 20
+"""
+import argparse
+import collections
+import math
+import time
+
+import numpy as np
+
+DEFAULT_NEIGHBOURS = 8
+
+
+def neighbour_lists(points, k=DEFAULT_NEIGHBOURS):
+    """Indices and distances of the k nearest other cities, nearest first."""
+    from scipy.spatial import cKDTree
+
+    n = len(points)
+    k = min(k, n - 1)
+    distances, indices = cKDTree(points).query(points, k=k + 1)
+    # A city is usually its own first hit, but among duplicates another copy at
+    # distance 0 may come first, so drop it by index and keep the first k others.
+    order = np.argsort(indices == np.arange(n)[:, None], axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+
+def tour_length(points, tour):
+    ordered = np.asarray(points)[tour]
+    return float(np.linalg.norm(ordered - np.roll(ordered, -1, axis=0), axis=1).sum())
+
+
+def greedy_edge(points, neighbours=None, k=DEFAULT_NEIGHBOURS):
+    """Tour from the greedy matching of the k-nearest-neighbour edges."""
+    from scipy.spatial import cKDTree
+
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    if neighbours is None:
+        neighbours = neighbour_lists(points, k)
+    indices, distances = neighbours
+    rows = np.repeat(np.arange(n), indices.shape[1])
+    columns = indices.reshape(-1)
+    keep = rows < columns
+    order = np.argsort(distances.reshape(-1)[keep], kind="stable")
+    edges = np.column_stack([rows[keep], columns[keep]])[order].tolist()
+
+    degree = [0] * n
+    parent = list(range(n))
+    links = [[] for _ in range(n)]
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    added = 0
+    for a, b in edges:
+        if degree[a] < 2 and degree[b] < 2:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_a] = root_b
+                degree[a] += 1
+                degree[b] += 1
+                links[a].append(b)
+                links[b].append(a)
+                added += 1
+                if added == n - 1:
+                    break
+
+    # Chain the fragments: from the end of the current one to the nearest free endpoint.
+    ends = [v for v in range(n) if degree[v] < 2]
+    tree = cKDTree(points[ends])
+    other_end = {}
+    for v in ends:
+        if degree[v] == 0:
+            other_end[v] = v
+            continue
+        if v in other_end:
+            continue
+        previous, current = v, links[v][0]
+        while degree[current] == 2:
+            previous, current = current, links[current][0] if links[current][0] != previous else links[current][1]
+        other_end[v], other_end[current] = current, v
+    used = set()
+    first = ends[0]
+    current = other_end[first]
+    used.update((first, current))
+    while len(used) < len(ends):
+        count = 8
+        while True:
+            _, found = tree.query(points[current], k=min(count, len(ends)))
+            candidates = [ends[i] for i in np.atleast_1d(found) if ends[i] not in used]
+            if candidates or count >= len(ends):
+                break
+            count *= 4
+        nearest = candidates[0]
+        links[current].append(nearest)
+        links[nearest].append(current)
+        current = other_end[nearest]
+        used.update((nearest, current))
+    links[current].append(first)
+    links[first].append(current)
+
+    tour = np.empty(n, dtype=np.int64)
+    previous, current = -1, 0
+    for position in range(n):
+        tour[position] = current
+        a, b = links[current][0], links[current][1]
+        previous, current = current, (b if a == previous else a)
+    return tour
+
+
+class LocalSearch:
+    """2-opt and Or-opt with neighbour lists and don't-look bits on an array tour."""
+
+    def __init__(self, points, tour, neighbours=None, k=DEFAULT_NEIGHBOURS):
+        self.points = np.asarray(points, dtype=float)
+        self.n = len(self.points)
+        self.tour = np.array(tour, dtype=np.int64)
+        self.position = np.empty(self.n, dtype=np.int64)
+        self.position[self.tour] = np.arange(self.n)
+        indices, _ = neighbours if neighbours is not None else neighbour_lists(self.points, k)
+        self.neighbours = indices.tolist()
+        self.x, self.y = self.points[:, 0].tolist(), self.points[:, 1].tolist()
+        self.moves = {"2-opt": 0, "or-opt": 0}
+
+    def distance(self, a, b):
+        return math.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    def succ(self, city):
+        return int(self.tour[(self.position[city] + 1) % self.n])
+
+    def pred(self, city):
+        return int(self.tour[self.position[city] - 1])
+
+    def reverse(self, i, j):
+        """Reverse the cyclic stretch of positions i .. j (the shorter side of the cycle)."""
+        n = self.n
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, length = (j + 1) % n, n - length
+        if length < 2:
+            return
+        if i + length <= n:
+            segment = self.tour[i:i + length][::-1].copy()
+            self.tour[i:i + length] = segment
+            self.position[segment] = np.arange(i, i + length)
+        else:
+            index = (i + np.arange(length)) % n
+            segment = self.tour[index][::-1]
+            self.tour[index] = segment
+            self.position[segment] = index
+
+    def two_opt(self, a):
+        """First improving 2-opt move with one new edge (a, c), c a neighbour of a."""
+        for forward in (True, False):
+            b = self.succ(a) if forward else self.pred(a)
+            removed = self.distance(a, b)
+            for c in self.neighbours[a]:
+                added = self.distance(a, c)
+                if added >= removed:
+                    break
+                d = self.succ(c) if forward else self.pred(c)
+                if c == a or c == b or d == a:
+                    continue
+                if added + self.distance(b, d) < removed + self.distance(c, d) - 1e-12:
+                    # forward: a b ... c d -> a c ... b d; backward: d c ... b a -> d b ... c a
+                    if forward:
+                        self.reverse(self.position[b], self.position[c])
+                    else:
+                        self.reverse(self.position[c], self.position[b])
+                    self.moves["2-opt"] += 1
+                    return (a, b, c, d)
+        return None
+
+    def or_opt(self, a, max_length=3):
+        """Move the segment of up to ``max_length`` cities starting at a next to a neighbour."""
+        n = self.n
+        start = self.position[a]
+        for length in range(1, max_length + 1):
+            if start + length >= n:
+                break
+            segment = self.tour[start:start + length]
+            first, last = int(segment[0]), int(segment[-1])
+            before, after = self.pred(first), int(self.tour[start + length])
+            gain = self.distance(before, first) + self.distance(last, after) - self.distance(before, after)
+            for c in self.neighbours[a]:
+                if c == a or start <= self.position[c] < start + length or c == before:
+                    continue
+                d = self.succ(c)
+                if start <= self.position[d] < start + length:
+                    continue
+                base = self.distance(c, d)
+                # Insert between c and d, keeping (c first ... last d) or reversed (c last ... first d).
+                keep = self.distance(c, first) + self.distance(last, d) - base
+                flip = self.distance(c, last) + self.distance(first, d) - base
+                if min(keep, flip) < gain - 1e-12:
+                    self._move_segment(start, length, self.position[c], flip < keep)
+                    self.moves["or-opt"] += 1
+                    return (before, after, c, d, first, last)
+        return None
+
+    def _move_segment(self, start, length, target, flip):
+        """Move tour[start:start + length] behind position ``target`` by shifting the stretch between."""
+        segment = self.tour[start:start + length].copy()
+        if flip:
+            segment = segment[::-1]
+        if target > start:
+            low, high = start, target + 1
+            stretch = np.concatenate([self.tour[start + length:target + 1], segment])
+        else:
+            low, high = target + 1, start + length
+            stretch = np.concatenate([segment, self.tour[target + 1:start]])
+        self.tour[low:high] = stretch
+        self.position[stretch] = np.arange(low, high)
+
+    def run(self, time_limit=None):
+        """Improve until no city is active or ``time_limit`` seconds have passed."""
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        active = collections.deque(range(self.n))
+        queued = [True] * self.n
+        checks = 0
+        while active:
+            checks += 1
+            if deadline is not None and checks % 256 == 0 and time.perf_counter() > deadline:
+                break
+            a = active.popleft()
+            queued[a] = False
+            touched = self.two_opt(a) or self.or_opt(a)
+            if touched:
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        active.append(city)
+                if not queued[a]:
+                    queued[a] = True
+                    active.append(a)
+        return self.tour
+
+
+def solve(points, k=DEFAULT_NEIGHBOURS, time_limit=None):
+    """Greedy edge tour improved by local search, with timings and lengths."""
+    points = np.asarray(points, dtype=float)
+    start = time.perf_counter()
+    neighbours = neighbour_lists(points, k)
+    tour = greedy_edge(points, neighbours)
+    construction = time.perf_counter() - start
+    greedy_tour, greedy_length = tour.copy(), tour_length(points, tour)
+    search = LocalSearch(points, tour, neighbours)
+    start = time.perf_counter()
+    tour = search.run(time_limit)
+    return {
+        "cities": len(points),
+        "tour": tour,
+        "greedy_tour": greedy_tour,
+        "length": tour_length(points, tour),
+        "greedy_length": greedy_length,
+        "construction_seconds": construction,
+        "search_seconds": time.perf_counter() - start,
+        "moves": dict(search.moves),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Greedy edge + 2-opt/Or-opt for large TSP instances")
+    parser.add_argument("--cities", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--neighbours", type=int, default=DEFAULT_NEIGHBOURS)
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds of local search")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    for n in args.cities:
+        points = rng.uniform(0, 1, size=(n, 2))
+        result = solve(points, args.neighbours, args.time_limit)
+        assert np.array_equal(np.sort(result["tour"]), np.arange(n))
+        # Optimal tours of uniform random cities approach 0.7124 sqrt(n A) (Beardwood-Halton-Hammersley).
+        print(f"{n:>7,} cities: greedy {result['greedy_length']:.1f} in {result['construction_seconds']:.2f} s, "
+              f"local search {result['length']:.1f} in {result['search_seconds']:.2f} s "
+              f"({result['moves']['2-opt']:,} 2-opt, {result['moves']['or-opt']:,} Or-opt moves), "
+              f"length / sqrt(n A) = {result['length'] / math.sqrt(n):.4f}")
+
+if __name__ == "__main__":
+    main()